@@ -0,0 +1,467 @@
+"""
+Headless HTTP API
+
+JSON-over-HTTP access to the AI Grievance Redressal System for kiosks, the
+mobile app and IVR, without going through the Streamlit UI. Built on the
+standard library's asyncio streams (HTTP/1.1 with keep-alive), it reuses
+GrievanceDatabase, the enrichment pipeline and the trained model.
+
+The event loop only parses requests and writes responses:
+- Category prediction and the rest of the analysis, and PDF receipt
+  rendering, run in a process pool. Each worker loads the model once
+  (picking up retrained models like the app does) and keeps its own
+  enrichment cache.
+- SQLite reads run in a thread pool that shares the database's
+  connection pool; writes are queued on the database's group-commit
+  writer and awaited as futures.
+
+Endpoints:
+    POST  /complaints                      Submit a complaint
+    GET   /complaints/<ticket_id>          Track a complaint
+    GET   /complaints/<ticket_id>/receipt  PDF receipt
+    PATCH /complaints/<ticket_id>/status   Update status (admin)
+    GET   /search?q=...&limit=&cursor=     Full-text search (admin)
+    GET   /stats                           Dashboard statistics
+    GET   /health                          Liveness and pool metrics
+
+Admin endpoints need an ``X-Admin-Password`` header matching
+ADMIN_PASSWORD. Ticket IDs are not secret, so tracking and receipts
+mask the complainant's name, email and phone unless that header is sent.
+
+Usage:
+    python api.py --port 8080 --workers 2
+
+Author: Debasis Behera
+"""
+
+import argparse
+import asyncio
+import hmac
+import json
+import os
+import re
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from database import GrievanceDatabase
+from inference import HotSwapModel
+from numpy_model import NumpyLinearModel, is_numpy_model
+from pipeline import ENRICHMENT_COLUMNS, EnrichmentCache, enrich_complaints
+from report_generator import complaint_receipt, render_pdf_report
+from utils import generate_ticket_id
+
+ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'admin123')
+MODEL_PATH = os.getenv('MODEL_PATH', 'model/classifier.pkl')
+DB_PATH = os.getenv('DATABASE_PATH', 'data/grievances.db')
+
+STATUSES = ("Pending", "In Progress", "Resolved")
+MAX_BODY_BYTES = 64 * 1024
+MAX_HEADER_BYTES = 16 * 1024   # request line and headers together
+MAX_HEADERS = 100
+MAX_COMPLAINT_CHARS = 10000
+MAX_CONTACT_CHARS = 200
+KEEP_ALIVE_SECONDS = 15
+
+
+class APIError(Exception):
+    """An error response: HTTP status plus a message for the JSON body."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = HTTPStatus(status)
+        self.message = message
+
+
+# ================= WORKER PROCESSES =================
+
+_WORKER_MODEL = None
+_WORKER_CACHE = None
+
+
+def load_model(path=MODEL_PATH):
+    """Serving model for ``path`` (same rules as the app), or None if there is none."""
+    if is_numpy_model(path):
+        return NumpyLinearModel(path)
+    if os.path.exists(path):
+        return HotSwapModel(path)
+    return None
+
+
+def _init_worker(model_path):
+    global _WORKER_MODEL, _WORKER_CACHE
+    _WORKER_MODEL = load_model(model_path)
+    _WORKER_CACHE = EnrichmentCache()
+
+
+def _analyze(text):
+    """Enrichment columns for one complaint, falling back to the default category on model errors."""
+    try:
+        frame = enrich_complaints([text], _WORKER_MODEL, cache=_WORKER_CACHE)
+    except Exception:
+        frame = enrich_complaints([text], None)
+    row = frame.iloc[0]
+    return {column: row[column] for column in ENRICHMENT_COLUMNS}
+
+
+def _warm_up():
+    return os.getpid()
+
+
+def mask_contact(complaint):
+    """Copy of a complaint with the complainant's name, email and phone partly hidden."""
+    masked = dict(complaint)
+    name = complaint.get("name")
+    if name and name != "Anonymous":
+        masked["name"] = " ".join(part[0] + "***" for part in name.split())
+    email = complaint.get("email")
+    if email:
+        local, at, domain = email.partition("@")
+        masked["email"] = local[:1] + "***" + at + domain
+    phone = complaint.get("phone")
+    if phone and phone != "N/A":
+        masked["phone"] = "***" + (phone[-2:] if len(phone) > 6 else "")
+    return masked
+
+
+# ================= HTTP SERVICE =================
+
+class GrievanceAPI:
+    """
+    The API service: routing, handlers and the executor pools.
+
+    Args:
+        db (GrievanceDatabase): Database to serve
+        model_path (str): Model loaded by each worker process
+        workers (int): Processes for inference and PDF rendering. Defaults to CPU count
+        db_threads (int): Threads for database calls. Defaults to the connection pool size
+    """
+
+    def __init__(self, db, model_path=MODEL_PATH, workers=None, db_threads=None):
+        self.db = db
+        self.cpu_pool = ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count() or 1,
+            initializer=_init_worker,
+            initargs=(model_path,)
+        )
+        self.db_pool = ThreadPoolExecutor(
+            max_workers=db_threads or db.pool.max_size, thread_name_prefix="api-db"
+        )
+        self.requests = 0
+        self.started_at = time.time()
+        self.routes = [
+            ("POST", re.compile(r"/complaints"), self.submit),
+            ("GET", re.compile(r"/complaints/(?P<ticket_id>[^/]+)"), self.track),
+            ("GET", re.compile(r"/complaints/(?P<ticket_id>[^/]+)/receipt"), self.receipt),
+            ("PATCH", re.compile(r"/complaints/(?P<ticket_id>[^/]+)/status"), self.update_status),
+            ("GET", re.compile(r"/search"), self.search),
+            ("GET", re.compile(r"/stats"), self.stats),
+            ("GET", re.compile(r"/health"), self.health),
+        ]
+
+    async def _cpu(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.cpu_pool, func, *args)
+
+    async def _db(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.db_pool, func, *args)
+
+    async def warm_up(self):
+        """Start every worker process (and load its model) before taking traffic."""
+        workers = self.cpu_pool._max_workers
+        await asyncio.gather(*(self._cpu(_warm_up) for _ in range(workers)))
+        await self._cpu(_analyze, "warm up")
+
+    def close(self):
+        self.cpu_pool.shutdown()
+        self.db_pool.shutdown()
+        self.db.close()
+
+    # ---------------- handlers ----------------
+
+    async def submit(self, request):
+        data = request.json()
+        for field in ("name", "email", "complaint_text"):
+            if field not in data or data[field] is None:
+                raise APIError(400, f"'{field}' is required")
+            if not isinstance(data[field], str):
+                raise APIError(400, f"'{field}' must be a string")
+            if not data[field].strip():
+                raise APIError(400, f"'{field}' is required")
+        if data.get("phone") is not None and not isinstance(data["phone"], str):
+            raise APIError(400, "'phone' must be a string")
+        if not isinstance(data.get("anonymous", False), bool):
+            raise APIError(400, "'anonymous' must be true or false")
+        for field in ("name", "email", "phone"):
+            if len((data.get(field) or "").strip()) > MAX_CONTACT_CHARS:
+                raise APIError(413, f"'{field}' is limited to {MAX_CONTACT_CHARS} characters")
+        complaint_text = data["complaint_text"].strip()
+        if len(complaint_text) > MAX_COMPLAINT_CHARS:
+            raise APIError(413, f"'complaint_text' is limited to {MAX_COMPLAINT_CHARS} characters")
+
+        analysis = await self._cpu(_analyze, complaint_text)
+        complaint = {
+            "ticket_id": generate_ticket_id(),
+            "name": "Anonymous" if data.get("anonymous") else data["name"].strip(),
+            "email": data["email"].strip(),
+            "phone": (data.get("phone") or "").strip() or "N/A",
+            "complaint_text": complaint_text,
+            "category": analysis["category"],
+            "priority": analysis["priority"],
+            "department": analysis["department"],
+            "sentiment_label": analysis["sentiment_label"],
+            "sentiment_score": float(analysis["sentiment_score"]),
+            "keywords": ", ".join(analysis["keywords"]),
+            "resolution_time": analysis["resolution_time"],
+            "status": "Pending",
+            "submitted_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        if not await asyncio.wrap_future(self.db.queue_complaint(complaint)):
+            raise APIError(503, "The complaint could not be registered, please retry")
+
+        return 201, {
+            **{key: complaint[key] for key in (
+                "ticket_id", "category", "priority", "department", "sentiment_label",
+                "sentiment_score", "resolution_time", "status", "submitted_at"
+            )},
+            "keywords": list(analysis["keywords"]),
+        }
+
+    async def _complaint(self, request, ticket_id):
+        """The complaint for ``ticket_id``, contact details masked unless the caller is an admin."""
+        complaint = await self._db(self.db.get_complaint_by_ticket, ticket_id)
+        if complaint is None:
+            raise APIError(404, f"Ticket '{ticket_id}' not found")
+        return complaint if request.is_admin() else mask_contact(complaint)
+
+    async def track(self, request, ticket_id):
+        return 200, await self._complaint(request, ticket_id)
+
+    async def receipt(self, request, ticket_id):
+        complaint = await self._complaint(request, ticket_id)
+        pdf = await self._cpu(render_pdf_report, ticket_id, complaint_receipt(complaint))
+        return 200, pdf, "application/pdf"
+
+    async def update_status(self, request, ticket_id):
+        request.require_admin()
+        status = request.json().get("status")
+        if status not in STATUSES:
+            raise APIError(400, f"'status' must be one of {', '.join(STATUSES)}")
+        if not await asyncio.wrap_future(self.db.queue_status_update(ticket_id, status)):
+            raise APIError(404, f"Ticket '{ticket_id}' not found")
+        return 200, {"ticket_id": ticket_id, "status": status}
+
+    async def search(self, request):
+        request.require_admin()
+        query = request.param("q", "")
+        try:
+            limit = min(max(int(request.param("limit", 20)), 1), 100)
+        except ValueError:
+            raise APIError(400, "'limit' must be an integer")
+        try:
+            results, next_cursor = await self._db(
+                self.db.search_complaints_page, query, limit, request.param("cursor")
+            )
+        except ValueError as e:
+            raise APIError(400, str(e))
+        return 200, {"results": results, "next_cursor": next_cursor}
+
+    async def stats(self, request):
+        return 200, await self._db(self.db.get_statistics)
+
+    async def health(self, request):
+        return 200, {
+            "status": "ok",
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "requests": self.requests,
+            "db_pool": self.db.pool_stats(),
+            "db_writer": self.db.writer_stats(),
+            "db_read_cache": self.db.cache_stats(),
+        }
+
+    # ---------------- HTTP plumbing ----------------
+
+    async def dispatch(self, request):
+        """Route a request; returns (status, body, content type)."""
+        path_matched = False
+        for method, pattern, handler in self.routes:
+            match = pattern.fullmatch(request.path)
+            if match is None:
+                continue
+            path_matched = True
+            if method == request.method:
+                result = await handler(request, **{k: unquote(v) for k, v in match.groupdict().items()})
+                status, body = result[:2]
+                return status, body, result[2] if len(result) > 2 else "application/json"
+        if path_matched:
+            raise APIError(405, f"{request.method} not allowed on {request.path}")
+        raise APIError(404, f"No route for {request.path}")
+
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(Request.read(reader), KEEP_ALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    break
+                if request is None:
+                    break
+                self.requests += 1
+
+                try:
+                    status, body, content_type = await self.dispatch(request)
+                except APIError as e:
+                    status, body, content_type = e.status, {"error": e.message}, "application/json"
+                except Exception as e:
+                    print(f"✗ {request.method} {request.path} failed: {e!r}")
+                    status, body, content_type = 500, {"error": "Internal server error"}, "application/json"
+
+                if not isinstance(body, bytes):
+                    body = json.dumps(body, default=str).encode("utf-8")
+                status = HTTPStatus(status)
+                writer.write(
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if request.keep_alive else 'close'}\r\n"
+                    "\r\n".encode("latin-1") + body
+                )
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except APIError as e:
+            # Malformed request: answer once and drop the connection
+            body = json.dumps({"error": e.message}).encode("utf-8")
+            writer.write(
+                f"HTTP/1.1 {e.status.value} {e.status.phrase}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1") + body
+            )
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8080):
+        await self.warm_up()
+        server = await asyncio.start_server(
+            self.handle_connection, host, port, backlog=1024, limit=MAX_HEADER_BYTES
+        )
+        print(f"✓ Grievance API listening on http://{host}:{port} "
+              f"({self.cpu_pool._max_workers} worker processes)")
+        async with server:
+            await server.serve_forever()
+
+
+class Request:
+    """A parsed HTTP/1.1 request."""
+
+    def __init__(self, method, target, version, headers, body):
+        url = urlsplit(target)
+        self.method = method
+        self.path = url.path.rstrip("/") or "/"
+        self.query = parse_qs(url.query)
+        self.headers = headers
+        self.body = body
+        connection = headers.get("connection", "").lower()
+        self.keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+
+    @classmethod
+    async def read(cls, reader):
+        """
+        Read one request, or None when the client closed the connection.
+
+        Lines longer than the reader's limit (``MAX_HEADER_BYTES`` on the
+        server) and header blocks over ``MAX_HEADER_BYTES`` or
+        ``MAX_HEADERS`` are rejected before they are buffered any further.
+        """
+        try:
+            line = await reader.readline()
+        except ValueError:
+            raise APIError(414, f"Request line is limited to {MAX_HEADER_BYTES} bytes")
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise APIError(400, "Malformed request line")
+
+        too_large = APIError(431, f"Request headers are limited to {MAX_HEADERS} fields and {MAX_HEADER_BYTES} bytes")
+        headers = {}
+        size, count = len(line), 0
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                raise too_large
+            if line in (b"\r\n", b"\n", b""):
+                break
+            size += len(line)
+            count += 1
+            if size > MAX_HEADER_BYTES or count > MAX_HEADERS:
+                raise too_large
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise APIError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise APIError(413, f"Request body is limited to {MAX_BODY_BYTES} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return cls(method.upper(), target, version, headers, body)
+
+    def param(self, name, default=None):
+        values = self.query.get(name)
+        return values[0] if values else default
+
+    def json(self):
+        try:
+            data = json.loads(self.body or b"{}")
+        except ValueError:
+            raise APIError(400, "Body must be valid JSON")
+        if not isinstance(data, dict):
+            raise APIError(400, "Body must be a JSON object")
+        return data
+
+    def is_admin(self):
+        return hmac.compare_digest(self.headers.get("x-admin-password", "").encode(), ADMIN_PASSWORD.encode())
+
+    def require_admin(self):
+        if not self.is_admin():
+            raise APIError(401, "Admin password required (X-Admin-Password header)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless HTTP API for the grievance system")
+    parser.add_argument("--host", default="127.0.0.1", help="bind address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="port (default: 8080)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes for inference and PDF rendering (default: CPU count)")
+    parser.add_argument("--db", default=DB_PATH, help=f"database path (default: {DB_PATH})")
+    parser.add_argument("--model-path", default=MODEL_PATH, help=f"model to serve (default: {MODEL_PATH})")
+    args = parser.parse_args()
+
+    if not (is_numpy_model(args.model_path) or os.path.exists(args.model_path)):
+        print(f"⚠ Model not found at {args.model_path}; complaints get the default category")
+
+    def stop(signum, frame):
+        raise KeyboardInterrupt
+
+    # Treat SIGTERM like Ctrl+C so queued writes are flushed on the way out
+    signal.signal(signal.SIGTERM, stop)
+
+    api = GrievanceAPI(GrievanceDatabase(args.db), args.model_path, args.workers)
+    try:
+        asyncio.run(api.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        api.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,23 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-import joblib
 import os
+import tempfile
 from pathlib import Path
 
-from utils import (
-    get_priority,
-    get_department,
-    get_sentiment,
-    extract_keywords,
-    estimate_resolution_time,
-    generate_ticket_id,
-)
+from utils import generate_ticket_id
+from pipeline import enrich_complaints, get_enrichment_cache
+from numpy_model import NumpyLinearModel, is_numpy_model
+from inference import HotSwapModel
 from database import GrievanceDatabase
-from report_generator import generate_pdf_report
+from report_generator import complaint_receipt, get_receipt_renderer
+from export import EXPORT_FORMATS, available_formats, write_export
 
 # ================= CONFIGURATION =================
 ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'admin123')
 MODEL_PATH = os.getenv('MODEL_PATH', 'model/classifier.pkl')
 DB_PATH = os.getenv('DATABASE_PATH', 'data/grievances.db')
+ADMIN_PAGE_SIZE = 50
 
 # ================= PAGE CONFIG =================
 st.set_page_config(
@@ -138,14 +136,29 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ================= DATABASE & MODEL =================
-db = GrievanceDatabase(DB_PATH)
+@st.cache_resource
+def get_database():
+    """One database handle (and its connection pool) shared by every session and rerun."""
+    return GrievanceDatabase(DB_PATH)
+
+db = get_database()
 
 @st.cache_resource
 def load_model():
     """Load ML model from file with error handling."""
     try:
-        if os.path.exists(MODEL_PATH):
-            return joblib.load(MODEL_PATH)
+        if is_numpy_model(MODEL_PATH):
+            numpy_model = NumpyLinearModel(MODEL_PATH)
+            if numpy_model.skipped_members:
+                agreement = numpy_model.prediction_agreement
+                st.warning(
+                    f"⚠️ NumPy model leaves out {', '.join(numpy_model.skipped_members)}"
+                    + (f" and agrees with the full ensemble on {agreement:.0%} of complaints" if agreement else "")
+                )
+            return numpy_model
+        elif os.path.exists(MODEL_PATH):
+            # Picks up a model published by retrain.py without restarting the app
+            return HotSwapModel(MODEL_PATH)
         else:
             st.warning(f"⚠️ Model not found at {MODEL_PATH}. Please run train_model.py")
             return None
@@ -155,15 +168,13 @@ def load_model():
 
 model = load_model()
 
-def predict_category(text):
-    """Predict complaint category using ML model."""
-    if model:
-        try:
-            return model.predict([text])[0]
-        except Exception as e:
-            st.warning(f"Prediction error: {str(e)}. Using default category.")
-            return "Administrative"
-    return "Administrative"
+def analyze_complaints(texts):
+    """Run the AI analysis pipeline, falling back to the default category on model errors."""
+    try:
+        return enrich_complaints(texts, model, cache=get_enrichment_cache())
+    except Exception as e:
+        st.warning(f"Prediction error: {str(e)}. Using default category.")
+        return enrich_complaints(texts, None)
 
 # ================= TABS =================
 tabs = st.tabs([
@@ -222,12 +233,13 @@ with tabs[0]:
             st.error("⚠️ Please fill all required fields")
         else:
             with st.spinner("🤖 AI is analyzing your complaint..."):
-                category = predict_category(complaint_text)
-                priority = get_priority(complaint_text)
-                department = get_department(category)
-                sentiment = get_sentiment(complaint_text)
-                keywords = extract_keywords(complaint_text)
-                resolution = estimate_resolution_time(category, priority)
+                analysis = analyze_complaints([complaint_text]).iloc[0]
+                category = analysis["category"]
+                priority = analysis["priority"]
+                department = analysis["department"]
+                sentiment = {"label": analysis["sentiment_label"], "score": analysis["sentiment_score"]}
+                keywords = analysis["keywords"]
+                resolution = analysis["resolution_time"]
                 ticket_id = generate_ticket_id()
 
                 submitted_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -252,76 +264,72 @@ with tabs[0]:
                     "submitted_at": submitted_at
                 }
 
-                db.add_complaint(complaint_data)
+                saved = db.add_complaint(complaint_data)
 
-            st.success("✅ Complaint registered successfully!")
-            st.markdown(f"### 🎫 Your Ticket ID: `{ticket_id}`")
-            st.balloons()
+            if not saved:
+                st.error("❌ Your complaint could not be registered. Please submit it again.")
+            else:
+                # Lay out the receipt in the background while the results render
+                receipt = complaint_receipt(complaint_data)
+                receipts = get_receipt_renderer()
+                receipts.submit(ticket_id, receipt)
+
+                st.success("✅ Complaint registered successfully!")
+                st.markdown(f"### 🎫 Your Ticket ID: `{ticket_id}`")
+                st.balloons()
             
-            # Display AI analysis results
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("📋 Category", category)
-                st.metric("⚡ Priority", priority)
-            with col2:
-                st.metric("🏢 Department", department)
-                st.metric("⏰ Est. Resolution", resolution)
-            with col3:
-                st.metric("💭 Sentiment", sentiment["label"])
-                st.metric("🔑 Keywords", len(keywords))
+                # Display AI analysis results
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.metric("📋 Category", category)
+                    st.metric("⚡ Priority", priority)
+                with col2:
+                    st.metric("🏢 Department", department)
+                    st.metric("⏰ Est. Resolution", resolution)
+                with col3:
+                    st.metric("💭 Sentiment", sentiment["label"])
+                    st.metric("🔑 Keywords", len(keywords))
             
-            st.info(f"🔑 **Keywords identified:** {', '.join(keywords)}")
-
-            pdf_path = generate_pdf_report(
-                ticket_id,
-                {
-                    "Name": display_name,
-                    "Email": email,
-                    "Phone": phone or "N/A",
-                    "Category": category,
-                    "Priority": priority,
-                    "Department": department,
-                    "Sentiment": sentiment["label"],
-                    "Keywords": ", ".join(keywords),
-                    "Estimated Resolution": resolution,
-                    "Status": "Pending",
-                    "Submitted At": submitted_at,
-                    "Complaint": complaint_text
-                }
-            )
+                st.info(f"🔑 **Keywords identified:** {', '.join(keywords)}")
+
+                def receipt_pdf():
+                    """Collect the background render only when the button is clicked."""
+                    return receipts.get(ticket_id, receipt)
 
-            with open(pdf_path, "rb") as pdf:
                 st.download_button(
                     "📄 Download Official Receipt (PDF)",
-                    data=pdf,
+                    data=receipt_pdf,
                     file_name=f"Grievance_{ticket_id}.pdf",
                     mime="application/pdf",
                     use_container_width=True
                 )
             
-            st.warning("⚠️ **Important:** Save your Ticket ID to track your complaint status")
+                st.warning("⚠️ **Important:** Save your Ticket ID to track your complaint status")
 
 # ================= TAB 2: DASHBOARD =================
 with tabs[1]:
     st.markdown("## 📊 Analytics Dashboard")
     
-    data = db.get_all_complaints()
-    if data:
-        df = pd.DataFrame(data)
+    # Aggregates are computed in SQL over the whole table
+    stats = db.get_statistics()
+    total = stats["total_complaints"]
+    if total:
+        by_status = stats["by_status"]
+        by_priority = stats["by_priority"]
+        resolution_pct = stats["resolution_rate"]
         
         # Metrics Row
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.metric("📝 Total Complaints", len(df))
+            st.metric("📝 Total Complaints", total)
         with col2:
-            pending_count = (df["status"] == "Pending").sum()
+            pending_count = by_status.get("Pending", 0)
             st.metric("🟡 Pending", pending_count, delta="Needs Action" if pending_count > 0 else "All Clear")
         with col3:
-            in_progress = (df["status"] == "In Progress").sum()
+            in_progress = by_status.get("In Progress", 0)
             st.metric("🔵 In Progress", in_progress)
         with col4:
-            resolved = (df["status"] == "Resolved").sum()
-            resolution_pct = (resolved/len(df)*100) if len(df) > 0 else 0
+            resolved = by_status.get("Resolved", 0)
             st.metric("✅ Resolved", resolved, delta=f"{resolution_pct:.0f}% Rate")
         
         st.markdown("---")
@@ -329,15 +337,14 @@ with tabs[1]:
         # Additional metrics
         col1, col2, col3 = st.columns(3)
         with col1:
-            critical = (df["priority"] == "Critical").sum()
+            critical = by_priority.get("Critical", 0)
             st.metric("🚨 Critical Priority", critical, delta="⚠️ Urgent" if critical > 0 else None)
         with col2:
-            avg_sentiment = df["sentiment_score"].mean() if "sentiment_score" in df.columns else 0
+            avg_sentiment = stats["avg_sentiment"]
             sentiment_label = "Positive" if avg_sentiment > 0 else "Negative" if avg_sentiment < 0 else "Neutral"
             st.metric("💭 Avg Sentiment", sentiment_label, delta=f"{avg_sentiment:.2f}")
         with col3:
-            today_complaints = len(df[df["submitted_at"].str.contains(datetime.now().strftime("%Y-%m-%d"))])
-            st.metric("📅 Today's Complaints", today_complaints)
+            st.metric("📅 Today's Complaints", stats["today_count"])
         
         st.markdown("---")
         
@@ -346,35 +353,33 @@ with tabs[1]:
         
         with col1:
             st.markdown("### 🏢 Complaints by Department")
-            st.bar_chart(df["department"].value_counts())
+            st.bar_chart(pd.Series(stats["by_department"], name="count"))
             
             st.markdown("### ⚡ Priority Distribution")
-            priority_data = df["priority"].value_counts()
-            st.bar_chart(priority_data)
+            st.bar_chart(pd.Series(by_priority, name="count"))
         
         with col2:
             st.markdown("### 📋 Complaints by Category")
-            st.bar_chart(df["category"].value_counts())
+            st.bar_chart(pd.Series(stats["by_category"], name="count"))
             
             st.markdown("### 📊 Status Overview")
-            status_data = df["status"].value_counts()
-            st.bar_chart(status_data)
+            st.bar_chart(pd.Series(by_status, name="count"))
         
         st.markdown("---")
         st.markdown("### 📌 Recent Complaints")
-        recent_df = df[["ticket_id", "name", "category", "priority", "status", "submitted_at"]].tail(10)
+        recent, _ = db.get_complaints_page(limit=10)
+        recent_df = pd.DataFrame(recent)[["ticket_id", "name", "category", "priority", "status", "submitted_at"]]
         st.dataframe(recent_df, use_container_width=True, height=350)
         
         # Quick stats
         st.markdown("### 📈 Quick Statistics")
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.info(f"**Most Common Category:**\n{df['category'].mode()[0]}")
+            st.info(f"**Most Common Category:**\n{next(iter(stats['by_category']))}")
         with col2:
-            st.info(f"**Most Assigned Dept:**\n{df['department'].mode()[0]}")
+            st.info(f"**Most Assigned Dept:**\n{next(iter(stats['by_department']))}")
         with col3:
-            high_priority = ((df["priority"] == "High").sum() + (df["priority"] == "Critical").sum())
-            st.warning(f"**High Priority Issues:**\n{high_priority}")
+            st.warning(f"**High Priority Issues:**\n{stats['high_priority']}")
         with col4:
             st.success(f"**Resolution Rate:**\n{resolution_pct:.1f}%")
         
@@ -477,31 +482,46 @@ with tabs[3]:
         
         st.markdown("---")
         
-        # Get all complaints
-        complaints = db.get_all_complaints()
+        # Admin metrics come from grouped counts over the whole table
+        stats = db.get_statistics()
+        total = stats["total_complaints"]
         
-        if complaints:
-            df = pd.DataFrame(complaints)
+        if total:
+            by_status = stats["by_status"]
+            by_priority = stats["by_priority"]
             
             # Admin Metrics
             st.markdown("### 📈 Quick Statistics")
             col1, col2, col3, col4, col5 = st.columns(5)
             
             with col1:
-                st.metric("Total", len(df))
+                st.metric("Total", total)
             with col2:
-                critical = (df["priority"] == "Critical").sum()
+                critical = by_priority.get("Critical", 0)
                 st.metric("Critical", critical, delta="High Priority" if critical > 0 else None)
             with col3:
-                st.metric("High", (df["priority"] == "High").sum())
+                st.metric("High", by_priority.get("High", 0))
             with col4:
-                pending = (df["status"] == "Pending").sum()
+                pending = by_status.get("Pending", 0)
                 st.metric("Pending", pending, delta="Needs Action" if pending > 0 else None)
             with col5:
-                resolved = (df["status"] == "Resolved").sum()
-                resolution_rate = f"{(resolved/len(df)*100):.1f}%"
+                resolved = by_status.get("Resolved", 0)
+                resolution_rate = f"{(resolved/total*100):.1f}%"
                 st.metric("Resolved", f"{resolved} ({resolution_rate})")
             
+            cache_stats = get_enrichment_cache().stats()
+            st.caption(
+                f"AI analysis cache: {cache_stats['hit_rate']*100:.1f}% hit rate "
+                f"({cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                f"{cache_stats['size']}/{cache_stats['maxsize']} entries)"
+            )
+            read_stats = db.cache_stats()
+            st.caption(
+                f"Database read cache: {read_stats['hit_rate']*100:.1f}% hit rate "
+                f"({read_stats['hits']} hits, {read_stats['misses']} misses, "
+                f"{read_stats['invalidations']} invalidations)"
+            )
+            
             st.markdown("---")
             
             # Filters
@@ -523,29 +543,48 @@ with tabs[3]:
             with col3:
                 filter_category = st.selectbox(
                     "Filter by Category",
-                    ["All"] + list(df["category"].unique())
+                    ["All"] + sorted(stats["by_category"])
                 )
             
-            # Apply filters
-            filtered_df = df.copy()
-            if filter_status != "All":
-                filtered_df = filtered_df[filtered_df["status"] == filter_status]
-            if filter_priority != "All":
-                filtered_df = filtered_df[filtered_df["priority"] == filter_priority]
-            if filter_category != "All":
-                filtered_df = filtered_df[filtered_df["category"] == filter_category]
+            # Filters are pushed down to SQL; paging restarts whenever they change
+            filters = {
+                "status": None if filter_status == "All" else filter_status,
+                "priority": None if filter_priority == "All" else filter_priority,
+                "category": None if filter_category == "All" else filter_category,
+            }
+            if st.session_state.get("admin_filters") != filters:
+                st.session_state.admin_filters = filters
+                st.session_state.admin_cursors = [None]
+            cursors = st.session_state.admin_cursors
             
-            st.markdown(f"### 📋 All Complaints ({len(filtered_df)} records)")
+            page, next_cursor = db.get_complaints_page(
+                limit=ADMIN_PAGE_SIZE, cursor=cursors[-1], **filters
+            )
+            
+            st.markdown(f"### 📋 All Complaints (page {len(cursors)}, {len(page)} records)")
             
             # Display complaints table
-            st.dataframe(
-                filtered_df[[
-                    "ticket_id", "name", "email", "category", "priority", 
-                    "status", "department", "submitted_at"
-                ]],
-                use_container_width=True,
-                height=400
-            )
+            if page:
+                st.dataframe(
+                    pd.DataFrame(page)[[
+                        "ticket_id", "name", "email", "category", "priority", 
+                        "status", "department", "submitted_at"
+                    ]],
+                    use_container_width=True,
+                    height=400
+                )
+            else:
+                st.info("No complaints match the selected filters")
+            
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col1:
+                if st.button("⬅️ Previous Page", disabled=len(cursors) == 1, use_container_width=True):
+                    cursors.pop()
+                    st.rerun()
+            with col3:
+                if st.button("Next Page ➡️", disabled=next_cursor is None, use_container_width=True):
+                    cursors.append(next_cursor)
+                    st.rerun()
             
             st.markdown("---")
             
@@ -587,18 +626,43 @@ with tabs[3]:
             col1, col2 = st.columns(2)
             
             with col1:
-                if st.button("📊 Export All Data (CSV)", use_container_width=True):
-                    csv = df.to_csv(index=False)
-                    st.download_button(
-                        "📥 Download CSV",
-                        csv,
-                        file_name=f"grievances_export_{datetime.now().strftime('%Y%m%d')}.csv",
-                        mime="text/csv",
-                        use_container_width=True
-                    )
+                export_format = st.selectbox("Export Format", available_formats(), format_func=str.upper)
+                export_status = st.selectbox(
+                    "Export Status", ["All", "Pending", "In Progress", "Resolved"], key="export_status"
+                )
+                export_dates = st.date_input("Submitted Between", value=(), key="export_dates")
+
+                mime, extension = EXPORT_FORMATS[export_format]
+                export_filters = {
+                    "status": None if export_status == "All" else export_status,
+                    "start_date": export_dates[0] if len(export_dates) > 0 else None,
+                    "end_date": export_dates[-1] if len(export_dates) > 0 else None
+                }
+
+                def build_export():
+                    """
+                    Encode the export only when the button is clicked (Streamlit runs this on its own thread).
+
+                    Pieces are spooled to a temporary file as they are encoded and read
+                    back once, so only the finished file is held, not the pieces and a
+                    joined copy. Streamlit keeps downloads in memory until served, so the
+                    export itself cannot stream; for very large exports use ``export.py``.
+                    """
+                    with tempfile.TemporaryFile() as export_file:
+                        write_export(db.export_complaints(export_format, **export_filters), export_file)
+                        export_file.seek(0)
+                        return export_file.read()
+
+                st.download_button(
+                    f"📊 Export Data ({export_format.upper()})",
+                    build_export,
+                    file_name=f"grievances_export_{datetime.now().strftime('%Y%m%d')}{extension}",
+                    mime=mime,
+                    use_container_width=True
+                )
             
             with col2:
-                st.info(f"💾 Database: {len(df)} total records")
+                st.info(f"💾 Database: {total} total records")
             
         else:
             st.info("No complaints in the system yet")
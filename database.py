@@ -3,18 +3,648 @@ Grievance Database Module
 
 Provides SQLite database operations for the AI Grievance Redressal System.
 Handles complaint storage, retrieval, updates, and analytics with connection pooling
-and LRU caching for optimal performance.
+and an LRU read cache that is invalidated across processes via ``PRAGMA data_version``.
 
 Author: Debasis Behera
 """
 
 import sqlite3
+import atexit
 import json
-from datetime import datetime
+import base64
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
 import pandas as pd
 from contextlib import contextmanager
-from functools import lru_cache
+from functools import wraps
 import os
+from collections import Counter, OrderedDict
+
+from export import export_chunks
+
+
+INSERT_COMPLAINT_SQL = """
+    INSERT INTO complaints (
+        ticket_id, name, email, phone,
+        complaint_text, category, priority,
+        department, sentiment_label, sentiment_score,
+        keywords, resolution_time, status, submitted_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _complaint_params(complaint):
+    """Build the INSERT parameter tuple for a complaint dict."""
+    return (
+        complaint["ticket_id"],
+        complaint["name"],
+        complaint["email"],
+        complaint["phone"],
+        complaint["complaint_text"],
+        complaint["category"],
+        complaint["priority"],
+        complaint["department"],
+        complaint["sentiment_label"],
+        complaint["sentiment_score"],
+        complaint["keywords"],
+        complaint["resolution_time"],
+        complaint.get("status", "Pending"),
+        complaint["submitted_at"]
+    )
+
+
+TICKET_PREFIX = "GRV-"
+
+# Rollup dimensions maintained by triggers: name -> SQL expression over a complaint row
+ROLLUP_DIMENSIONS = {
+    "total": "''",
+    "status": "COALESCE({row}.status, '')",
+    "category": "{row}.category",
+    "priority": "{row}.priority",
+    "department": "{row}.department",
+    "day": "substr({row}.submitted_at, 1, 10)",
+}
+
+
+def _rollup_upsert_sql(row, sign):
+    """UPSERT adding (sign=1) or removing (sign=-1) one complaint row from every rollup."""
+    values = ",\n".join(
+        f"('{dimension}', {expression.format(row=row)}, {sign}, "
+        f"{sign} * COALESCE({row}.sentiment_score, 0), "
+        f"{sign} * ({row}.sentiment_score IS NOT NULL))"
+        for dimension, expression in ROLLUP_DIMENSIONS.items()
+    )
+    return f"""
+        INSERT INTO complaint_rollups (dimension, value, count, sentiment_sum, sentiment_count)
+        VALUES {values}
+        ON CONFLICT(dimension, value) DO UPDATE SET
+            count = count + excluded.count,
+            sentiment_sum = sentiment_sum + excluded.sentiment_sum,
+            sentiment_count = sentiment_count + excluded.sentiment_count;
+    """
+
+
+def _rollup_select_sql():
+    """Aggregate query producing the rollup rows from scratch."""
+    return "\nUNION ALL\n".join(
+        f"""SELECT '{dimension}', {expression.format(row='complaints')}, COUNT(*),
+               COALESCE(SUM(sentiment_score), 0), COUNT(sentiment_score)
+            FROM complaints GROUP BY 2"""
+        for dimension, expression in ROLLUP_DIMENSIONS.items()
+    )
+
+
+def _encode_cursor(kind, *values):
+    """Pack keyset pagination values into an opaque continuation token."""
+    payload = json.dumps([kind, *values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(token, kind):
+    """Unpack a continuation token produced by ``_encode_cursor``."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid pagination cursor: {token!r}") from e
+    if not isinstance(payload, list) or not payload or payload[0] != kind:
+        raise ValueError(f"Pagination cursor does not belong to this query: {token!r}")
+    return payload[1:]
+
+
+def _filter_clause(**filters):
+    """Build WHERE conditions and parameters for equality filters, skipping unset ones."""
+    where, params = [], []
+    for column, value in filters.items():
+        if value is not None:
+            where.append(f"{column} = ?")
+            params.append(value)
+    return where, params
+
+
+def _date_range_clause(start_date=None, end_date=None):
+    """
+    WHERE conditions for an inclusive range of submission dates.
+
+    Dates may be ``date``/``datetime`` objects or ISO strings; only the day
+    part is used. Comparing against day boundaries keeps the conditions
+    sargable on the ``submitted_at`` indexes.
+    """
+    where, params = [], []
+    if start_date:
+        where.append("submitted_at >= ?")
+        params.append(date.fromisoformat(str(start_date)[:10]).isoformat())
+    if end_date:
+        where.append("submitted_at < ?")
+        params.append((date.fromisoformat(str(end_date)[:10]) + timedelta(days=1)).isoformat())
+    return where, params
+
+
+class ConnectionPool:
+    """
+    Bounded, thread-aware pool of persistent SQLite connections.
+
+    Connections are opened lazily up to ``max_size`` and configured once
+    (WAL journal, ``synchronous=NORMAL``, busy timeout, statement cache), so
+    callers no longer pay connect and schema-parse costs on every query.
+    A thread that re-enters the pool while already holding a connection gets
+    the same connection back instead of deadlocking on an empty pool.
+
+    Args:
+        db_path (str): Path to SQLite database file
+        max_size (int): Maximum number of open connections
+        timeout (float): Seconds to wait for a free connection before failing
+        busy_timeout_ms (int): SQLite busy handler timeout in milliseconds
+        cached_statements (int): Size of each connection's prepared-statement cache
+    """
+
+    def __init__(self, db_path, max_size=5, timeout=30.0,
+                 busy_timeout_ms=5000, cached_statements=256):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cached_statements = cached_statements
+
+        self._idle = []
+        self._size = 0
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._local = threading.local()
+        self._closed = False
+
+        # Metrics
+        self._acquisitions = 0
+        self._waits = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._peak_in_use = 0
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def acquire(self):
+        """
+        Borrow a connection, blocking up to ``timeout`` seconds if the pool is exhausted.
+
+        Returns:
+            sqlite3.Connection: Configured database connection
+
+        Raises:
+            TimeoutError: If no connection becomes available in time
+        """
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            self._local.depth += 1
+            return held
+
+        start = time.perf_counter()
+        waited = False
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                if self._idle:
+                    conn = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    conn = None
+                    break
+                waited = True
+                remaining = self.timeout - (time.perf_counter() - start)
+                if remaining <= 0 or not self._available.wait(remaining):
+                    if not self._idle and self._size >= self.max_size:
+                        raise TimeoutError(
+                            f"No database connection available after {self.timeout}s "
+                            f"(pool size {self.max_size})"
+                        )
+
+            elapsed = time.perf_counter() - start
+            self._acquisitions += 1
+            if waited:
+                self._waits += 1
+                self._total_wait += elapsed
+                self._max_wait = max(self._max_wait, elapsed)
+            in_use = self._size - len(self._idle)
+            self._peak_in_use = max(self._peak_in_use, in_use)
+
+        if conn is None:
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._available:
+                    self._size -= 1
+                    self._available.notify()
+                raise
+
+        self._local.conn = conn
+        self._local.depth = 1
+        return conn
+
+    def release(self, conn):
+        """Return a connection to the pool, rolling back any unfinished transaction."""
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+        self._local.conn = None
+
+        if conn.in_transaction:
+            conn.rollback()
+
+        with self._available:
+            if self._closed:
+                self._size -= 1
+                conn.close()
+            else:
+                self._idle.append(conn)
+            self._available.notify()
+
+    def close(self):
+        """Close all idle connections and refuse further acquisitions."""
+        with self._available:
+            self._closed = True
+            while self._idle:
+                self._idle.pop().close()
+                self._size -= 1
+            self._available.notify_all()
+
+    def stats(self):
+        """
+        Snapshot of pool utilisation metrics.
+
+        Returns:
+            dict: Pool size, idle/in-use counts and wait-time statistics
+        """
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "open_connections": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "peak_in_use": self._peak_in_use,
+                "acquisitions": self._acquisitions,
+                "waits": self._waits,
+                "total_wait_ms": round(self._total_wait * 1000, 3),
+                "avg_wait_ms": round(self._total_wait * 1000 / self._waits, 3) if self._waits else 0.0,
+                "max_wait_ms": round(self._max_wait * 1000, 3),
+            }
+
+
+INSERT_TODAY_ANALYTICS_SQL = """
+    INSERT INTO analytics (date, category, priority, count)
+    VALUES (?, ?, ?, 1)
+    ON CONFLICT(date, category, priority)
+    DO UPDATE SET count = count + 1
+"""
+
+UPDATE_STATUS_SQL = """
+    UPDATE complaints
+    SET status = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE ticket_id = ?
+"""
+
+_STOP = object()
+
+
+class GroupCommitWriter:
+    """
+    Single background writer that commits queued writes in groups.
+
+    Complaint inserts and status updates are queued and answered with a
+    ``Future``. One thread takes everything waiting in the queue (at most
+    ``max_batch`` operations, waiting up to ``max_delay`` seconds after the
+    first for more) and applies the batch in one ``BEGIN IMMEDIATE``
+    transaction.
+    Whatever queues up while one transaction commits goes into the next, so
+    concurrent writers share one lock acquisition and one WAL sync instead
+    of queueing on SQLite's write lock. Each operation runs inside its own
+    SAVEPOINT, so a rejected row (e.g. duplicate ticket) only fails its own
+    future. ``close`` (also registered with ``atexit``) commits everything
+    still queued before the thread stops.
+
+    Args:
+        connect (callable): Opens the writer's dedicated connection
+        max_batch (int): Most operations per transaction. Defaults to 256
+        max_delay (float): Extra seconds to wait for more operations once one
+            is queued, so writes arriving together share a commit. Defaults
+            to 0.002 (2 ms); 0 commits whatever is already queued
+        on_commit (callable): Called after every transaction that changed rows
+    """
+
+    def __init__(self, connect, max_batch=256, max_delay=0.002, on_commit=None):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.on_commit = on_commit
+        self._conn = connect()
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # Metrics
+        self._peak_depth = 0
+        self._batches = 0
+        self._operations = 0
+        self._failed = 0
+        self._max_batch_seen = 0
+        self._commit_seconds = 0.0
+        self._max_commit = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, kind, *args):
+        """
+        Queue a write.
+
+        Args:
+            kind (str): 'insert' (args: complaint dict), 'status' (args: ticket_id,
+                new_status) or 'barrier' (no args; resolves once everything
+                queued before it is committed)
+
+        Returns:
+            concurrent.futures.Future: Resolves with the operation's result
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Database writer is closed")
+            self._queue.put((kind, args, future))
+            self._peak_depth = max(self._peak_depth, self._queue.qsize())
+        return future
+
+    def flush(self, timeout=None):
+        """Block until every write queued so far is committed."""
+        self.submit("barrier").result(timeout)
+
+    def close(self, timeout=None):
+        """Commit everything still queued, then stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if not self._thread.is_alive():
+            self._conn.close()
+        atexit.unregister(self.close)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self._queue.get(timeout=remaining)
+                    except queue.Empty:
+                        break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._commit(batch)
+
+        # Closed: nothing can be queued any more, commit what is left
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                leftover.append(item)
+        for first in range(0, len(leftover), self.max_batch):
+            self._commit(leftover[first:first + self.max_batch])
+
+    def _apply(self, cursor, kind, args):
+        if kind == "insert":
+            complaint, = args
+            cursor.execute(INSERT_COMPLAINT_SQL, _complaint_params(complaint))
+            cursor.execute(INSERT_TODAY_ANALYTICS_SQL, (
+                datetime.now().date().isoformat(), complaint["category"], complaint["priority"]
+            ))
+            return True
+        if kind == "status":
+            cursor.execute(UPDATE_STATUS_SQL, (args[1], args[0]))
+            return cursor.rowcount > 0
+        if kind == "barrier":
+            return True
+        raise ValueError(f"Unknown write operation '{kind}'")
+
+    def _commit(self, batch):
+        start = time.perf_counter()
+        outcomes = []
+        changed = False
+        cursor = self._conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            for kind, args, _ in batch:
+                cursor.execute("SAVEPOINT op")
+                try:
+                    result = self._apply(cursor, kind, args)
+                    cursor.execute("RELEASE op")
+                    outcomes.append((True, result))
+                    changed = changed or (kind != "barrier" and result)
+                except sqlite3.IntegrityError:
+                    # Same answer add_complaint gives for a rejected row
+                    cursor.execute("ROLLBACK TO op")
+                    cursor.execute("RELEASE op")
+                    outcomes.append((True, False))
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO op")
+                    cursor.execute("RELEASE op")
+                    outcomes.append((False, e))
+            self._conn.commit()
+        except Exception as e:
+            if self._conn.in_transaction:
+                self._conn.rollback()
+            outcomes = [(False, e)] * len(batch)
+            changed = False
+
+        if changed and self.on_commit is not None:
+            self.on_commit()
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self._batches += 1
+            self._operations += len(batch)
+            self._failed += sum(1 for ok, _ in outcomes if not ok)
+            self._max_batch_seen = max(self._max_batch_seen, len(batch))
+            self._commit_seconds += elapsed
+            self._max_commit = max(self._max_commit, elapsed)
+
+        for (_, _, future), (ok, value) in zip(batch, outcomes):
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def stats(self):
+        """
+        Snapshot of writer metrics.
+
+        Returns:
+            dict: Current and peak queue depth, batch counts and sizes, and commit times
+        """
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "peak_queue_depth": self._peak_depth,
+                "batches": self._batches,
+                "operations": self._operations,
+                "failed": self._failed,
+                "avg_batch_size": round(self._operations / self._batches, 2) if self._batches else 0.0,
+                "max_batch_size": self._max_batch_seen,
+                "avg_commit_ms": round(self._commit_seconds * 1000 / self._batches, 3) if self._batches else 0.0,
+                "max_commit_ms": round(self._max_commit * 1000, 3),
+                "closed": self._closed,
+            }
+
+
+class ReadCache:
+    """
+    Bounded LRU of read results that is valid across processes.
+
+    Before every lookup the cache runs ``PRAGMA data_version`` on its own
+    connection. SQLite changes that value whenever any other connection, in
+    this process or another, commits to the database, and the cache is
+    emptied when it moves. A read when nothing changed costs one pragma,
+    with no table access. The watcher connection never writes (its own
+    commits would not move the value) and is shared under a lock.
+
+    Args:
+        connect (callable): Opens the dedicated watcher connection
+        maxsize (int): Most cached results. Defaults to 256
+    """
+
+    def __init__(self, connect, maxsize=256):
+        self.maxsize = maxsize
+        self._conn = connect()
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _check_version(self):
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+        return version
+
+    def get(self, key, load):
+        """
+        Cached result for ``key``, calling ``load()`` on a miss.
+
+        A result is only stored if the database did not change between the
+        version check and the load starting, so a stale result is never
+        cached under a newer version.
+        """
+        with self._lock:
+            version = self._check_version()
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = load()
+
+        with self._lock:
+            if self._version == version and self.maxsize > 0:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def close(self):
+        with self._lock:
+            self._entries.clear()
+            self._conn.close()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "data_version": self._version,
+            }
+
+
+def _copy_rows(rows):
+    return [dict(row) for row in rows]
+
+
+def _copy_page(page):
+    rows, cursor = page
+    return _copy_rows(rows), cursor
+
+
+def _copy_row(row):
+    return dict(row) if row is not None else None
+
+
+def _copy_stats(stats):
+    return {key: dict(value) if isinstance(value, dict) else value for key, value in stats.items()}
+
+
+def cached_read(copy, per_day=False):
+    """
+    Serve a GrievanceDatabase read method from its ReadCache.
+
+    Results are keyed by method name and arguments (plus today's date when
+    ``per_day``) and handed out through ``copy``, so callers can modify what
+    they get without touching the cached value. The undecorated method
+    stays available as ``.uncached``.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            if per_day:
+                key += (datetime.now().date().isoformat(),)
+            return copy(self.read_cache.get(key, lambda: method(self, *args, **kwargs)))
+        wrapper.uncached = method
+        return wrapper
+    return decorator
 
 
 class GrievanceDatabase:
@@ -26,15 +656,32 @@ class GrievanceDatabase:
     
     Args:
         db_path (str): Path to SQLite database file. Defaults to 'data/grievances.db'
+        pool_size (int): Maximum number of pooled connections. Defaults to 5
+        group_commit (bool): Send inserts and status updates through the
+            background GroupCommitWriter. Defaults to True
+        cache_size (int): Entries in the list/stats/lookup read cache; 0 disables
+            it. Defaults to 256
+        writer_max_batch (int): Most queued writes per group commit. Defaults to 256
+        writer_max_delay (float): Seconds the writer waits for more writes after
+            the first one is queued. Defaults to 0.002 (2 ms)
     """
     
-    def __init__(self, db_path="data/grievances.db"):
+    def __init__(self, db_path="data/grievances.db", pool_size=5, group_commit=True,
+                 cache_size=256, writer_max_batch=256, writer_max_delay=0.002):
         self.db_path = db_path
 
         # Ensure data folder exists
-        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
 
+        self.pool = ConnectionPool(db_path, max_size=pool_size)
         self.init_database()
+        self.read_cache = ReadCache(self.pool._connect, maxsize=cache_size)
+
+        self.group_commit = group_commit
+        self.writer_max_batch = writer_max_batch
+        self.writer_max_delay = writer_max_delay
+        self._writer = None
+        self._writer_lock = threading.Lock()
 
     # --------------------------------------------------
     # DB CONNECTION
@@ -44,18 +691,77 @@ class GrievanceDatabase:
         """
         Context manager for database connections.
         
-        Ensures proper connection handling and automatic cleanup.
+        Borrows a persistent connection from the pool and returns it on exit,
+        rolling back anything left uncommitted.
         Returns Row objects for dict-like access.
         
         Yields:
             sqlite3.Connection: Active database connection
         """
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        conn.row_factory = sqlite3.Row
+        conn = self.pool.acquire()
         try:
             yield conn
         finally:
-            conn.close()
+            self.pool.release(conn)
+
+    def pool_stats(self):
+        """Return connection pool metrics (size, utilisation, wait times)."""
+        return self.pool.stats()
+
+    def close(self):
+        """Commit queued writes, then close all connections."""
+        if self._writer is not None:
+            self._writer.close()
+        self.read_cache.close()
+        self.pool.close()
+
+    def cache_stats(self):
+        """Return read cache metrics (size, hit rate, invalidations)."""
+        return self.read_cache.stats()
+
+    # --------------------------------------------------
+    # GROUP COMMIT (QUEUED WRITES)
+    # --------------------------------------------------
+    @property
+    def writer(self):
+        """The background GroupCommitWriter, started on first use."""
+        if self._writer is None:
+            with self._writer_lock:
+                if self._writer is None:
+                    self._writer = GroupCommitWriter(
+                        self.pool._connect,
+                        max_batch=self.writer_max_batch,
+                        max_delay=self.writer_max_delay
+                    )
+        return self._writer
+
+    def queue_complaint(self, complaint):
+        """
+        Queue a complaint insert for the next group commit.
+
+        Returns:
+            concurrent.futures.Future: True once committed, False if rejected
+            (e.g. duplicate ticket ID)
+        """
+        return self.writer.submit("insert", complaint)
+
+    def queue_status_update(self, ticket_id, new_status):
+        """
+        Queue a status update for the next group commit.
+
+        Returns:
+            concurrent.futures.Future: True once committed, False if the ticket does not exist
+        """
+        return self.writer.submit("status", ticket_id, new_status)
+
+    def flush(self, timeout=None):
+        """Wait until every queued write is committed."""
+        if self._writer is not None:
+            self._writer.flush(timeout)
+
+    def writer_stats(self):
+        """Return group-commit metrics (queue depth, batch sizes, commit times)."""
+        return self.writer.stats() if self._writer is not None else None
 
     # --------------------------------------------------
     # INIT DATABASE
@@ -101,73 +807,530 @@ class GrievanceDatabase:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_status ON complaints(status)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_priority ON complaints(priority)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_category ON complaints(category)")
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_submitted_id ON complaints(submitted_at DESC, id DESC)"
+            )
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_status_submitted "
+                "ON complaints(status, submitted_at DESC, id DESC)"
+            )
+
+            # Incremental retraining: how far retrain.py has read, for which model
+            # version, and the complaints at or below that point still pending
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS training_state (
+                    name TEXT PRIMARY KEY,
+                    value INTEGER
+                )
+            """)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS training_pending (
+                    complaint_id INTEGER PRIMARY KEY
+                )
+            """)
+
+            self.fts_enabled = self._init_search_index(cursor)
+            self._init_rollups(cursor)
+
+            conn.commit()
+
+    def _init_rollups(self, cursor):
+        """
+        Create the trigger-maintained rollup table.
+        
+        ``complaint_rollups`` holds one row per (dimension, value) with the
+        complaint count and sentiment totals, updated incrementally on insert,
+        update and delete so statistics are O(groups) reads. Existing
+        databases are populated once when the table is first created.
+        """
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'complaint_rollups'"
+        )
+        exists = cursor.fetchone() is not None
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS complaint_rollups (
+                dimension TEXT NOT NULL,
+                value TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                sentiment_sum REAL NOT NULL DEFAULT 0,
+                sentiment_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (dimension, value)
+            ) WITHOUT ROWID
+        """)
+
+        prune = "DELETE FROM complaint_rollups WHERE count <= 0;"
+        tracked = ", ".join(["status", "category", "priority", "department",
+                             "submitted_at", "sentiment_score"])
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS complaints_rollup_insert AFTER INSERT ON complaints BEGIN
+                {_rollup_upsert_sql("new", 1)}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS complaints_rollup_delete AFTER DELETE ON complaints BEGIN
+                {_rollup_upsert_sql("old", -1)}
+                {prune}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS complaints_rollup_update
+            AFTER UPDATE OF {tracked} ON complaints BEGIN
+                {_rollup_upsert_sql("old", -1)}
+                {_rollup_upsert_sql("new", 1)}
+                {prune}
+            END
+        """)
+
+        if not exists:
+            self._rebuild_rollups(cursor)
 
+    def _rebuild_rollups(self, cursor):
+        cursor.execute("DELETE FROM complaint_rollups")
+        cursor.execute(f"""
+            INSERT INTO complaint_rollups (dimension, value, count, sentiment_sum, sentiment_count)
+            {_rollup_select_sql()}
+        """)
+
+    def rebuild_rollups(self):
+        """Recompute every rollup row from the complaints table."""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            self._rebuild_rollups(cursor)
             conn.commit()
 
+    def check_rollups(self, repair=False):
+        """
+        Compare the stored rollups with a from-scratch aggregation.
+        
+        Args:
+            repair (bool): Rebuild the rollups if any difference is found
+            
+        Returns:
+            list: (dimension, value, stored count, expected count) for every
+            mismatching group; empty when the rollups are consistent
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT dimension, value, count, sentiment_sum, sentiment_count FROM complaint_rollups"
+            )
+            stored = {(row[0], row[1]): tuple(row[2:]) for row in cursor.fetchall()}
+            cursor.execute(_rollup_select_sql())
+            expected = {(row[0], row[1]): tuple(row[2:]) for row in cursor.fetchall()}
+
+        mismatches = []
+        for key in sorted(stored.keys() | expected.keys()):
+            have = stored.get(key, (0, 0.0, 0))
+            want = expected.get(key, (0, 0.0, 0))
+            # Sentiment sums are floats accumulated incrementally
+            if have[0] != want[0] or have[2] != want[2] or abs(have[1] - want[1]) > 1e-6:
+                mismatches.append((*key, have[0], want[0]))
+
+        if mismatches and repair:
+            self.rebuild_rollups()
+        return mismatches
+
+    def _init_search_index(self, cursor):
+        """
+        Create the FTS5 index over complaint text, keywords and name.
+        
+        The index is an external-content table kept in sync by triggers.
+        Databases created before the index existed are backfilled once.
+        
+        Returns:
+            bool: False if this SQLite build lacks FTS5 (LIKE search is used instead)
+        """
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'complaints_fts'"
+        )
+        exists = cursor.fetchone() is not None
+
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS complaints_fts USING fts5(
+                    complaint_text, keywords, name,
+                    content='complaints',
+                    content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2'
+                )
+            """)
+        except sqlite3.OperationalError:
+            return False
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS complaints_fts_insert AFTER INSERT ON complaints BEGIN
+                INSERT INTO complaints_fts (rowid, complaint_text, keywords, name)
+                VALUES (new.id, new.complaint_text, new.keywords, new.name);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS complaints_fts_delete AFTER DELETE ON complaints BEGIN
+                INSERT INTO complaints_fts (complaints_fts, rowid, complaint_text, keywords, name)
+                VALUES ('delete', old.id, old.complaint_text, old.keywords, old.name);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS complaints_fts_update
+            AFTER UPDATE OF complaint_text, keywords, name ON complaints BEGIN
+                INSERT INTO complaints_fts (complaints_fts, rowid, complaint_text, keywords, name)
+                VALUES ('delete', old.id, old.complaint_text, old.keywords, old.name);
+                INSERT INTO complaints_fts (rowid, complaint_text, keywords, name)
+                VALUES (new.id, new.complaint_text, new.keywords, new.name);
+            END
+        """)
+
+        if not exists:
+            # Migration: index complaints stored before FTS was introduced
+            cursor.execute("INSERT INTO complaints_fts (complaints_fts) VALUES ('rebuild')")
+
+        return True
+
     # --------------------------------------------------
     # ADD COMPLAINT
     # --------------------------------------------------
     def add_complaint(self, complaint):
+        if self.group_commit:
+            return self.queue_complaint(complaint).result()
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
             try:
-                cursor.execute("""
-                    INSERT INTO complaints (
-                        ticket_id, name, email, phone,
-                        complaint_text, category, priority,
-                        department, sentiment_label, sentiment_score,
-                        keywords, resolution_time, status, submitted_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    complaint["ticket_id"],
-                    complaint["name"],
-                    complaint["email"],
-                    complaint["phone"],
-                    complaint["complaint_text"],
-                    complaint["category"],
-                    complaint["priority"],
-                    complaint["department"],
-                    complaint["sentiment_label"],
-                    complaint["sentiment_score"],
-                    complaint["keywords"],
-                    complaint["resolution_time"],
-                    complaint.get("status", "Pending"),
-                    complaint["submitted_at"]
-                ))
+                cursor.execute(INSERT_COMPLAINT_SQL, _complaint_params(complaint))
 
                 today = datetime.now().date().isoformat()
-                cursor.execute("""
-                    INSERT INTO analytics (date, category, priority, count)
-                    VALUES (?, ?, ?, 1)
-                    ON CONFLICT(date, category, priority)
-                    DO UPDATE SET count = count + 1
-                """, (today, complaint["category"], complaint["priority"]))
+                cursor.execute(INSERT_TODAY_ANALYTICS_SQL, (today, complaint["category"], complaint["priority"]))
 
                 conn.commit()
-                self.get_statistics.cache_clear()
                 return True
 
             except sqlite3.IntegrityError:
                 return False
 
+    # --------------------------------------------------
+    # BULK INGESTION (MIGRATIONS / CALL-CENTRE FEEDS)
+    # --------------------------------------------------
+    def add_complaints_bulk(self, complaints, chunk_size=500):
+        """
+        Insert many complaints with one transaction per chunk.
+        
+        Records are consumed lazily from any iterable, so arbitrarily large
+        feeds can be streamed. Each chunk is written with ``executemany`` and
+        its analytics counts are pre-aggregated in memory into one UPSERT per
+        (date, category, priority). Analytics rows use the date part of each
+        complaint's ``submitted_at``.
+        
+        Args:
+            complaints (iterable): Complaint dicts in the ``add_complaint`` format
+            chunk_size (int): Number of records per transaction. Defaults to 500
+            
+        Returns:
+            dict: ``inserted`` row count and a ``failed`` list with the
+            ``index``, ``ticket_id`` and ``error`` of every rejected record
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        result = {"inserted": 0, "failed": []}
+        chunk = []
+        for index, complaint in enumerate(complaints):
+            chunk.append((index, complaint))
+            if len(chunk) >= chunk_size:
+                self._insert_chunk(chunk, result)
+                chunk = []
+        if chunk:
+            self._insert_chunk(chunk, result)
+
+        result["failed"].sort(key=lambda failure: failure["index"])
+        return result
+
+    def _insert_chunk(self, chunk, result):
+        failed = result["failed"]
+        rows = []
+        for index, complaint in chunk:
+            try:
+                rows.append((index, complaint, _complaint_params(complaint)))
+            except (KeyError, TypeError) as e:
+                failed.append({
+                    "index": index,
+                    "ticket_id": complaint.get("ticket_id") if isinstance(complaint, dict) else None,
+                    "error": f"Missing field: {e}"
+                })
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+
+            # Reject tickets that already exist or repeat within this chunk
+            cursor.execute(
+                "SELECT ticket_id FROM complaints WHERE ticket_id IN (SELECT value FROM json_each(?))",
+                (json.dumps([params[0] for _, _, params in rows]),)
+            )
+            seen = {row[0] for row in cursor.fetchall()}
+            accepted = []
+            for index, complaint, params in rows:
+                if params[0] in seen:
+                    failed.append({
+                        "index": index,
+                        "ticket_id": params[0],
+                        "error": "Duplicate ticket_id"
+                    })
+                else:
+                    seen.add(params[0])
+                    accepted.append((index, complaint, params))
+
+            try:
+                cursor.executemany(INSERT_COMPLAINT_SQL, [params for _, _, params in accepted])
+            except sqlite3.IntegrityError:
+                # Another constraint failed somewhere in the batch: roll back the
+                # whole chunk and replay it row by row in a fresh transaction, so
+                # only the offending rows end up in ``failed``. Inside that
+                # replay a failing INSERT is undone on its own and the
+                # transaction carries on.
+                conn.rollback()
+                cursor.execute("BEGIN IMMEDIATE")
+                inserted = []
+                for index, complaint, params in accepted:
+                    try:
+                        cursor.execute(INSERT_COMPLAINT_SQL, params)
+                        inserted.append((index, complaint, params))
+                    except sqlite3.IntegrityError as e:
+                        failed.append({"index": index, "ticket_id": params[0], "error": str(e)})
+                accepted = inserted
+
+            today = datetime.now().date().isoformat()
+            counts = Counter(
+                (str(complaint.get("submitted_at") or today)[:10], complaint["category"], complaint["priority"])
+                for _, complaint, _ in accepted
+            )
+            cursor.executemany("""
+                INSERT INTO analytics (date, category, priority, count)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(date, category, priority)
+                DO UPDATE SET count = count + excluded.count
+            """, [(*key, count) for key, count in counts.items()])
+
+            conn.commit()
+
+        result["inserted"] += len(accepted)
+
     # --------------------------------------------------
     # GET ALL COMPLAINTS (ADMIN / DASHBOARD)
     # --------------------------------------------------
+    @cached_read(_copy_rows)
     def get_all_complaints(self, limit=500):
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT * FROM complaints
-                ORDER BY submitted_at DESC
+                ORDER BY submitted_at DESC, id DESC
                 LIMIT ?
-            """, (limit,))
+            """, (-1 if limit is None else limit,))
             rows = cursor.fetchall()
 
         return [dict(row) for row in rows]
 
+    @cached_read(_copy_page)
+    def get_complaints_page(self, limit=50, cursor=None, status=None,
+                            priority=None, category=None):
+        """
+        Newest-first complaint listing with keyset pagination.
+        
+        Pages are addressed by the (submitted_at, id) of the last row seen and
+        served from ``idx_submitted_id``, so every page costs the same no matter
+        how deep into the table it is.
+        
+        Args:
+            limit (int): Page size. Defaults to 50
+            cursor (str): Continuation token from a previous page
+            status (str): Optional status filter
+            priority (str): Optional priority filter
+            category (str): Optional category filter
+            
+        Returns:
+            tuple: (list of complaint dicts, next-page token or None)
+        """
+        where, params = _filter_clause(status=status, priority=priority, category=category)
+        if cursor:
+            last_submitted, last_id = _decode_cursor(cursor, "page")
+            where.append("(submitted_at, id) < (?, ?)")
+            params += [last_submitted, last_id]
+
+        sql = "SELECT * FROM complaints"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY submitted_at DESC, id DESC LIMIT ?"
+
+        with self.get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, (*params, limit + 1))
+            rows = [dict(row) for row in cur.fetchall()]
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor("page", rows[-1]["submitted_at"], rows[-1]["id"])
+        return rows, next_cursor
+
+    # --------------------------------------------------
+    # STREAM LABELLED COMPLAINTS (MODEL TRAINING)
+    # --------------------------------------------------
+    def iter_labelled_complaints(self, chunk_size=5000, after_id=0, handled_only=False):
+        """
+        Stream (id, complaint_text, category, status) rows in id order, one page at a time.
+
+        Each page is a primary-key range scan on its own pooled connection, so
+        memory stays bounded by ``chunk_size`` however large the table is.
+
+        Args:
+            chunk_size (int): Rows per page. Defaults to 5000
+            after_id (int): Only rows with a larger id (training watermark). Defaults to 0
+            handled_only (bool): Skip complaints still 'Pending' (not yet seen by an admin)
+
+        Yields:
+            list: Up to ``chunk_size`` dicts with id, complaint_text, category and status
+        """
+        sql = "SELECT id, complaint_text, category, status FROM complaints WHERE id > ?"
+        if handled_only:
+            sql += " AND status != 'Pending'"
+        sql += " ORDER BY id LIMIT ?"
+
+        last_id = after_id
+        while True:
+            with self.get_connection() as conn:
+                rows = [dict(row) for row in conn.execute(sql, (last_id, chunk_size)).fetchall()]
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1]["id"]
+
+    def get_labelled_complaints(self, ids):
+        """
+        Fetch (id, complaint_text, category, status) rows for the given ids, in id order.
+
+        Ids that no longer exist are left out.
+
+        Args:
+            ids (list): Complaint ids
+
+        Returns:
+            list: Dicts with id, complaint_text, category and status
+        """
+        with self.get_connection() as conn:
+            rows = conn.execute("""
+                SELECT id, complaint_text, category, status FROM complaints
+                WHERE id IN (SELECT value FROM json_each(?))
+                ORDER BY id
+            """, (json.dumps(list(ids)),)).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_training_state(self):
+        """
+        Incremental-retraining position saved by ``save_training_state``.
+
+        Returns:
+            dict: watermark (0 if never saved), model_version (None if never
+            saved) and pending_ids
+        """
+        with self.get_connection() as conn:
+            state = dict(conn.execute("SELECT name, value FROM training_state").fetchall())
+            pending = [row[0] for row in conn.execute(
+                "SELECT complaint_id FROM training_pending ORDER BY complaint_id"
+            )]
+        return {
+            "watermark": state.get("watermark", 0),
+            "model_version": state.get("model_version"),
+            "pending_ids": pending,
+        }
+
+    def save_training_state(self, watermark, model_version, pending_ids):
+        """
+        Replace the incremental-retraining position in one transaction.
+
+        Args:
+            watermark (int): Highest complaint id read
+            model_version (int): Model version trained up to ``watermark``
+            pending_ids (list): Complaints at or below ``watermark`` not yet handled
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(
+                "INSERT OR REPLACE INTO training_state (name, value) VALUES (?, ?)",
+                [("watermark", watermark), ("model_version", model_version)]
+            )
+            cursor.execute("DELETE FROM training_pending")
+            cursor.executemany(
+                "INSERT INTO training_pending (complaint_id) VALUES (?)",
+                [(complaint_id,) for complaint_id in pending_ids]
+            )
+            conn.commit()
+
+    # --------------------------------------------------
+    # STREAMED EXPORT (CSV / JSONL / PARQUET)
+    # --------------------------------------------------
+    def iter_complaint_chunks(self, chunk_size=1000, status=None, priority=None,
+                              category=None, start_date=None, end_date=None):
+        """
+        Stream complaints matching the filters, newest first, in chunks.
+
+        Filters run in SQL and rows are pulled from a single open cursor with
+        ``fetchmany``, so memory stays bounded by ``chunk_size`` and the export
+        is one consistent snapshot. The pooled connection is held until the
+        generator is exhausted or closed.
+
+        Args:
+            chunk_size (int): Rows per fetch. Defaults to 1000
+            status (str): Optional status filter
+            priority (str): Optional priority filter
+            category (str): Optional category filter
+            start_date (date or str): Optional first submission date (inclusive)
+            end_date (date or str): Optional last submission date (inclusive)
+
+        Yields:
+            list: Up to ``chunk_size`` complaint dicts
+        """
+        where, params = _filter_clause(status=status, priority=priority, category=category)
+        date_where, date_params = _date_range_clause(start_date, end_date)
+        where += date_where
+        params += date_params
+
+        sql = "SELECT * FROM complaints"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY submitted_at DESC, id DESC"
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            try:
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if not rows:
+                        return
+                    yield [dict(row) for row in rows]
+            finally:
+                cursor.close()
+
+    def export_complaints(self, fmt="csv", chunk_size=1000, **filters):
+        """
+        Export complaints as CSV, JSON Lines or Parquet, piece by piece.
+
+        Args:
+            fmt (str): 'csv', 'jsonl' or 'parquet' (needs pyarrow). Defaults to 'csv'
+            chunk_size (int): Rows per fetch. Defaults to 1000
+            **filters: status, priority, category, start_date, end_date
+                (see ``iter_complaint_chunks``)
+
+        Yields:
+            bytes: Consecutive pieces of the exported file
+        """
+        return export_chunks(self.iter_complaint_chunks(chunk_size, **filters), fmt)
+
     # --------------------------------------------------
     # GET COMPLAINT BY TICKET (TRACKING FIXED ✅)
     # --------------------------------------------------
+    @cached_read(_copy_row)
     def get_complaint_by_ticket(self, ticket_id):
         with self.get_connection() as conn:
             cursor = conn.cursor()
@@ -186,70 +1349,196 @@ class GrievanceDatabase:
     # UPDATE STATUS (ADMIN)
     # --------------------------------------------------
     def update_complaint_status(self, ticket_id, new_status):
+        if self.group_commit:
+            return self.queue_status_update(ticket_id, new_status).result()
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE complaints
-                SET status = ?, updated_at = CURRENT_TIMESTAMP
-                WHERE ticket_id = ?
-            """, (new_status, ticket_id))
+            cursor.execute(UPDATE_STATUS_SQL, (new_status, ticket_id))
             conn.commit()
-            self.get_statistics.cache_clear()
 
         return cursor.rowcount > 0
 
     # --------------------------------------------------
     # STATISTICS (DASHBOARD)
     # --------------------------------------------------
-    @lru_cache(maxsize=1)
+    @cached_read(_copy_stats, per_day=True)
     def get_statistics(self):
+        """
+        Dashboard statistics read from the trigger-maintained rollups.
+        
+        Cost depends on the number of distinct groups, not on the number of
+        complaints. Grouped counts are ordered from most to least frequent.
+        Served from the read cache until any process changes the database.
+        
+        Returns:
+            dict: Totals, per-status/category/priority/department/day counts,
+            today's count, average sentiment, resolution rate, high-priority
+            total and the daily analytics trend
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            stats = {}
-
-            cursor.execute("SELECT COUNT(*) FROM complaints")
-            stats["total_complaints"] = cursor.fetchone()[0]
-
-            cursor.execute("SELECT status, COUNT(*) FROM complaints GROUP BY status")
-            stats["by_status"] = dict(cursor.fetchall())
-
-            cursor.execute("SELECT category, COUNT(*) FROM complaints GROUP BY category")
-            stats["by_category"] = dict(cursor.fetchall())
-
-            cursor.execute("SELECT priority, COUNT(*) FROM complaints GROUP BY priority")
-            stats["by_priority"] = dict(cursor.fetchall())
+            cursor.execute("""
+                SELECT dimension, value, count, sentiment_sum, sentiment_count
+                FROM complaint_rollups
+                ORDER BY dimension, count DESC, value
+            """)
+            rollups = {}
+            for dimension, value, count, sentiment_sum, sentiment_count in cursor.fetchall():
+                rollups.setdefault(dimension, {})[value] = (count, sentiment_sum, sentiment_count)
 
             cursor.execute("""
                 SELECT date, count FROM analytics
                 ORDER BY date ASC
             """)
-            stats["recent_trend"] = dict(cursor.fetchall())
+            recent_trend = dict(cursor.fetchall())
 
+        def counts(dimension):
+            return {value: row[0] for value, row in rollups.get(dimension, {}).items()}
+
+        total, sentiment_sum, sentiment_count = rollups.get("total", {}).get("", (0, 0.0, 0))
+        stats = {
+            "total_complaints": total,
+            "by_status": counts("status"),
+            "by_category": counts("category"),
+            "by_priority": counts("priority"),
+            "by_department": counts("department"),
+            "by_day": dict(sorted(counts("day").items())),
+            "avg_sentiment": sentiment_sum / sentiment_count if sentiment_count else 0.0,
+            "today_count": counts("day").get(datetime.now().date().isoformat(), 0),
+            "recent_trend": recent_trend,
+        }
+        stats["resolution_rate"] = (
+            stats["by_status"].get("Resolved", 0) / total * 100 if total else 0.0
+        )
+        stats["high_priority"] = (
+            stats["by_priority"].get("High", 0) + stats["by_priority"].get("Critical", 0)
+        )
         return stats
 
     # --------------------------------------------------
     # SEARCH (OPTIONAL)
     # --------------------------------------------------
-    def search_complaints(self, query):
+    def search_complaints(self, query, limit=50):
+        rows, _ = self.search_complaints_page(query, limit=limit)
+        return rows
+
+    @cached_read(_copy_page)
+    def search_complaints_page(self, query, limit=20, cursor=None):
+        """
+        Ranked full-text search with offset-free pagination.
+        
+        Queries that look like ticket IDs (``GRV-...``) are answered by an
+        exact/prefix range scan on ``idx_ticket``. Everything else is matched
+        as prefix terms against the FTS5 index and ordered by BM25 relevance;
+        each row carries a ``snippet`` with matches wrapped in ``**``.
+        
+        Args:
+            query (str): Free text or ticket ID prefix
+            limit (int): Page size. Defaults to 20
+            cursor (str): Continuation token from a previous page
+            
+        Returns:
+            tuple: (list of complaint dicts, next-page token or None)
+        """
+        query = (query or "").strip()
+        if not query:
+            return [], None
+
+        if query.upper().startswith(TICKET_PREFIX):
+            return self._search_tickets(query.upper(), limit, cursor)
+
+        terms = re.findall(r"\w+", query.lower())
+        if not terms:
+            return [], None
+
+        if not self.fts_enabled:
+            return self._search_like(query, limit, cursor)
+
+        match = " ".join(f'"{term}"*' for term in terms)
+        params = [match]
+        after = ""
+        if cursor:
+            last_rank, last_id = _decode_cursor(cursor, "fts")
+            after = "AND (complaints_fts.rank > ? OR (complaints_fts.rank = ? AND complaints_fts.rowid > ?))"
+            params += [last_rank, last_rank, last_id]
+
         with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
+            cur = conn.cursor()
+            cur.execute(f"""
+                SELECT c.*,
+                       snippet(complaints_fts, 0, '**', '**', '…', 16) AS snippet,
+                       complaints_fts.rank AS rank
+                FROM complaints_fts
+                JOIN complaints c ON c.id = complaints_fts.rowid
+                WHERE complaints_fts MATCH ? {after}
+                ORDER BY complaints_fts.rank, complaints_fts.rowid
+                LIMIT ?
+            """, (*params, limit + 1))
+            rows = [dict(row) for row in cur.fetchall()]
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor("fts", rows[-1]["rank"], rows[-1]["id"])
+        return rows, next_cursor
+
+    def _search_tickets(self, prefix, limit, cursor):
+        # Half-open range [prefix, prefix-successor) is an index range scan, unlike LIKE
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        lower_op, lower = ">=", prefix
+        if cursor:
+            lower_op, (lower,) = ">", _decode_cursor(cursor, "ticket")
+
+        with self.get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"""
+                SELECT * FROM complaints INDEXED BY idx_ticket
+                WHERE ticket_id {lower_op} ? AND ticket_id < ?
+                ORDER BY ticket_id
+                LIMIT ?
+            """, (lower, upper, limit + 1))
+            rows = [dict(row) for row in cur.fetchall()]
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor("ticket", rows[-1]["ticket_id"])
+        return rows, next_cursor
+
+    def _search_like(self, query, limit, cursor):
+        # Fallback for SQLite builds without FTS5
+        params = [f"%{query}%", f"%{query}%"]
+        after = ""
+        if cursor:
+            (last_id,) = _decode_cursor(cursor, "like")
+            after = "AND id < ?"
+            params.append(last_id)
+
+        with self.get_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"""
                 SELECT * FROM complaints
-                WHERE complaint_text LIKE ? OR ticket_id LIKE ?
-                ORDER BY submitted_at DESC
-                LIMIT 50
-            """, (f"%{query}%", f"%{query}%"))
-            rows = cursor.fetchall()
+                WHERE (complaint_text LIKE ? OR ticket_id LIKE ?) {after}
+                ORDER BY id DESC
+                LIMIT ?
+            """, (*params, limit + 1))
+            rows = [dict(row) for row in cur.fetchall()]
 
-        return [dict(row) for row in rows]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = _encode_cursor("like", rows[-1]["id"])
+        return rows, next_cursor
 
     # --------------------------------------------------
     # DELETE ALL (ADMIN ONLY)
     # --------------------------------------------------
     def delete_all_complaints(self):
+        self.flush()
         with self.get_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM complaints")
             cursor.execute("DELETE FROM analytics")
+            cursor.execute("DELETE FROM complaint_rollups")
             conn.commit()
-            self.get_statistics.cache_clear()
@@ -0,0 +1,206 @@
+"""
+Streaming Complaint Export
+
+Writes complaints out of GrievanceDatabase as CSV, JSON Lines or Parquet
+without holding the whole export in memory. Rows come in chunks from
+``GrievanceDatabase.iter_complaint_chunks``, which pushes the filters down
+into SQL and reads an open cursor with ``fetchmany``. Each format encodes a
+chunk to bytes as soon as it arrives, so callers can write the pieces
+to a file or a response one at a time.
+
+Parquet output needs the optional ``pyarrow`` package; every database
+chunk becomes one row group.
+
+Usage:
+    python export.py grievances.csv
+    python export.py open.jsonl --status Pending --status "In Progress"
+    python export.py january.parquet --from 2026-01-01 --to 2026-01-31
+
+Author: Debasis Behera
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = pq = None
+
+COMPLAINT_COLUMNS = (
+    "id", "ticket_id", "name", "email", "phone",
+    "complaint_text", "category", "priority",
+    "department", "sentiment_label", "sentiment_score",
+    "keywords", "resolution_time", "status", "submitted_at", "updated_at"
+)
+
+# format -> (MIME type, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", ".csv"),
+    "jsonl": ("application/x-ndjson", ".jsonl"),
+    "parquet": ("application/vnd.apache.parquet", ".parquet"),
+}
+
+
+def available_formats():
+    """Export formats usable in this environment (Parquet only with pyarrow)."""
+    return [fmt for fmt in EXPORT_FORMATS if fmt != "parquet" or pa is not None]
+
+
+def _csv_bytes(chunks):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=COMPLAINT_COLUMNS, extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    for rows in chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def _jsonl_bytes(chunks):
+    for rows in chunks:
+        yield "".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows).encode("utf-8")
+
+
+class _ByteSink:
+    """Write-only file object that hands back whatever was written since the last drain."""
+
+    def __init__(self):
+        self._parts = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def _arrow_schema():
+    return pa.schema([
+        (column, pa.int64() if column == "id" else pa.float64() if column == "sentiment_score" else pa.string())
+        for column in COMPLAINT_COLUMNS
+    ])
+
+
+def _parquet_bytes(chunks):
+    if pa is None:
+        raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+
+    schema = _arrow_schema()
+    sink = _ByteSink()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        for rows in chunks:
+            columns = {}
+            for column, field in zip(COMPLAINT_COLUMNS, schema):
+                values = [row.get(column) for row in rows]
+                if pa.types.is_string(field.type):
+                    # resolution_time is declared INTEGER but the app stores text
+                    values = [None if value is None else str(value) for value in values]
+                columns[column] = values
+            writer.write_table(pa.table(columns, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_chunks(chunks, fmt="csv"):
+    """
+    Encode a stream of complaint chunks in an export format.
+
+    Args:
+        chunks (iterable): Lists of complaint dicts, e.g. from
+            ``GrievanceDatabase.iter_complaint_chunks``
+        fmt (str): 'csv', 'jsonl' or 'parquet'. Defaults to 'csv'
+
+    Yields:
+        bytes: Consecutive pieces of the exported file
+    """
+    if fmt == "csv":
+        return _csv_bytes(chunks)
+    if fmt == "jsonl":
+        return _jsonl_bytes(chunks)
+    if fmt == "parquet":
+        return _parquet_bytes(chunks)
+    raise ValueError(f"Unknown export format '{fmt}', expected one of {tuple(EXPORT_FORMATS)}")
+
+
+def write_export(pieces, out):
+    """
+    Write exported bytes to a path or binary file object.
+
+    Returns:
+        int: Bytes written
+    """
+    if isinstance(out, (str, os.PathLike)):
+        with open(out, "wb") as f:
+            return write_export(pieces, f)
+    written = 0
+    for piece in pieces:
+        out.write(piece)
+        written += len(piece)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export complaints as CSV, JSON Lines or Parquet")
+    parser.add_argument("output", help="output file; the format follows the extension unless --format is given")
+    parser.add_argument("--format", choices=tuple(EXPORT_FORMATS), help="export format")
+    parser.add_argument("--status", action="append", help="only these statuses (repeatable; default: all)")
+    parser.add_argument("--priority", help="only this priority")
+    parser.add_argument("--category", help="only this category")
+    parser.add_argument("--from", dest="start_date", help="first submission date, YYYY-MM-DD")
+    parser.add_argument("--to", dest="end_date", help="last submission date, YYYY-MM-DD (inclusive)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="rows per database fetch (default: 1000)")
+    parser.add_argument("--db", default=os.getenv('DATABASE_PATH', 'data/grievances.db'), help="database path")
+    args = parser.parse_args()
+
+    fmt = args.format or next(
+        (name for name, (_, extension) in EXPORT_FORMATS.items() if args.output.lower().endswith(extension)),
+        "csv"
+    )
+
+    from database import GrievanceDatabase
+    db = GrievanceDatabase(args.db)
+    rows = 0
+
+    def chunks():
+        nonlocal rows
+        for status in args.status or [None]:
+            for chunk in db.iter_complaint_chunks(
+                args.chunk_size, status=status, priority=args.priority, category=args.category,
+                start_date=args.start_date, end_date=args.end_date
+            ):
+                rows += len(chunk)
+                yield chunk
+
+    written = write_export(export_chunks(chunks(), fmt), args.output)
+    print(f"✓ Exported {rows} complaints to {args.output} ({fmt}, {written / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+Inference-Optimised Model Artifacts
+
+Runtime wrappers that answer ``predict`` faster than the pickled training
+objects while producing the same labels:
+- SharedNgramEnsemble: tokenises and n-grams each text once for every
+  TF-IDF member of a Voting Ensemble instead of once per member, and
+  skips the per-tree dispatch overhead of random forest members
+- CascadeClassifier: answers with a cheap calibrated model when it is
+  confident and escalates only the uncertain texts to the full ensemble
+- HotSwapModel: serves a model file and reloads it when a retrain
+  atomically replaces it, without restarting the app
+
+Author: Debasis Behera
+"""
+
+import os
+import threading
+import time
+
+import joblib
+import numpy as np
+import scipy.sparse as sp
+from sklearn.ensemble import RandomForestClassifier, VotingClassifier
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import normalize
+
+# Vectorizer settings that must agree for members to share one analysis pass
+_SHARED_ANALYZER_PARAMS = (
+    "input", "encoding", "decode_error", "strip_accents", "lowercase",
+    "preprocessor", "tokenizer", "analyzer", "stop_words", "token_pattern",
+)
+
+
+def _member_predict(classifier, X):
+    """
+    ``classifier.predict(X)``, minus the per-tree joblib dispatch for random forests.
+
+    Summing the tree probabilities in the same order keeps results identical;
+    for a single complaint this is several times faster than ``forest.predict``.
+    """
+    if isinstance(classifier, RandomForestClassifier) and classifier.n_outputs_ == 1:
+        X = X.astype(np.float32)
+        proba = np.zeros((X.shape[0], classifier.n_classes_))
+        for tree in classifier.estimators_:
+            proba += tree.predict_proba(X, check_input=False)
+        proba /= len(classifier.estimators_)
+        return classifier.classes_.take(np.argmax(proba, axis=1), axis=0)
+    return classifier.predict(X)
+
+
+class SharedNgramEnsemble:
+    """
+    Single-pass feature extraction for TF-IDF pipelines and hard-voting ensembles.
+
+    Every member pipeline's vocabulary is merged into one union vocabulary,
+    so a single CountVectorizer pass over the widest n-gram range yields the
+    term counts for all members. Each member then takes its own columns and
+    applies its fitted TF-IDF weighting (sublinear TF, IDF, normalisation)
+    before its classifier votes. TfidfVectorizer's max_df/min_df/max_features
+    only act at fit time, so the per-member features match the originals.
+
+    Args:
+        model: Fitted ``Pipeline(tfidf, clf)`` or hard ``VotingClassifier`` of them
+    """
+
+    def __init__(self, model):
+        if isinstance(model, VotingClassifier):
+            if model.voting != "hard":
+                raise ValueError("Only hard voting ensembles are supported")
+            pipelines = list(model.estimators_)
+            self.label_encoder = model.le_
+            self.weights = model._weights_not_none
+        elif isinstance(model, Pipeline):
+            pipelines = [model]
+            self.label_encoder = None
+            self.weights = None
+        else:
+            raise TypeError(f"Unsupported model type: {type(model).__name__}")
+
+        vectorizers = []
+        self.classifiers = []
+        for pipeline in pipelines:
+            if len(pipeline.steps) != 2 or not isinstance(pipeline.steps[0][1], TfidfVectorizer):
+                raise ValueError("Each member must be a Pipeline of TfidfVectorizer and a classifier")
+            vectorizers.append(pipeline.steps[0][1])
+            self.classifiers.append(pipeline.steps[1][1])
+
+        reference = vectorizers[0].get_params()
+        for vectorizer in vectorizers[1:]:
+            params = vectorizer.get_params()
+            for name in _SHARED_ANALYZER_PARAMS:
+                if params[name] != reference[name]:
+                    raise ValueError(f"Members disagree on vectorizer setting '{name}'")
+
+        union = {}
+        member_columns = []
+        for vectorizer in vectorizers:
+            terms = sorted(vectorizer.vocabulary_, key=vectorizer.vocabulary_.get)
+            member_columns.append([union.setdefault(term, len(union)) for term in terms])
+
+        # Per member: union column -> member column, -1 where the member lacks the term
+        self.column_maps = []
+        for columns in member_columns:
+            column_map = np.full(len(union), -1, dtype=np.int64)
+            column_map[columns] = np.arange(len(columns))
+            self.column_maps.append(column_map)
+        self.weighting = [
+            (len(vectorizer.vocabulary_), vectorizer.sublinear_tf,
+             vectorizer.idf_ if vectorizer.use_idf else None, vectorizer.norm)
+            for vectorizer in vectorizers
+        ]
+
+        self.counter = CountVectorizer(
+            **{name: reference[name] for name in _SHARED_ANALYZER_PARAMS},
+            ngram_range=(
+                min(vectorizer.ngram_range[0] for vectorizer in vectorizers),
+                max(vectorizer.ngram_range[1] for vectorizer in vectorizers),
+            ),
+            vocabulary=union,
+            dtype=np.float64,
+        )
+        self.classes_ = model.classes_
+
+    def transform(self, texts):
+        """
+        Member feature matrices for a batch of texts from one analysis pass.
+
+        Returns:
+            list: One TF-IDF sparse matrix per member, identical to its own vectorizer's output
+        """
+        counts = self.counter.transform(texts)
+        row_of_entry = np.repeat(np.arange(counts.shape[0]), np.diff(counts.indptr))
+        matrices = []
+        for column_map, (width, sublinear_tf, idf, norm) in zip(self.column_maps, self.weighting):
+            # Remap the shared counts onto this member's columns in O(nnz)
+            mapped = column_map[counts.indices]
+            keep = mapped >= 0
+            indptr = np.zeros(counts.shape[0] + 1, dtype=counts.indptr.dtype)
+            np.cumsum(np.bincount(row_of_entry[keep], minlength=counts.shape[0]), out=indptr[1:])
+            X = sp.csr_matrix(
+                (counts.data[keep], mapped[keep], indptr), shape=(counts.shape[0], width)
+            )
+            X.sort_indices()
+            if sublinear_tf:
+                np.log(X.data, X.data)
+                X.data += 1
+            if idf is not None:
+                X.data *= idf[X.indices]
+            if norm:
+                X = normalize(X, norm=norm, copy=False)
+            matrices.append(X)
+        return matrices
+
+    def predict(self, texts):
+        matrices = self.transform(texts)
+        if self.label_encoder is None:
+            return _member_predict(self.classifiers[0], matrices[0])
+
+        votes = np.asarray([
+            _member_predict(classifier, X) for classifier, X in zip(self.classifiers, matrices)
+        ]).T
+        winners = np.apply_along_axis(
+            lambda row: np.argmax(np.bincount(row, weights=self.weights)), axis=1, arr=votes
+        )
+        return self.label_encoder.inverse_transform(winners)
+
+    def score(self, texts, labels):
+        return float(np.mean(self.predict(texts) == np.asarray(labels)))
+
+
+class CascadeClassifier:
+    """
+    Confidence-gated two-stage classifier.
+
+    The fast model must expose calibrated ``predict_proba``. Texts whose top
+    class probability reaches ``threshold`` take the fast model's label; the
+    rest are sent, in one batch, to the fallback model.
+
+    Args:
+        fast_model: Fitted classifier with ``predict_proba`` and ``classes_``
+        fallback: Fitted classifier used for uncertain texts (e.g. the Voting Ensemble)
+        threshold (float): Minimum fast-model confidence to skip the fallback
+    """
+
+    def __init__(self, fast_model, fallback, threshold):
+        self.fast_model = fast_model
+        self.fallback = fallback
+        self.threshold = threshold
+        self.classes_ = fast_model.classes_
+
+    def predict_with_confidence(self, texts):
+        """
+        Returns:
+            tuple: (labels, fast-model confidence per text, boolean escalation mask)
+        """
+        texts = list(texts)
+        proba = self.fast_model.predict_proba(texts)
+        confidence = proba.max(axis=1)
+        labels = self.classes_.take(np.argmax(proba, axis=1)).astype(object)
+
+        escalated = confidence < self.threshold
+        if escalated.any():
+            labels[escalated] = self.fallback.predict([text for text, e in zip(texts, escalated) if e])
+        return labels, confidence, escalated
+
+    def predict(self, texts):
+        return self.predict_with_confidence(texts)[0]
+
+    def score(self, texts, labels):
+        return float(np.mean(self.predict(texts) == np.asarray(labels)))
+
+
+class HotSwapModel:
+    """
+    Model proxy that picks up a replaced model file on the next prediction.
+
+    Retraining writes a new file and ``os.replace``-s it over ``path``; the
+    changed (inode, mtime, size) signature is noticed at most every
+    ``check_interval`` seconds and the new model is loaded and swapped in
+    under a lock. Predictions already running keep the model they started
+    with. If the new file cannot be loaded the current model stays in
+    service.
+
+    Args:
+        path (str): Model file to serve
+        loader (callable): Loads a model from ``path``. Defaults to joblib.load
+        check_interval (float): Seconds between file checks. Defaults to 2.0
+    """
+
+    def __init__(self, path, loader=joblib.load, check_interval=2.0):
+        self.path = path
+        self.loader = loader
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._signature = self._file_signature()
+        self._model = loader(path)
+        self._checked_at = time.monotonic()
+        self.reloads = 0
+        self.reload_errors = 0
+
+    def _file_signature(self):
+        stat = os.stat(self.path)
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def refresh(self, force=False):
+        """
+        Reload the model if its file changed.
+
+        Returns:
+            bool: True if a new model was swapped in
+        """
+        now = time.monotonic()
+        if not force and now - self._checked_at < self.check_interval:
+            return False
+        with self._lock:
+            self._checked_at = now
+            try:
+                signature = self._file_signature()
+                if signature == self._signature:
+                    return False
+                model = self.loader(self.path)
+            except Exception:
+                self.reload_errors += 1
+                return False
+            self._model, self._signature = model, signature
+            self.reloads += 1
+            return True
+
+    @property
+    def model(self):
+        self.refresh()
+        return self._model
+
+    def predict(self, texts):
+        return self.model.predict(texts)
+
+    def __getattr__(self, name):
+        # Everything else (classes_, predict_proba, ...) comes from the current model
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.model, name)
@@ -0,0 +1,188 @@
+"""
+API Load Test
+
+Drives a running ``api.py`` with concurrent keep-alive connections and
+reports throughput and latency percentiles, overall and per endpoint.
+Uses only the standard library (asyncio streams), so the client costs
+little CPU next to the server being measured.
+
+The default mix is mostly tracking and statistics reads plus a share of
+submissions. Submissions go through model inference and write real rows,
+so point the server at a scratch database.
+
+Usage:
+    python api.py --db /tmp/loadtest.db &
+    python loadtest.py --concurrency 32 --duration 20
+    python loadtest.py --mix track=1 --duration 10       # tracking only
+
+Author: Debasis Behera
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+
+import numpy as np
+
+SAMPLE_COMPLAINTS = [
+    "Water supply has been cut for three days in our colony and tankers are not coming",
+    "Street lights on the main road are not working, it is unsafe for women at night",
+    "Garbage has not been collected for a week and the area smells terrible",
+    "The hospital refused admission to an emergency patient without any reason",
+    "My pension has not been credited for the last two months",
+    "Huge potholes on the highway near the bridge are causing accidents",
+    "Electricity bill is three times higher than usual despite the same usage",
+    "Teachers are absent at the government school and classes are not held",
+]
+
+
+async def request(reader, writer, method, path, payload=None, headers=None):
+    """Send one request on a keep-alive connection; returns (status, body)."""
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    head = f"{method} {path} HTTP/1.1\r\nHost: loadtest\r\nContent-Length: {len(body)}\r\n"
+    if payload is not None:
+        head += "Content-Type: application/json\r\n"
+    for name, value in (headers or {}).items():
+        head += f"{name}: {value}\r\n"
+    writer.write(head.encode("latin-1") + b"\r\n" + body)
+    await writer.drain()
+
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Server closed the connection")
+    status = int(status_line.split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+def build_operations(tickets, admin_password):
+    """Endpoint name -> callable returning (method, path, payload, headers)."""
+    return {
+        "submit": lambda: ("POST", "/complaints", {
+            "name": "Load Test",
+            "email": "loadtest@example.com",
+            "complaint_text": random.choice(SAMPLE_COMPLAINTS) + f" (ref {random.randrange(10 ** 6)})",
+        }, None),
+        "track": lambda: ("GET", f"/complaints/{random.choice(tickets)}", None, None),
+        "stats": lambda: ("GET", "/stats", None, None),
+        "search": lambda: ("GET", f"/search?q={random.choice(['water', 'road', 'pension', 'hospital'])}",
+                           None, {"X-Admin-Password": admin_password}),
+        "receipt": lambda: ("GET", f"/complaints/{random.choice(tickets)}/receipt", None, None),
+    }
+
+
+async def client(host, port, deadline, operations, weights, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    names = list(weights)
+    try:
+        while time.perf_counter() < deadline:
+            name = random.choices(names, weights=[weights[n] for n in names])[0]
+            method, path, payload, headers = operations[name]()
+            start = time.perf_counter()
+            try:
+                status, _ = await request(reader, writer, method, path, payload, headers)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                errors[name] += 1
+                writer.close()
+                reader, writer = await asyncio.open_connection(host, port)
+                continue
+            latencies[name].append(time.perf_counter() - start)
+            if status >= 400:
+                errors[name] += 1
+    finally:
+        writer.close()
+
+
+async def seed_tickets(host, port, count):
+    """Submit a few complaints so tracking requests have real tickets to hit."""
+    reader, writer = await asyncio.open_connection(host, port)
+    operations = build_operations([], "")
+    tickets = []
+    for _ in range(count):
+        method, path, payload, headers = operations["submit"]()
+        status, body = await request(reader, writer, method, path, payload, headers)
+        if status != 201:
+            raise RuntimeError(f"Seeding failed with HTTP {status}: {body[:200]!r}")
+        tickets.append(json.loads(body)["ticket_id"])
+    writer.close()
+    return tickets
+
+
+def parse_mix(text):
+    weights = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+async def run(args):
+    weights = parse_mix(args.mix)
+    unknown = set(weights) - set(build_operations([], ""))
+    if unknown:
+        raise SystemExit(f"Unknown endpoints in --mix: {', '.join(sorted(unknown))}")
+
+    tickets = await seed_tickets(args.host, args.port, args.seed)
+    operations = build_operations(tickets, args.admin_password)
+    latencies, errors = defaultdict(list), defaultdict(int)
+
+    start = time.perf_counter()
+    deadline = start + args.duration
+    await asyncio.gather(*(
+        client(args.host, args.port, deadline, operations, weights, latencies, errors)
+        for _ in range(args.concurrency)
+    ))
+    elapsed = time.perf_counter() - start
+    return latencies, errors, elapsed
+
+
+def report(latencies, errors, elapsed, concurrency):
+    all_latencies = np.array([value for values in latencies.values() for value in values]) * 1000
+    total = len(all_latencies)
+
+    print("=" * 72)
+    print(f"Load test: {concurrency} connections, {elapsed:.1f}s")
+    print("=" * 72)
+    print(f"{'endpoint':<10}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = sorted(latencies.items()) + [("TOTAL", all_latencies / 1000)]
+    for name, values in rows:
+        values = np.asarray(values) * 1000
+        if not len(values):
+            continue
+        failed = sum(errors.values()) if name == "TOTAL" else errors[name]
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        print(f"{name:<10}{len(values):>10}{failed:>8}{len(values) / elapsed:>10.1f}"
+              f"{p50:>10.1f}{p95:>10.1f}{p99:>10.1f}")
+    if not total:
+        print("✗ No requests completed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test a running api.py")
+    parser.add_argument("--host", default="127.0.0.1", help="API host (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8080, help="API port (default: 8080)")
+    parser.add_argument("--concurrency", type=int, default=32, help="parallel connections (default: 32)")
+    parser.add_argument("--duration", type=float, default=20, help="seconds to run (default: 20)")
+    parser.add_argument("--mix", default="track=6,stats=2,submit=2",
+                        help="endpoint weights, from submit, track, stats, search, receipt "
+                             "(default: track=6,stats=2,submit=2)")
+    parser.add_argument("--seed", type=int, default=20, help="complaints submitted up front (default: 20)")
+    parser.add_argument("--admin-password", default="admin123", help="for the search endpoint")
+    args = parser.parse_args()
+
+    latencies, errors, elapsed = asyncio.run(run(args))
+    report(latencies, errors, elapsed, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
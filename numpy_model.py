@@ -0,0 +1,145 @@
+"""
+NumPy-Only Model Runtime
+
+Loads the compact linear-model artifact written by ``train_model.py
+--export-numpy`` and predicts complaint categories without importing
+scikit-learn. Arrays are memory-mapped read-only, so every Streamlit
+server process on a host shares the same physical pages instead of
+materialising its own vocabulary dicts and classifier objects.
+
+Artifact layout (one directory):
+- manifest.json           tokenizer settings, classes, member list, skipped
+                          members and measured agreement with the ensemble
+- vocab.npy               sorted UTF-8 n-gram vocabulary (fixed-width bytes)
+- member<i>_columns.npy   vocab index -> member feature column (-1 if unused)
+- member<i>_idf.npy       member IDF weights (absent if use_idf=False)
+- member<i>_coef.npy      member weights, shape (n_features, n_classes)
+- member<i>_intercept.npy member biases, shape (n_classes,)
+
+Author: Debasis Behera
+"""
+
+import json
+import os
+import re
+from collections import Counter
+
+import numpy as np
+
+MANIFEST_FILE = "manifest.json"
+
+
+class NumpyLinearModel:
+    """
+    Hard-voting ensemble of linear TF-IDF classifiers evaluated with NumPy.
+
+    Each member scores ``tfidf(text) @ coef + intercept`` and votes for its
+    arg-max class, which is how LogisticRegression, LinearSVC and
+    MultinomialNB (with log probabilities as weights) predict.
+
+    Args:
+        path (str): Artifact directory
+        mmap (bool): Memory-map arrays instead of reading them into memory
+    """
+
+    def __init__(self, path, mmap=True):
+        self.path = path
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+
+        mode = "r" if mmap else None
+        load = lambda name: np.load(os.path.join(path, name), mmap_mode=mode)
+
+        self.classes_ = np.array(manifest["classes"], dtype=object)
+        self.lowercase = manifest["lowercase"]
+        self.token_pattern = re.compile(manifest["token_pattern"])
+        self.stop_words = frozenset(manifest["stop_words"] or ())
+        self.ngram_range = tuple(manifest["ngram_range"])
+        self.weights = manifest["weights"]
+        # Ensemble members the export had to leave out, and how often it still agrees
+        self.skipped_members = manifest.get("skipped_members", [])
+        self.prediction_agreement = manifest.get("prediction_agreement_all")
+
+        self.vocab = load("vocab.npy")
+        self.max_term_bytes = self.vocab.dtype.itemsize
+
+        self.members = []
+        for i, member in enumerate(manifest["members"]):
+            prefix = f"member{i}_"
+            self.members.append({
+                "columns": load(prefix + "columns.npy"),
+                "idf": load(prefix + "idf.npy") if member["use_idf"] else None,
+                "coef": load(prefix + "coef.npy"),
+                "intercept": load(prefix + "intercept.npy"),
+                "sublinear_tf": member["sublinear_tf"],
+                "norm": member["norm"],
+            })
+
+    def _terms(self, text):
+        """Word n-grams exactly as TfidfVectorizer's word analyzer produces them."""
+        if self.lowercase:
+            text = text.lower()
+        tokens = [token for token in self.token_pattern.findall(text)
+                  if token not in self.stop_words]
+
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+        terms = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), max_n + 1):
+            terms.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return terms
+
+    def _vocab_counts(self, text):
+        """Vocabulary indices and counts of the n-grams in one text."""
+        counts = Counter(term.encode("utf-8") for term in self._terms(text))
+        terms = [term for term in counts if len(term) <= self.max_term_bytes]
+        if not terms:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+
+        query = np.array(terms, dtype=self.vocab.dtype)
+        positions = np.searchsorted(self.vocab, query)
+        positions[positions == len(self.vocab)] = 0
+        found = self.vocab[positions] == query
+        return positions[found], np.array([counts[term] for term in terms], dtype=np.float64)[found]
+
+    def _member_scores(self, member, vocab_index, counts):
+        columns = member["columns"][vocab_index]
+        present = columns >= 0
+        columns, values = columns[present], counts[present]
+
+        if member["sublinear_tf"]:
+            values = np.log(values) + 1
+        if member["idf"] is not None:
+            values = values * member["idf"][columns]
+        if member["norm"] == "l2":
+            length = np.sqrt(np.dot(values, values))
+            if length > 0:
+                values = values / length
+        elif member["norm"] == "l1":
+            length = np.abs(values).sum()
+            if length > 0:
+                values = values / length
+
+        return values @ member["coef"][columns] + member["intercept"]
+
+    def predict(self, texts):
+        """
+        Predict categories for a batch of texts.
+
+        Returns:
+            np.ndarray: Category labels
+        """
+        labels = []
+        for text in texts:
+            vocab_index, counts = self._vocab_counts(text)
+            votes = np.zeros(len(self.classes_))
+            for member, weight in zip(self.members, self.weights):
+                votes[np.argmax(self._member_scores(member, vocab_index, counts))] += weight
+            labels.append(self.classes_[np.argmax(votes)])
+        return np.array(labels, dtype=object)
+
+
+def is_numpy_model(path):
+    """True if ``path`` is a NumPy artifact directory rather than a pickle."""
+    return os.path.isdir(path) and os.path.exists(os.path.join(path, MANIFEST_FILE))
@@ -0,0 +1,294 @@
+"""
+Complaint Enrichment Pipeline
+
+Runs the full AI analysis stage of the AI Grievance Redressal System over a
+batch of complaint texts at once:
+- Category prediction with one vectorised model.predict call per chunk
+- Priority, department, sentiment, keyword and resolution-time rules
+
+Results are columnar (one DataFrame row per input text), so the Streamlit
+form, bulk imports and backfills all share the same code path. An optional
+EnrichmentCache skips the analysis for repeated complaint texts.
+
+Author: Debasis Behera
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from utils import (
+    get_priority_batch,
+    get_department,
+    get_sentiment_batch,
+    extract_keywords,
+    estimate_resolution_time,
+)
+
+DEFAULT_CATEGORY = "Administrative"
+MODEL_METADATA_PATH = "model/model_metadata.json"
+
+ENRICHMENT_COLUMNS = [
+    "category",
+    "priority",
+    "department",
+    "sentiment_label",
+    "sentiment_score",
+    "keywords",
+    "resolution_time",
+]
+
+
+def get_model_version(metadata_path=MODEL_METADATA_PATH):
+    """
+    Version of the trained model, from its metadata file.
+
+    Returns:
+        str: ``model_version`` if recorded, else the training date, else "unversioned"
+    """
+    try:
+        with open(metadata_path) as f:
+            metadata = json.load(f)
+    except (OSError, ValueError):
+        return "unversioned"
+    return str(metadata.get("model_version") or metadata.get("training_date") or "unversioned")
+
+
+class EnrichmentCache:
+    """
+    Bounded LRU cache of enrichment results with a time-to-live.
+
+    Entries are keyed by a hash of the exact complaint text and the model
+    version, so a retrained model (new metadata) never serves results from
+    the previous one. The text is not folded: sentiment depends on case and
+    punctuation ("TERRIBLE!!!" vs "terrible") and priority keywords on
+    spacing, so only verbatim repeats share an entry. The metadata file is
+    re-read only when its modification time changes.
+
+    Args:
+        maxsize (int): Maximum cached texts. Defaults to 10000
+        ttl (float): Seconds an entry stays valid. Defaults to 3600
+        metadata_path (str): Model metadata file providing the version
+    """
+
+    def __init__(self, maxsize=10000, ttl=3600, metadata_path=MODEL_METADATA_PATH):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.metadata_path = metadata_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._metadata_mtime = None
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def model_version(self):
+        try:
+            mtime = os.stat(self.metadata_path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime != self._metadata_mtime or self._version is None:
+            self._version = get_model_version(self.metadata_path)
+            self._metadata_mtime = mtime
+        return self._version
+
+    def key(self, text, model_version):
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        return f"{model_version}:{digest}"
+
+    def get_many(self, keys):
+        """
+        Look up several keys at once.
+
+        Returns:
+            dict: Cached results for the keys that were present and unexpired
+        """
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    self.misses += 1
+                elif entry[0] <= now:
+                    del self._entries[key]
+                    self.expired += 1
+                    self.misses += 1
+                else:
+                    self._entries.move_to_end(key)
+                    found[key] = entry[1]
+                    self.hits += 1
+        return found
+
+    def put_many(self, results):
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            for key, result in results.items():
+                self._entries[key] = (expires, result)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Returns:
+            dict: size, maxsize, hits, misses, expired, evictions and hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+_enrichment_cache = None
+_enrichment_cache_lock = threading.Lock()
+
+
+def get_enrichment_cache():
+    """Get or create the process-wide enrichment cache."""
+    global _enrichment_cache
+    if _enrichment_cache is None:
+        with _enrichment_cache_lock:
+            if _enrichment_cache is None:
+                _enrichment_cache = EnrichmentCache()
+    return _enrichment_cache
+
+
+def predict_categories(texts, model):
+    """
+    Predict categories for a batch of texts in one model call.
+
+    Args:
+        texts (list): Complaint texts
+        model: Fitted classifier exposing ``predict``, or None
+
+    Returns:
+        list: Category labels (``DEFAULT_CATEGORY`` when no model is loaded)
+    """
+    if model is None:
+        return [DEFAULT_CATEGORY] * len(texts)
+    return [str(category) for category in model.predict(texts)]
+
+
+def _enrich_chunk(texts, model):
+    categories = predict_categories(texts, model)
+    priorities = get_priority_batch(texts)
+    sentiments = get_sentiment_batch(texts)
+
+    # Department and resolution time depend only on a handful of distinct labels
+    departments = {category: get_department(category) for category in set(categories)}
+    resolutions = {
+        pair: estimate_resolution_time(*pair)
+        for pair in set(zip(categories, priorities))
+    }
+
+    return {
+        "category": categories,
+        "priority": priorities,
+        "department": [departments[category] for category in categories],
+        "sentiment_label": [sentiment["label"] for sentiment in sentiments],
+        "sentiment_score": [sentiment["score"] for sentiment in sentiments],
+        "keywords": [extract_keywords(text) for text in texts],
+        "resolution_time": [resolutions[pair] for pair in zip(categories, priorities)],
+    }
+
+
+# Per-process model for pool workers, installed once by the initializer
+_WORKER_MODEL = None
+
+
+def _init_worker(model):
+    global _WORKER_MODEL
+    _WORKER_MODEL = model
+
+
+def _enrich_chunk_in_worker(texts):
+    return _enrich_chunk(texts, _WORKER_MODEL)
+
+
+def enrich_complaints(texts, model=None, chunk_size=1000, n_jobs=1, cache=None):
+    """
+    Run the complete analysis stage over a batch of complaints.
+
+    Args:
+        texts (list or pd.Series): Complaint texts
+        model: Fitted category classifier, or None to use ``DEFAULT_CATEGORY``
+        chunk_size (int): Texts per model.predict call / worker task. Defaults to 1000
+        n_jobs (int): Worker processes for large inputs; -1 uses all cores. Defaults to 1
+        cache (EnrichmentCache): Reuse results for repeated texts. Defaults to None
+
+    Returns:
+        pd.DataFrame: One row per text with the columns in ``ENRICHMENT_COLUMNS``,
+        indexed like the input when given a Series
+    """
+    index = texts.index if isinstance(texts, pd.Series) else None
+    texts = ["" if text is None else str(text) for text in texts]
+    if cache is None:
+        return pd.DataFrame(_enrich(texts, model, chunk_size, n_jobs), columns=ENRICHMENT_COLUMNS, index=index)
+
+    version = cache.model_version() if model is not None else "no-model"
+    keys = [cache.key(text, version) for text in texts]
+    results = cache.get_many(keys)
+
+    # Analyse each distinct missing text once, even if it repeats within the batch
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in results:
+            missing.setdefault(key, text)
+    if missing:
+        fresh = _enrich(list(missing.values()), model, chunk_size, n_jobs)
+        fresh["keywords"] = [tuple(keywords) for keywords in fresh["keywords"]]
+        computed = {
+            key: tuple(fresh[column][i] for column in ENRICHMENT_COLUMNS)
+            for i, key in enumerate(missing)
+        }
+        cache.put_many(computed)
+        results.update(computed)
+
+    frame = pd.DataFrame([results[key] for key in keys], columns=ENRICHMENT_COLUMNS, index=index)
+    # Fresh lists per row so callers cannot mutate the cached keyword tuples
+    frame["keywords"] = [list(keywords) for keywords in frame["keywords"]]
+    return frame
+
+
+def _enrich(texts, model, chunk_size, n_jobs):
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+
+    if n_jobs > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(
+            max_workers=min(n_jobs, len(chunks)),
+            initializer=_init_worker,
+            initargs=(model,)
+        ) as executor:
+            parts = list(executor.map(_enrich_chunk_in_worker, chunks))
+    else:
+        parts = [_enrich_chunk(chunk, model) for chunk in chunks]
+
+    columns = {column: [] for column in ENRICHMENT_COLUMNS}
+    for part in parts:
+        for column in ENRICHMENT_COLUMNS:
+            columns[column].extend(part[column])
+    return columns
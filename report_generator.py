@@ -1,7 +1,153 @@
+import argparse
+import functools
+import io
 import os
+import threading
+import zipfile
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+
 from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import simpleSplit
+from reportlab.pdfbase.pdfmetrics import stringWidth
 from reportlab.pdfgen import canvas
 
+VALUE_X = 180
+RIGHT_MARGIN = 50
+WRAPPED_LINE_HEIGHT = 14
+
+# Fixed receipt text: (font, size, offset below the top line, text)
+HEADER_LINES = [
+    ("Helvetica-Bold", 16, 0, "GOVERNMENT OF INDIA"),
+    ("Helvetica-Bold", 14, 25, "AI-POWERED GRIEVANCE REDRESSAL SYSTEM"),
+]
+HEADER_HEIGHT = 65
+HEADER_FORM = "receipt_header"
+FOOTER_FONT, FOOTER_SIZE = "Helvetica-Oblique", 10
+FOOTER_TEXT = "National AI Redressal Framework | 2026"
+
+
+def complaint_receipt(complaint):
+    """Receipt fields, in display order, for a complaint row from GrievanceDatabase."""
+    return {
+        "Name": complaint["name"],
+        "Email": complaint["email"],
+        "Phone": complaint.get("phone") or "N/A",
+        "Category": complaint["category"],
+        "Priority": complaint["priority"],
+        "Department": complaint["department"],
+        "Sentiment": complaint.get("sentiment_label"),
+        "Keywords": complaint.get("keywords") or "",
+        "Estimated Resolution": complaint.get("resolution_time"),
+        "Status": complaint.get("status", "Pending"),
+        "Submitted At": complaint.get("submitted_at"),
+        "Complaint": complaint["complaint_text"]
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _static_layout():
+    """Positions of the receipt's fixed text, measured once per process."""
+    width, height = A4
+    centred = lambda text, font, size: (width - stringWidth(text, font, size)) / 2
+    header = [
+        (font, size, centred(text, font, size), height - 50 - offset, text)
+        for font, size, offset, text in HEADER_LINES
+    ]
+    footer = (FOOTER_FONT, FOOTER_SIZE, centred(FOOTER_TEXT, FOOTER_FONT, FOOTER_SIZE))
+    return header, footer
+
+
+def _draw_header(c):
+    for font, size, x, y, text in _static_layout()[0]:
+        c.setFont(font, size)
+        c.drawString(x, y, text)
+
+
+def define_header_form(c):
+    """
+    Draw the fixed receipt header once into a reusable form on ``c``.
+
+    Returns:
+        str: Form name to pass to ``_draw_report`` as ``header_form``
+    """
+    c.beginForm(HEADER_FORM)
+    _draw_header(c)
+    c.endForm()
+    return HEADER_FORM
+
+
+def _draw_report(c, ticket_id, data, header_form=None):
+    """
+    Draw one receipt onto a canvas, starting on a fresh page.
+
+    The body goes into one text object per page instead of a text object and
+    font change per ``drawString``. With ``header_form`` (see
+    ``define_header_form``) the header is referenced, not drawn again.
+    """
+    width, height = A4
+    value_width = width - VALUE_X - RIGHT_MARGIN
+
+    # ================= HEADER =================
+    if header_form:
+        c.doForm(header_form)
+    else:
+        _draw_header(c)
+    y = height - 50 - HEADER_HEIGHT
+
+    text = c.beginText()
+    text.setFont("Helvetica", 11)
+    text.setTextOrigin(50, y)
+    text.textOut(f"Ticket ID: {ticket_id}")
+    y -= 30
+
+    # ================= BODY =================
+    for key, value in data.items():
+        # Long values (the complaint itself) wrap inside the value column
+        lines = simpleSplit(str(value), "Helvetica", 11, value_width) or [""]
+        for i, line in enumerate(lines):
+            if y < 80:
+                c.drawText(text)
+                c.showPage()
+                text = c.beginText()
+                text.setFont("Helvetica", 11)
+                y = height - 50
+
+            if i == 0:
+                text.setFont("Helvetica-Bold", 11)
+                text.setTextOrigin(50, y)
+                text.textOut(f"{key}:")
+                text.setFont("Helvetica", 11)
+            text.setTextOrigin(VALUE_X, y)
+            text.textOut(line)
+            y -= 20 if i == len(lines) - 1 else WRAPPED_LINE_HEIGHT
+
+    # ================= FOOTER =================
+    font, size, x = _static_layout()[1]
+    text.setFont(font, size)
+    text.setTextOrigin(x, y - 30)
+    text.textOut(FOOTER_TEXT)
+    c.drawText(text)
+
+
+def render_pdf_report(ticket_id: str, data: dict) -> bytes:
+    """
+    Render the PDF receipt for a complaint in memory.
+
+    Args:
+        ticket_id (str): Unique ticket identifier
+        data (dict): Complaint details dictionary
+
+    Returns:
+        bytes: The PDF document
+    """
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    _draw_report(c, ticket_id, data)
+    c.save()
+    return buffer.getvalue()
+
+
 def generate_pdf_report(ticket_id: str, data: dict):
     """
     Generate PDF report for grievance complaint.
@@ -20,44 +166,274 @@ def generate_pdf_report(ticket_id: str, data: dict):
     file_path = f"reports/Grievance_{ticket_id}.pdf"
 
     c = canvas.Canvas(file_path, pagesize=A4)
-    width, height = A4
+    _draw_report(c, ticket_id, data)
+    c.save()
+    return file_path
 
-    y = height - 50
 
-    # ================= HEADER =================
-    c.setFont("Helvetica-Bold", 16)
-    c.drawCentredString(width / 2, y, "GOVERNMENT OF INDIA")
-    y -= 25
+class ReceiptRenderer:
+    """
+    Background pre-rendering of PDF receipts with a size-bounded cache.
 
-    c.setFont("Helvetica-Bold", 14)
-    c.drawCentredString(width / 2, y, "AI-POWERED GRIEVANCE REDRESSAL SYSTEM")
-    y -= 40
+    ``submit`` queues a receipt on a small thread pool as soon as the
+    complaint is saved, so ReportLab layout overlaps with the rest of the
+    request; ``get`` returns the finished bytes (waiting if needed). Rendered
+    receipts are kept by ticket ID in an LRU bounded by total bytes.
 
-    c.setFont("Helvetica", 11)
-    c.drawString(50, y, f"Ticket ID: {ticket_id}")
-    y -= 30
+    Args:
+        max_workers (int): Render threads. Defaults to 2
+        max_bytes (int): Cache budget in bytes. Defaults to 64 MB
+    """
 
-    # ================= BODY =================
-    for key, value in data.items():
-        if y < 80:
+    def __init__(self, max_workers=2, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="receipt")
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()
+        self._pending = {}
+        self._cached_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _store(self, ticket_id, pdf):
+        with self._lock:
+            self._pending.pop(ticket_id, None)
+            if len(pdf) > self.max_bytes:
+                return
+            old = self._cache.pop(ticket_id, None)
+            if old is not None:
+                self._cached_bytes -= len(old)
+            self._cache[ticket_id] = pdf
+            self._cached_bytes += len(pdf)
+            while self._cached_bytes > self.max_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cached_bytes -= len(evicted)
+                self.evictions += 1
+
+    def _render(self, ticket_id, data):
+        try:
+            pdf = render_pdf_report(ticket_id, data)
+        except BaseException:
+            with self._lock:
+                self._pending.pop(ticket_id, None)
+            raise
+        self._store(ticket_id, pdf)
+        return pdf
+
+    def submit(self, ticket_id, data):
+        """
+        Start rendering a receipt in the background (no-op if cached or already queued).
+
+        Returns:
+            concurrent.futures.Future: Resolves to the PDF bytes
+        """
+        with self._lock:
+            if ticket_id in self._pending:
+                return self._pending[ticket_id]
+            if ticket_id in self._cache:
+                future = Future()
+                future.set_result(self._cache[ticket_id])
+                return future
+            future = self._executor.submit(self._render, ticket_id, dict(data))
+            self._pending[ticket_id] = future
+            return future
+
+    def get(self, ticket_id, data=None, timeout=None):
+        """
+        Rendered receipt for a ticket.
+
+        Args:
+            ticket_id (str): Ticket identifier
+            data (dict): Complaint details, used to render now if not cached or queued
+            timeout (float): Seconds to wait for a queued render
+
+        Returns:
+            bytes or None: The PDF, or None if unknown and no data was given
+        """
+        with self._lock:
+            pdf = self._cache.get(ticket_id)
+            if pdf is not None:
+                self._cache.move_to_end(ticket_id)
+                self.hits += 1
+                return pdf
+            future = self._pending.get(ticket_id)
+            self.misses += 1
+        if future is not None:
+            return future.result(timeout)
+        if data is None:
+            return None
+        return self._render(ticket_id, data)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "cached": len(self._cache),
+                "cached_bytes": self._cached_bytes,
+                "max_bytes": self.max_bytes,
+                "pending": len(self._pending),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+_receipt_renderer = None
+_receipt_renderer_lock = threading.Lock()
+
+
+def get_receipt_renderer():
+    """Get or create the process-wide receipt renderer."""
+    global _receipt_renderer
+    if _receipt_renderer is None:
+        with _receipt_renderer_lock:
+            if _receipt_renderer is None:
+                _receipt_renderer = ReceiptRenderer()
+    return _receipt_renderer
+
+
+# ================= BULK REPORTS =================
+
+def iter_report_complaints(db, page_size=200, status=None, priority=None, category=None):
+    """
+    Stream complaints from ``GrievanceDatabase`` in chunks, newest first.
+
+    Reads bypass the database's read cache, so a large pack does not
+    evict the dashboard's cached pages.
+
+    Yields:
+        dict: Complaint rows
+    """
+    for rows in db.iter_complaint_chunks(page_size, status=status, priority=priority, category=category):
+        yield from rows
+
+
+def write_bulk_pdf(complaints, out):
+    """
+    Draw many receipts into one multi-page PDF, one ticket after another.
+
+    Rows are consumed lazily and all tickets share one canvas, so fonts and
+    the header (a form drawn once, see ``define_header_form``) are written
+    once. Memory is not bounded: ReportLab keeps every finished page stream
+    (about 1 KB compressed per ticket) until ``save``, and one PDF cannot be
+    written in parts without a merging library. For very large packs use
+    ``write_bulk_zip``, whose memory does not grow with the number of tickets.
+
+    Args:
+        complaints (iterable): Complaint rows, e.g. from ``iter_report_complaints``
+        out (str or file): Output path or binary file object
+
+    Returns:
+        int: Tickets written
+    """
+    c = canvas.Canvas(out, pagesize=A4)
+    header_form = define_header_form(c)
+    count = 0
+    for complaint in complaints:
+        if count:
             c.showPage()
-            c.setFont("Helvetica", 11)
-            y = height - 50
+        _draw_report(c, complaint["ticket_id"], complaint_receipt(complaint), header_form)
+        count += 1
+    c.save()
+    return count
 
-        c.setFont("Helvetica-Bold", 11)
-        c.drawString(50, y, f"{key}:")
-        c.setFont("Helvetica", 11)
-        c.drawString(180, y, str(value))
-        y -= 20
 
-    # ================= FOOTER =================
-    y -= 30
-    c.setFont("Helvetica-Oblique", 10)
-    c.drawCentredString(
-        width / 2,
-        y,
-        "National AI Redressal Framework | 2026"
+def _render_batch(batch):
+    return [
+        (complaint["ticket_id"], render_pdf_report(complaint["ticket_id"], complaint_receipt(complaint)))
+        for complaint in batch
+    ]
+
+
+def _batches(complaints, size):
+    batch = []
+    for complaint in complaints:
+        batch.append(complaint)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_bulk_zip(complaints, out, n_jobs=1, batch_size=64):
+    """
+    Write one PDF per ticket into a ZIP archive.
+
+    Each receipt is rendered and added to the archive on its own, so memory
+    stays flat however many tickets are exported. Every entry is a separate
+    document and needs its own canvas, but the fixed header and footer are
+    laid out once per process (``_static_layout``). With ``n_jobs > 1`` batches
+    are rendered in a process pool, with at most two batches per worker in
+    flight at a time.
+
+    Args:
+        complaints (iterable): Complaint rows, e.g. from ``iter_report_complaints``
+        out (str or file): Output path or binary file object
+        n_jobs (int): Worker processes; -1 uses all cores. Defaults to 1
+        batch_size (int): Tickets per worker task. Defaults to 64
+
+    Returns:
+        int: Tickets written
+    """
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+
+    count = 0
+    # PDF streams are already compressed, so entries are stored as-is
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_STORED) as archive:
+        def add(rendered):
+            nonlocal count
+            for ticket_id, pdf in rendered:
+                archive.writestr(f"Grievance_{ticket_id}.pdf", pdf)
+                count += 1
+
+        if n_jobs <= 1:
+            for batch in _batches(complaints, batch_size):
+                add(_render_batch(batch))
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                in_flight = deque()
+                for batch in _batches(complaints, batch_size):
+                    in_flight.append(executor.submit(_render_batch, batch))
+                    if len(in_flight) >= 2 * n_jobs:
+                        add(in_flight.popleft().result())
+                while in_flight:
+                    add(in_flight.popleft().result())
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a PDF pack of complaint receipts")
+    parser.add_argument("output", help="output file (.pdf for one document, held in memory until written; "
+                                       ".zip for one PDF per ticket, in constant memory)")
+    parser.add_argument("--status", action="append",
+                        help="only these statuses, e.g. --status Pending --status 'In Progress' (default: all)")
+    parser.add_argument("--priority", help="only this priority")
+    parser.add_argument("--category", help="only this category")
+    parser.add_argument("--jobs", type=int, default=1, help="worker processes for ZIP output; -1 for all cores")
+    parser.add_argument("--db", default=os.getenv('DATABASE_PATH', 'data/grievances.db'), help="database path")
+    args = parser.parse_args()
+
+    from database import GrievanceDatabase
+    db = GrievanceDatabase(args.db)
+    complaints = (
+        complaint
+        for status in (args.status or [None])
+        for complaint in iter_report_complaints(
+            db, status=status, priority=args.priority, category=args.category
+        )
     )
 
-    c.save()
-    return file_path
+    if args.output.lower().endswith(".zip"):
+        count = write_bulk_zip(complaints, args.output, n_jobs=args.jobs)
+    else:
+        count = write_bulk_pdf(complaints, args.output)
+    print(f"✓ Wrote {count} receipts to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
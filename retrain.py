@@ -0,0 +1,300 @@
+"""
+Incremental Retraining
+
+Updates the deployed category model with the complaints admins have
+handled since the last training run, instead of retraining from scratch.
+
+- Only complaints an admin has moved out of 'Pending' are learnt from,
+  each exactly once. The training watermark is the highest complaint id
+  already scanned; complaints at or below it that were still pending are
+  revisited first on the next run, so one handled after a newer complaint
+  is not skipped. Ids above the watermark are read in keyset pages from
+  GrievanceDatabase. Watermark and pending ids are kept in the database
+  (``save_training_state``), written only after the model is published,
+  so the pending set shrinks as complaints are handled.
+- The model must be incremental (a hashing pipeline from
+  ``train_model.py --streaming``); ``--bootstrap`` replaces a batch-trained
+  model with one streamed from data/cleaned_data.csv first, after copying
+  the replaced model and its metadata to model/versions/*-replaced-<time>.
+  The saved training state records the model version it belongs to; if
+  ``train_model.py`` has since published a new model, the run stops and
+  asks for ``--bootstrap`` instead of updating from a stale watermark.
+- Each run writes a versioned copy under model/versions/ and swaps it in
+  with ``os.replace``, so a running app (see inference.HotSwapModel) only
+  ever sees a complete file. Version and watermark also go into
+  model_metadata.json, which is replaced the same way.
+
+Usage:
+    python retrain.py                   # learn from newly handled complaints
+    python retrain.py --bootstrap       # first run against a batch-trained model
+    python retrain.py --dry-run         # report without writing anything
+
+Author: Debasis Behera
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+import joblib
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.pipeline import Pipeline
+
+from database import GrievanceDatabase
+from streaming import in_holdout, iter_csv_chunks, train_streaming
+
+MODEL_PATH = os.getenv('MODEL_PATH', 'model/classifier.pkl')
+METADATA_PATH = "model/model_metadata.json"
+DB_PATH = os.getenv('DATABASE_PATH', 'data/grievances.db')
+VERSIONS_DIR = "model/versions"
+
+
+def load_metadata(path=METADATA_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _atomic_write(path, write):
+    """Write through a temporary file in the same directory, then os.replace it over ``path``."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600 files; keep the published file readable like the one it replaces
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def atomic_dump_model(model, path):
+    _atomic_write(path, lambda f: joblib.dump(model, f))
+
+
+def atomic_dump_json(data, path):
+    _atomic_write(path, lambda f: f.write(json.dumps(data, indent=4).encode("utf-8")))
+
+
+def is_incremental(model):
+    """True for a stateless-vectorizer pipeline whose classifier supports partial_fit."""
+    return (
+        isinstance(model, Pipeline)
+        and isinstance(model.steps[0][1], HashingVectorizer)
+        and hasattr(model.steps[-1][1], "partial_fit")
+    )
+
+
+def update_model(model, chunks, holdout=0.1):
+    """
+    Apply ``partial_fit`` to a chunk stream of (ids, texts, labels).
+
+    Categories the model was never trained on cannot be added incrementally
+    and are skipped; hash-selected held-out texts are set aside for scoring
+    the updated model instead of being trained on.
+
+    Returns:
+        dict: Counts and the held-out (texts, labels)
+    """
+    vectorizer, clf = model.steps[0][1], model.steps[-1][1]
+    known = set(clf.classes_)
+    trained = unknown = 0
+    held_texts, held_labels = [], []
+
+    for ids, texts, labels in chunks:
+        train_texts, train_labels = [], []
+        for text, label in zip(texts, labels):
+            if label not in known:
+                unknown += 1
+            elif in_holdout(text, holdout):
+                held_texts.append(text)
+                held_labels.append(label)
+            else:
+                train_texts.append(text)
+                train_labels.append(label)
+        if train_texts:
+            clf.partial_fit(vectorizer.transform(train_texts), train_labels)
+            trained += len(train_texts)
+
+    return {
+        'trained_rows': trained,
+        'skipped_unknown_category': unknown,
+        'holdout_rows': len(held_texts),
+        'held_out': (held_texts, held_labels),
+    }
+
+
+class HandledComplaints:
+    """
+    Complaints handled since the last run, as (ids, texts, labels) chunks.
+
+    Iterating first revisits ``pending_ids`` (complaints at or below the
+    watermark that were still 'Pending' last time), then scans the ids
+    above ``watermark``. Afterwards ``watermark`` is the highest id scanned
+    and ``pending_ids`` the scanned complaints still pending, ready to be
+    stored for the next run. Every complaint is yielded once, in the run
+    after it leaves 'Pending'.
+
+    Args:
+        db (GrievanceDatabase): Source of complaints
+        watermark (int): Highest complaint id scanned by earlier runs
+        pending_ids (list): Complaints at or below ``watermark`` not yet handled
+        chunk_size (int): Rows per database page
+    """
+
+    def __init__(self, db, watermark=0, pending_ids=(), chunk_size=5000):
+        self.db = db
+        self.watermark = watermark
+        self.pending_ids = sorted(pending_ids)
+        self.chunk_size = chunk_size
+
+    def _pages(self):
+        for start in range(0, len(self.pending_ids), self.chunk_size):
+            yield self.db.get_labelled_complaints(self.pending_ids[start:start + self.chunk_size])
+        for rows in self.db.iter_labelled_complaints(self.chunk_size, after_id=self.watermark):
+            self.watermark = rows[-1]["id"]
+            yield rows
+
+    def __iter__(self):
+        still_pending = []
+        for rows in self._pages():
+            handled = []
+            for row in rows:
+                (still_pending if row["status"] == "Pending" else handled).append(row)
+            if handled:
+                yield ([row["id"] for row in handled],
+                       [row["complaint_text"] for row in handled],
+                       [row["category"] for row in handled])
+        self.pending_ids = [row["id"] for row in still_pending]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally retrain the category model")
+    parser.add_argument("--model-path", default=MODEL_PATH, help=f"model to update (default: {MODEL_PATH})")
+    parser.add_argument("--db", default=DB_PATH, help=f"complaints database (default: {DB_PATH})")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="rows per database page (default: 5000)")
+    parser.add_argument("--holdout", type=float, default=0.1, help="hash-based validation fraction (default: 0.1)")
+    parser.add_argument("--keep", type=int, default=5, help="versioned copies to keep (default: 5)")
+    parser.add_argument("--bootstrap", action="store_true",
+                        help="replace a non-incremental model with one streamed from data/cleaned_data.csv")
+    parser.add_argument("--dry-run", action="store_true", help="train and report, but write nothing")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("AI Grievance Classification - Incremental Retraining")
+    print("=" * 60)
+
+    metadata = load_metadata()
+    version = int(metadata.get('model_version', 0))
+    db = GrievanceDatabase(args.db)
+    state = db.get_training_state()
+    if state['model_version'] is None:
+        # Nothing saved in the database yet: start from the metadata watermark
+        state['watermark'] = int(metadata.get('training_watermark', 0))
+    watermark, pending_ids = state['watermark'], state['pending_ids']
+    print(f"\nCurrent model: v{version}, watermark: complaint id {watermark}, "
+          f"{len(pending_ids)} older complaints pending")
+
+    model = joblib.load(args.model_path) if os.path.exists(args.model_path) else None
+    stale = state['model_version'] not in (None, version)
+    bootstrapped = model is None or not is_incremental(model) or stale
+    if bootstrapped:
+        if not args.bootstrap:
+            if model is not None and is_incremental(model):
+                print(f"   ✗ The saved training state belongs to model v{state['model_version']}, but "
+                      f"{args.model_path} is v{version}. Run with --bootstrap to start again from a "
+                      "streaming model trained on data/cleaned_data.csv.")
+            else:
+                print(f"   ✗ {args.model_path} cannot be updated incrementally. Run with --bootstrap "
+                      "to start from a streaming model trained on data/cleaned_data.csv.")
+            return 1
+        print("   Bootstrapping streaming model from data/cleaned_data.csv...")
+        model, report = train_streaming(lambda: iter_csv_chunks("data/cleaned_data.csv"))
+        print(f"   ✓ Holdout accuracy: {report['holdout_accuracy']:.4f}")
+        metadata = {
+            'model_name': f"Streaming ({report['model']})",
+            'accuracy': report['holdout_accuracy'],
+            'categories': report['classes'],
+            'streaming': report,
+        }
+        watermark, pending_ids = 0, []
+
+    print(f"\nLearning from complaints handled since the last run (ids after {watermark} "
+          f"and {len(pending_ids)} pending at or below it)...")
+    start = time.perf_counter()
+    handled = HandledComplaints(db, watermark, pending_ids, args.chunk_size)
+    update = update_model(model, handled, args.holdout)
+    held_texts, held_labels = update.pop('held_out')
+    elapsed = time.perf_counter() - start
+    update['watermark'] = handled.watermark
+    update['pending'] = len(handled.pending_ids)
+
+    rows = update['trained_rows'] + update['skipped_unknown_category'] + update['holdout_rows']
+    if not rows and not bootstrapped:
+        print("   ✓ No newly handled complaints, model unchanged")
+        return 0
+
+    print(f"   ✓ Trained on {update['trained_rows']} complaints in {elapsed:.1f}s")
+    if update['skipped_unknown_category']:
+        print(f"   ⚠ Skipped {update['skipped_unknown_category']} with categories the model does not know")
+    if held_texts:
+        accuracy = float(np.mean(model.predict(held_texts) == np.asarray(held_labels, dtype=object)))
+        update['holdout_accuracy'] = accuracy
+        print(f"   ✓ Accuracy on {len(held_texts)} held-out new complaints: {accuracy:.4f}")
+
+    version += 1
+    metadata.update({
+        'model_version': version,
+        'training_watermark': handled.watermark,
+        'training_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'last_retrain': {**update, 'seconds': elapsed},
+    })
+
+    if args.dry_run:
+        print(f"\nDry run: would publish v{version} with watermark {handled.watermark}, "
+              f"{len(handled.pending_ids)} complaints pending")
+        return 0
+
+    os.makedirs(VERSIONS_DIR, exist_ok=True)
+    if bootstrapped and os.path.exists(args.model_path):
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        backup_path = os.path.join(VERSIONS_DIR, f"classifier-replaced-{stamp}.pkl")
+        shutil.copy2(args.model_path, backup_path)
+        if os.path.exists(METADATA_PATH):
+            shutil.copy2(METADATA_PATH, os.path.join(VERSIONS_DIR, f"model_metadata-replaced-{stamp}.json"))
+        print(f"\n   ✓ Backed up the replaced model to {backup_path}")
+    versioned_path = os.path.join(VERSIONS_DIR, f"classifier-v{version}.pkl")
+    atomic_dump_model(model, versioned_path)
+    atomic_dump_model(model, args.model_path)
+    atomic_dump_json(metadata, METADATA_PATH)
+    # Last, so a crash before this point re-reads complaints instead of skipping them
+    db.save_training_state(handled.watermark, version, handled.pending_ids)
+
+    versions = sorted(
+        (name for name in os.listdir(VERSIONS_DIR) if name.startswith("classifier-v")),
+        key=lambda name: int(name[len("classifier-v"):-len(".pkl")])
+    )
+    for name in versions[:-args.keep]:
+        os.remove(os.path.join(VERSIONS_DIR, name))
+
+    print(f"\n   ✓ Published v{version}: {args.model_path} (copy: {versioned_path})")
+    print(f"   ✓ Watermark advanced to complaint id {handled.watermark}, "
+          f"{len(handled.pending_ids)} complaints at or below it still pending")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
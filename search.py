@@ -0,0 +1,183 @@
+"""
+Time-Budgeted Hyperparameter Search
+
+Successive halving over the classifier families and TF-IDF settings used
+by train_model.py. Many randomly sampled configurations are scored with
+cheap cross-validation on a small stratified sample of the training data;
+each rung keeps the best 1/eta of them and gives the survivors eta times
+more data, until the full training set is reached. Candidate fits run in
+parallel, and the search stops scheduling work once the wall-clock budget
+is spent, returning the best configurations of the last rung reached.
+
+Author: Debasis Behera
+"""
+
+import math
+import time
+
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold, StratifiedShuffleSplit
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+from sklearn.svm import LinearSVC
+
+FAMILIES = ("logistic_regression", "linear_svm", "naive_bayes", "random_forest", "gradient_boosting")
+
+
+def sample_config(rng):
+    """
+    Draw one configuration: a model family, its hyperparameters and TF-IDF settings.
+
+    Returns:
+        dict: JSON-serialisable ``family``, ``params`` and ``tfidf`` entries
+    """
+    family = FAMILIES[rng.randint(len(FAMILIES))]
+    choice = lambda options: options[rng.randint(len(options))]
+
+    if family == "logistic_regression":
+        params = {"C": float(10 ** rng.uniform(-1, 2))}
+    elif family == "linear_svm":
+        params = {"C": float(10 ** rng.uniform(-1.5, 1.5))}
+    elif family == "naive_bayes":
+        params = {"alpha": float(10 ** rng.uniform(-3, 0))}
+    elif family == "random_forest":
+        params = {"n_estimators": choice([100, 200, 400]), "max_depth": choice([None, 30, 60])}
+    else:
+        params = {
+            "n_estimators": choice([50, 100, 200]),
+            "learning_rate": choice([0.05, 0.1, 0.25]),
+            "max_depth": choice([2, 3, 5]),
+        }
+
+    tfidf = {
+        "ngram_range": choice([[1, 1], [1, 2], [1, 3]]),
+        "min_df": choice([1, 2]),
+        "max_features": choice([5000, 15000, 30000, None]),
+        "sublinear_tf": choice([True, False]),
+    }
+    return {"family": family, "params": params, "tfidf": tfidf}
+
+
+def build_pipeline(config, memory=None):
+    """Unfitted ``Pipeline(tfidf, clf)`` for a sampled configuration."""
+    family, params = config["family"], config["params"]
+    if family == "logistic_regression":
+        clf = LogisticRegression(max_iter=5000, class_weight="balanced", random_state=42, **params)
+    elif family == "linear_svm":
+        clf = LinearSVC(dual=False, class_weight="balanced", max_iter=15000, random_state=42, **params)
+    elif family == "naive_bayes":
+        clf = MultinomialNB(**params)
+    elif family == "random_forest":
+        clf = RandomForestClassifier(class_weight="balanced", random_state=42, **params)
+    elif family == "gradient_boosting":
+        clf = GradientBoostingClassifier(random_state=42, **params)
+    else:
+        raise ValueError(f"Unknown model family '{family}'")
+
+    tfidf = dict(config["tfidf"], ngram_range=tuple(config["tfidf"]["ngram_range"]))
+    return Pipeline([
+        ("tfidf", TfidfVectorizer(stop_words="english", max_df=0.8, **tfidf)),
+        ("clf", clf),
+    ], memory=memory)
+
+
+def _fit_score(pipeline, X, y, train, test):
+    start = time.perf_counter()
+    pipeline.fit(X[train], y[train])
+    accuracy = float(np.mean(pipeline.predict(X[test]) == y[test]))
+    return accuracy, time.perf_counter() - start
+
+
+def _rung_sizes(n_samples, n_candidates, eta, min_samples):
+    """Training-sample counts per rung, ending with the full training set."""
+    n_rungs = max(1, int(math.log(n_candidates, eta)) + 1)
+    sizes = [max(min_samples, int(n_samples / eta ** (n_rungs - 1 - rung))) for rung in range(n_rungs)]
+    return sorted(set(min(size, n_samples) for size in sizes))
+
+
+def successive_halving(X, y, budget=600, n_candidates=60, eta=3, cv=3, n_jobs=-1,
+                       memory=None, random_state=42):
+    """
+    Run the budgeted search.
+
+    Args:
+        X (array-like): Training texts
+        y (array-like): Training labels
+        budget (float): Wall-clock seconds after which no new fits are started. Defaults to 600
+        n_candidates (int): Configurations sampled for the first rung. Defaults to 60
+        eta (int): Halving rate; each rung keeps 1/eta of the candidates. Defaults to 3
+        cv (int): Folds per evaluation. Defaults to 3
+        n_jobs (int): Parallel fits; -1 uses all cores. Defaults to -1
+        memory: Optional joblib.Memory shared with the pipelines' TF-IDF steps
+        random_state (int): Seed for sampling and splits. Defaults to 42
+
+    Returns:
+        dict: ``candidates``, ``rungs`` (per-rung scores), ``finalists`` (candidate
+        indices from the last rung reached, best first), ``stopped_early`` and ``elapsed``
+    """
+    start = time.monotonic()
+    deadline = start + budget
+    X, y = np.asarray(X, dtype=object), np.asarray(y, dtype=object)
+    rng = np.random.RandomState(random_state)
+    candidates = [sample_config(rng) for _ in range(n_candidates)]
+
+    # Each fold must still see every class a few times
+    min_samples = min(len(y), cv * len(np.unique(y)) * 3)
+    sizes = _rung_sizes(len(y), n_candidates, eta, min_samples)
+
+    alive = list(range(n_candidates))
+    rungs, finalists, stopped_early = [], [], False
+    batch = effective_n_jobs(n_jobs)
+    with Parallel(n_jobs=n_jobs) as parallel:
+        for rung, size in enumerate(sizes):
+            if size < len(y):
+                subset, _ = next(StratifiedShuffleSplit(
+                    n_splits=1, train_size=size, random_state=random_state + rung
+                ).split(X, y))
+            else:
+                subset = np.arange(len(y))
+            Xs, ys = X[subset], y[subset]
+            folds = list(StratifiedKFold(cv, shuffle=True, random_state=random_state).split(Xs, ys))
+
+            scores = {}
+            for first in range(0, len(alive), batch):
+                if time.monotonic() >= deadline:
+                    stopped_early = True
+                    break
+                chunk = alive[first:first + batch]
+                results = parallel(
+                    delayed(_fit_score)(build_pipeline(candidates[i], memory), Xs, ys, train, test)
+                    for i in chunk for train, test in folds
+                )
+                for n, i in enumerate(chunk):
+                    fold_results = results[n * cv:(n + 1) * cv]
+                    scores[i] = {
+                        "cv_accuracy": float(np.mean([accuracy for accuracy, _ in fold_results])),
+                        "fit_seconds": float(np.mean([seconds for _, seconds in fold_results])),
+                    }
+
+            if not scores:
+                break
+            ranked = sorted(scores, key=lambda i: scores[i]["cv_accuracy"], reverse=True)
+            rungs.append({
+                "rung": rung,
+                "n_samples": int(size),
+                "evaluated": len(scores),
+                "scores": {str(i): scores[i] for i in ranked},
+            })
+            finalists = ranked
+            if stopped_early or rung == len(sizes) - 1:
+                break
+            alive = ranked[:max(1, len(ranked) // eta)]
+
+    return {
+        "candidates": candidates,
+        "rungs": rungs,
+        "finalists": finalists[:max(eta, 1)],
+        "stopped_early": stopped_early,
+        "elapsed": time.monotonic() - start,
+    }
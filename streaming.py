@@ -0,0 +1,177 @@
+"""
+Out-of-Core Streaming Training
+
+Trains the complaint category classifier from sources far larger than
+memory. Complaints are read in fixed-size chunks (from a CSV file or the
+``complaints`` table), featurised with a stateless HashingVectorizer - no
+vocabulary has to be learnt or held in memory - and fed to a linear model
+through ``partial_fit``. Memory use depends on the chunk size and the
+number of hashed features, never on the number of complaints.
+
+A streaming validation split is taken by hashing each complaint text, so
+the same texts are held out in every pass and every run without storing
+an index of them.
+
+Author: Debasis Behera
+"""
+
+import hashlib
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.pipeline import Pipeline
+
+# Non-negative features (alternate_sign=False) so Naive Bayes can use them too
+HASHING_PARAMS = {
+    "n_features": 2 ** 20,
+    "alternate_sign": False,
+    "ngram_range": (1, 2),
+    "stop_words": "english",
+    "norm": "l2",
+}
+
+STREAMING_MODELS = ("sgd", "nb")
+
+
+def iter_csv_chunks(path, chunk_size=10000, text_column="complaint_text", label_column="category"):
+    """
+    Read labelled complaints from a CSV file one chunk at a time.
+
+    Yields:
+        tuple: (list of texts, list of labels)
+    """
+    for frame in pd.read_csv(path, usecols=[text_column, label_column], chunksize=chunk_size):
+        frame = frame.dropna()
+        yield frame[text_column].astype(str).tolist(), frame[label_column].astype(str).tolist()
+
+
+def iter_db_chunks(db, chunk_size=5000, after_id=0, handled_only=False):
+    """
+    Read labelled complaints from ``GrievanceDatabase`` one keyset page at a time.
+
+    Yields:
+        tuple: (list of texts, list of labels)
+    """
+    for rows in db.iter_labelled_complaints(chunk_size, after_id=after_id, handled_only=handled_only):
+        yield [row["complaint_text"] for row in rows], [row["category"] for row in rows]
+
+
+def in_holdout(text, fraction):
+    """Deterministic validation split: a text always falls on the same side."""
+    if fraction <= 0:
+        return False
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2 ** 64 < fraction
+
+
+def collect_classes(chunks):
+    """
+    Every label in a chunk stream; ``partial_fit`` needs the full set up front.
+
+    Returns:
+        np.ndarray: Sorted class labels
+    """
+    classes = set()
+    for _, labels in chunks:
+        classes.update(labels)
+    return np.array(sorted(classes), dtype=object)
+
+
+def build_streaming_model(kind="sgd"):
+    """
+    Unfitted hashing pipeline for incremental training.
+
+    Args:
+        kind (str): 'sgd' (SGDClassifier, modified Huber loss) or 'nb' (MultinomialNB)
+
+    Returns:
+        Pipeline: ``hashing`` vectorizer followed by the ``clf`` classifier
+    """
+    if kind == "sgd":
+        clf = SGDClassifier(loss="modified_huber", alpha=1e-5, random_state=42)
+    elif kind == "nb":
+        clf = MultinomialNB(alpha=0.01)
+    else:
+        raise ValueError(f"Unknown streaming model '{kind}', expected one of {STREAMING_MODELS}")
+    return Pipeline([("hashing", HashingVectorizer(**HASHING_PARAMS)), ("clf", clf)])
+
+
+def _split(texts, labels, fraction, holdout):
+    picked = [(text, label) for text, label in zip(texts, labels)
+              if in_holdout(text, fraction) == holdout]
+    return [text for text, _ in picked], [label for _, label in picked]
+
+
+def partial_fit_chunks(model, chunks, classes, holdout=0.0):
+    """
+    One incremental pass over a chunk stream, skipping the held-out texts.
+
+    Returns:
+        int: Rows trained on
+    """
+    vectorizer, clf = model.named_steps["hashing"], model.named_steps["clf"]
+    trained = 0
+    for texts, labels in chunks:
+        texts, labels = _split(texts, labels, holdout, holdout=False)
+        if texts:
+            clf.partial_fit(vectorizer.transform(texts), labels, classes=classes)
+            trained += len(texts)
+    return trained
+
+
+def evaluate_chunks(model, chunks, holdout):
+    """
+    Accuracy on the held-out texts of a chunk stream.
+
+    Returns:
+        tuple: (accuracy or None if nothing was held out, held-out rows)
+    """
+    correct = total = 0
+    for texts, labels in chunks:
+        texts, labels = _split(texts, labels, holdout, holdout=True)
+        if texts:
+            correct += int(np.sum(model.predict(texts) == np.asarray(labels, dtype=object)))
+            total += len(texts)
+    return (correct / total if total else None), total
+
+
+def train_streaming(make_chunks, kind="sgd", holdout=0.2, epochs=1, classes=None):
+    """
+    Train a hashing pipeline out of core.
+
+    The source is read once to collect the classes (unless given), ``epochs``
+    times to train, and once more to score the held-out texts.
+
+    Args:
+        make_chunks (callable): Returns a fresh (texts, labels) chunk iterator per pass
+        kind (str): Streaming model, see ``build_streaming_model``. Defaults to 'sgd'
+        holdout (float): Fraction of texts held out for validation. Defaults to 0.2
+        epochs (int): Training passes over the source. Defaults to 1
+        classes (array-like): Known labels, to skip the class-collection pass
+
+    Returns:
+        tuple: (fitted Pipeline, report dict)
+    """
+    if classes is None:
+        classes = collect_classes(make_chunks())
+    if len(classes) < 2:
+        raise ValueError("Need at least two categories to train")
+
+    model = build_streaming_model(kind)
+    trained = 0
+    for _ in range(epochs):
+        trained = partial_fit_chunks(model, make_chunks(), classes, holdout)
+    accuracy, held_out = evaluate_chunks(model, make_chunks(), holdout)
+
+    return model, {
+        "model": kind,
+        "classes": [str(label) for label in classes],
+        "training_rows": trained,
+        "holdout_rows": held_out,
+        "holdout_accuracy": accuracy,
+        "epochs": epochs,
+        "hashing": {**HASHING_PARAMS, "ngram_range": list(HASHING_PARAMS["ngram_range"])},
+    }
@@ -0,0 +1,30 @@
+"""
+Shared pytest setup: make the top-level modules importable from tests/
+and keep Streamlit app tests from leaking state into later tests.
+
+Author: Debasis Behera
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture(autouse=True)
+def isolate_app_tests(monkeypatch):
+    """
+    Undo what Streamlit's AppTest leaves behind in the test process.
+
+    AppTest installs app.py as ``__main__`` (spawned worker processes would
+    then re-import the app against the default database) and its
+    ``st.cache_resource`` handles outlive the test that created them.
+    """
+    monkeypatch.setitem(sys.modules, "__main__", sys.modules["__main__"])
+    yield
+    if "streamlit" in sys.modules:
+        sys.modules["streamlit"].cache_resource.clear()
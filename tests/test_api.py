@@ -0,0 +1,130 @@
+"""
+Tests for the headless API: request validation, contact masking and
+request size limits.
+
+Author: Debasis Behera
+"""
+
+import asyncio
+import json
+
+import pytest
+
+import api
+from api import APIError, GrievanceAPI, Request, mask_contact
+from database import GrievanceDatabase
+
+VALID = {"name": "Asha Rao", "email": "asha@example.com", "phone": "9876543210",
+         "complaint_text": "Garbage has not been collected for two weeks"}
+ADMIN = {"x-admin-password": api.ADMIN_PASSWORD}
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = GrievanceAPI(GrievanceDatabase(str(tmp_path / "grievances.db")),
+                           model_path=str(tmp_path / "missing.pkl"), workers=1)
+
+    async def inline(func, *args):
+        return func(*args)
+
+    # Run analysis and PDF rendering in-process instead of in the worker pool
+    service._cpu = inline
+    yield service
+    service.close()
+
+
+def call(service, method, target, body=None, headers=None):
+    """Dispatch one request; returns (status, body) with errors as their JSON body."""
+    payload = b"" if body is None else json.dumps(body).encode()
+    request = Request(method, target, "HTTP/1.1", dict(headers or {}), payload)
+    try:
+        status, body, _ = asyncio.run(service.dispatch(request))
+    except APIError as e:
+        return e.status, {"error": e.message}
+    return status, body
+
+
+@pytest.mark.parametrize("field, value", [
+    ("name", 42),
+    ("email", ["asha@example.com"]),
+    ("complaint_text", {"text": "x"}),
+    ("phone", {"number": "9876543210"}),
+    ("phone", 9876543210),
+    ("anonymous", "yes"),
+])
+def test_submit_rejects_wrong_types(service, field, value):
+    status, body = call(service, "POST", "/complaints", {**VALID, field: value})
+    assert status == 400
+    assert f"'{field}'" in body["error"]
+
+
+@pytest.mark.parametrize("field", ["name", "email", "complaint_text"])
+def test_submit_requires_fields(service, field):
+    assert call(service, "POST", "/complaints", {**VALID, field: None})[0] == 400
+    assert call(service, "POST", "/complaints", {**VALID, field: "  "})[0] == 400
+    data = dict(VALID)
+    del data[field]
+    assert call(service, "POST", "/complaints", data)[0] == 400
+
+
+def test_submit_limits_contact_length(service):
+    assert call(service, "POST", "/complaints", {**VALID, "email": "a" * 300})[0] == 413
+
+
+def test_track_masks_contact_details_for_the_public(service):
+    status, body = call(service, "POST", "/complaints", {**VALID, "phone": None, "anonymous": False})
+    assert status == 201
+    ticket = body["ticket_id"]
+
+    status, public = call(service, "GET", f"/complaints/{ticket}")
+    assert status == 200
+    assert (public["name"], public["email"], public["phone"]) == ("A*** R***", "a***@example.com", "N/A")
+    assert public["complaint_text"] == VALID["complaint_text"]
+
+    status, admin = call(service, "GET", f"/complaints/{ticket}", headers=ADMIN)
+    assert (admin["name"], admin["email"]) == ("Asha Rao", "asha@example.com")
+
+
+def test_receipt_masks_contact_details(service, monkeypatch):
+    rendered = []
+    monkeypatch.setattr(api, "render_pdf_report", lambda ticket_id, data: rendered.append(data) or b"%PDF")
+    ticket = call(service, "POST", "/complaints", VALID)[1]["ticket_id"]
+
+    assert call(service, "GET", f"/complaints/{ticket}/receipt")[0] == 200
+    assert call(service, "GET", f"/complaints/{ticket}/receipt", headers=ADMIN)[0] == 200
+    public, admin = (json.dumps(data, default=str) for data in rendered)
+    assert "asha@example.com" not in public and "9876543210" not in public
+    assert "asha@example.com" in admin and "9876543210" in admin
+
+
+def test_mask_contact():
+    masked = mask_contact({"name": "Anonymous", "email": "x@y.org", "phone": "12345", "status": "Pending"})
+    assert masked == {"name": "Anonymous", "email": "x***@y.org", "phone": "***", "status": "Pending"}
+    assert mask_contact({"phone": "+91 98765 43210"})["phone"] == "***10"
+
+
+def read(raw, limit=api.MAX_HEADER_BYTES):
+    async def parse():
+        reader = asyncio.StreamReader(limit=limit)
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await Request.read(reader)
+    return asyncio.run(parse())
+
+
+def test_reads_a_normal_request():
+    request = read(b"POST /complaints HTTP/1.1\r\nHost: x\r\nContent-Length: 2\r\n\r\n{}")
+    assert (request.method, request.path, request.body) == ("POST", "/complaints", b"{}")
+
+
+@pytest.mark.parametrize("raw, status", [
+    (b"GET /" + b"a" * api.MAX_HEADER_BYTES + b" HTTP/1.1\r\n\r\n", 414),
+    (b"GET / HTTP/1.1\r\nX-Big: " + b"a" * api.MAX_HEADER_BYTES + b"\r\n\r\n", 431),
+    (b"GET / HTTP/1.1\r\n" + b"X-Many: 1\r\n" * (api.MAX_HEADERS + 1) + b"\r\n", 431),
+    (b"GET / HTTP/1.1\r\n" + (b"X-Wide: " + b"a" * 1000 + b"\r\n") * 20 + b"\r\n", 431),
+    (b"POST / HTTP/1.1\r\nContent-Length: " + str(api.MAX_BODY_BYTES + 1).encode() + b"\r\n\r\n", 413),
+])
+def test_rejects_oversized_requests(raw, status):
+    with pytest.raises(APIError) as error:
+        read(raw)
+    assert error.value.status == status
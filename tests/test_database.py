@@ -0,0 +1,80 @@
+"""
+Tests for GrievanceDatabase's group-commit writer.
+
+Author: Debasis Behera
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from database import GrievanceDatabase
+
+
+def complaint(number):
+    return {
+        "ticket_id": f"GRV-TEST-{number:04d}",
+        "name": f"Citizen {number}",
+        "email": f"citizen{number}@example.com",
+        "phone": None,
+        "complaint_text": f"Complaint {number}",
+        "category": "Sanitation",
+        "priority": "Low",
+        "department": "Municipal Sanitation Department",
+        "sentiment_label": "Neutral",
+        "sentiment_score": 0.0,
+        "keywords": "",
+        "resolution_time": "2-3 days",
+        "submitted_at": "2026-01-01 10:00:00",
+    }
+
+
+def queue_together(db, count):
+    """Queue ``count`` inserts from as many threads, released at the same moment."""
+    start = threading.Barrier(count)
+
+    def queue(number):
+        start.wait()
+        return db.queue_complaint(complaint(number))
+
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        futures = list(executor.map(queue, range(count)))
+    return [future.result(10) for future in futures]
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = GrievanceDatabase(str(tmp_path / "grievances.db"), writer_max_delay=0.5)
+    yield db
+    db.close()
+
+
+def test_default_writer_waits_for_more_writes(tmp_path):
+    db = GrievanceDatabase(str(tmp_path / "grievances.db"))
+    try:
+        assert db.writer.max_delay > 0
+        assert db.writer.max_batch == 256
+    finally:
+        db.close()
+
+
+def test_concurrent_inserts_share_one_commit(db):
+    assert queue_together(db, 8) == [True] * 8
+
+    stats = db.writer_stats()
+    assert stats["operations"] == 8
+    assert stats["batches"] == 1
+    assert db.get_statistics()["total_complaints"] == 8
+
+
+def test_max_batch_splits_commits(tmp_path):
+    db = GrievanceDatabase(str(tmp_path / "grievances.db"), writer_max_batch=3, writer_max_delay=0.5)
+    try:
+        assert queue_together(db, 8) == [True] * 8
+
+        stats = db.writer_stats()
+        assert stats["max_batch_size"] <= 3
+        assert stats["batches"] >= 3
+    finally:
+        db.close()
@@ -0,0 +1,113 @@
+"""
+Tests for complaint exports: the encoders and the admin panel's download button.
+
+Author: Debasis Behera
+"""
+
+import csv
+import io
+import json
+import os
+
+import pytest
+
+from database import GrievanceDatabase
+from export import available_formats, export_chunks
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATUSES = ["Pending", "In Progress", "Resolved"]
+
+
+def complaint(number):
+    return {
+        "ticket_id": f"GRV-TEST-{number:04d}",
+        "name": f"Citizen {number}",
+        "email": f"citizen{number}@example.com",
+        "phone": None,
+        "complaint_text": f"Complaint {number}, with a comma and \"quotes\"",
+        "category": "Sanitation",
+        "priority": "Low",
+        "department": "Municipal Sanitation Department",
+        "sentiment_label": "Neutral",
+        "sentiment_score": 0.0,
+        "keywords": "",
+        "resolution_time": "2-3 days",
+        "status": STATUSES[number % 3],
+        "submitted_at": f"2026-01-{number % 28 + 1:02d} 10:00:00",
+    }
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "grievances.db")
+    db = GrievanceDatabase(path)
+    result = db.add_complaints_bulk(complaint(number) for number in range(1, 31))
+    assert result["inserted"] == 30
+    db.close()
+    return path
+
+
+def test_csv_and_jsonl_round_trip(db_path):
+    db = GrievanceDatabase(db_path)
+    try:
+        rows = list(csv.DictReader(io.StringIO(b"".join(db.export_complaints("csv", chunk_size=7)).decode())))
+        lines = b"".join(db.export_complaints("jsonl", chunk_size=7, status="Resolved")).decode().splitlines()
+    finally:
+        db.close()
+
+    assert len(rows) == 30
+    assert {row["ticket_id"] for row in rows} == {f"GRV-TEST-{n:04d}" for n in range(1, 31)}
+    assert rows[0]["complaint_text"].endswith('"quotes"')
+    assert [json.loads(line)["status"] for line in lines] == ["Resolved"] * 10
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        export_chunks([], "xlsx")
+
+
+def test_admin_download_button_exports_on_click(db_path, monkeypatch):
+    """The admin panel hands download_button a callable that builds the export."""
+    testing = pytest.importorskip("streamlit.testing.v1")
+    from streamlit.elements.widgets import button
+
+    downloads = []
+    marshall_file = button.marshall_file
+
+    def capture(coordinates, data, proto, mimetype, file_name=None):
+        downloads.append((data, mimetype, file_name))
+        marshall_file(coordinates, data, proto, mimetype, file_name)
+
+    monkeypatch.setattr(button, "marshall_file", capture)
+    monkeypatch.setenv("DATABASE_PATH", db_path)
+    monkeypatch.setenv("MODEL_PATH", os.path.join(db_path, "missing.pkl"))
+    monkeypatch.chdir(ROOT)
+
+    app = testing.AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+    app.run()
+    app.text_input(key="admin_pwd").input("admin123")
+    next(b for b in app.button if "Login" in b.label).click()
+    app.run()
+    assert not app.exception
+    assert app.session_state.admin
+
+    data, mime, file_name = downloads[-1]
+    assert callable(data)
+    assert mime == "text/csv"
+    assert file_name.startswith("grievances_export_") and file_name.endswith(".csv")
+
+    db = GrievanceDatabase(db_path)
+    try:
+        assert data() == b"".join(db.export_complaints("csv"))
+
+        app.selectbox(key="export_status").select("Resolved").run()
+        data, _, _ = downloads[-1]
+        assert data() == b"".join(db.export_complaints("csv", status="Resolved"))
+
+        if "jsonl" in available_formats():
+            next(s for s in app.selectbox if s.label == "Export Format").select("jsonl").run()
+            data, mime, file_name = downloads[-1]
+            assert mime == "application/x-ndjson" and file_name.endswith(".jsonl")
+            assert data() == b"".join(db.export_complaints("jsonl", status="Resolved"))
+    finally:
+        db.close()
@@ -0,0 +1,44 @@
+"""
+Tests for the enrichment pipeline's result cache.
+
+Author: Debasis Behera
+"""
+
+import pytest
+
+from pipeline import ENRICHMENT_COLUMNS, EnrichmentCache, enrich_complaints
+
+VARIANTS = [
+    "The road is terrible",
+    "THE ROAD IS TERRIBLE!!!",
+    "the road is terrible.",
+    "Water pipe not working",
+    "Water pipe not-working",
+    "Water pipe not  working",
+]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EnrichmentCache(metadata_path=str(tmp_path / "model_metadata.json"))
+
+
+def test_cached_results_match_uncached(cache):
+    # Warm the cache with each variant's neighbours first, then compare
+    enrich_complaints(VARIANTS, cache=cache)
+    cached = enrich_complaints(list(reversed(VARIANTS)), cache=cache)
+    uncached = enrich_complaints(list(reversed(VARIANTS)))
+    assert cached[ENRICHMENT_COLUMNS].to_dict("records") == uncached[ENRICHMENT_COLUMNS].to_dict("records")
+    assert cache.stats()["hits"] == len(VARIANTS)
+
+
+def test_case_and_punctuation_change_sentiment(cache):
+    frame = enrich_complaints(["terrible", "TERRIBLE!!!"], cache=cache)
+    assert frame["sentiment_score"][0] != frame["sentiment_score"][1]
+    assert cache.stats()["size"] == 2
+
+
+def test_verbatim_repeats_share_an_entry(cache):
+    frame = enrich_complaints(["Garbage not collected"] * 3, cache=cache)
+    assert len(frame) == 3
+    assert cache.stats()["size"] == 1
@@ -0,0 +1,100 @@
+"""
+Parity tests for the single-pass PriorityMatcher.
+
+The reference below is the original tiered loop that ran one substring
+check per keyword; the compiled matcher must agree with it on every text.
+
+Author: Debasis Behera
+"""
+
+import os
+import random
+
+import pandas as pd
+import pytest
+
+from utils import PRIORITY_KEYWORDS, PriorityMatcher, get_priority, get_priority_batch, match_priority
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "cleaned_data.csv")
+ALL_KEYWORDS = [keyword for keywords in PRIORITY_KEYWORDS.values() for keyword in keywords]
+
+
+def reference_priority(text):
+    """The per-keyword loop get_priority used before PriorityMatcher."""
+    if not text or not isinstance(text, str):
+        return "Low"
+    text = text.lower().strip()
+    for label, keywords in PRIORITY_KEYWORDS.items():
+        for keyword in keywords:
+            if keyword in text:
+                return label
+    return "Low"
+
+
+def reference_keywords(text):
+    """Every keyword occurring anywhere in the text."""
+    text = text.lower()
+    return {keyword for keyword in ALL_KEYWORDS if keyword in text}
+
+
+def random_texts(count, seed=2026):
+    """Texts stitched from keywords, keyword fragments and filler words."""
+    rng = random.Random(seed)
+    filler = ["the", "road", "water", "near", "school", "a", "is", "not", "very", "at", "our", "for", "days"]
+    fragments = [keyword[:rng.randint(1, len(keyword))] for keyword in ALL_KEYWORDS]
+    pieces = ALL_KEYWORDS + fragments + filler
+    separators = [" ", "", "-", ", ", "  "]
+    texts = []
+    for _ in range(count):
+        words = [rng.choice(pieces) for _ in range(rng.randint(0, 8))]
+        text = ""
+        for word in words:
+            text += rng.choice(separators) + (word.upper() if rng.random() < 0.1 else word)
+        texts.append(text)
+    return texts
+
+
+def test_matches_reference_on_dataset():
+    texts = pd.read_csv(DATA_PATH)["complaint_text"].tolist()
+    assert texts
+    for text in texts:
+        assert get_priority(text) == reference_priority(text), text
+        label, keywords = match_priority(text)
+        assert label == reference_priority(text), text
+        assert set(keywords) == reference_keywords(text), text
+
+
+def test_matches_reference_on_random_keyword_mixes():
+    for text in random_texts(50_000):
+        assert get_priority(text) == reference_priority(text), repr(text)
+        label, keywords = match_priority(text)
+        assert label == reference_priority(text), repr(text)
+        assert set(keywords) == reference_keywords(text), repr(text)
+
+
+def test_matched_keywords_in_order_of_appearance():
+    label, keywords = match_priority("Pending repair, the fire hazard is urgent")
+    assert label == "Critical"
+    assert keywords == ["pending", "fire", "fire hazard", "hazard", "urgent"]
+
+
+@pytest.mark.parametrize("text", [None, "", 42, float("nan")])
+def test_non_text_is_low(text):
+    assert get_priority(text) == "Low"
+    assert match_priority(text) == ("Low", [])
+
+
+def test_batch_matches_single():
+    texts = random_texts(500, seed=7)
+    assert get_priority_batch(texts) == [reference_priority(text) for text in texts]
+    series = pd.Series(texts, index=range(100, 600))
+    result = get_priority_batch(series)
+    assert list(result.index) == list(series.index)
+    assert result.tolist() == [reference_priority(text) for text in texts]
+
+
+def test_custom_tiers_prefer_earliest_tier():
+    matcher = PriorityMatcher({"A": ["fire hazard"], "B": ["fire", "hazard"]}, default="Z")
+    assert matcher.priority("a fire hazard") == "A"
+    assert matcher.priority("a fire and a hazard") == "B"
+    assert matcher.priority("nothing here") == "Z"
@@ -0,0 +1,98 @@
+"""
+Tests for PDF receipts: bulk packs and background rendering in the app.
+
+Author: Debasis Behera
+"""
+
+import io
+import os
+import re
+import threading
+import zipfile
+
+import pytest
+
+import report_generator
+from report_generator import write_bulk_pdf, write_bulk_zip
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def complaint(number):
+    return {
+        "ticket_id": f"GRV-{number:04d}", "name": "Citizen", "email": "citizen@example.com",
+        "phone": None, "category": "Water", "priority": "High", "department": "Water Supply",
+        "sentiment_label": "Negative", "keywords": "water, supply", "resolution_time": "3 days",
+        "status": "Pending", "submitted_at": "2026-01-01 10:00:00",
+        "complaint_text": "No water supply in our street since last week " * (1 + number % 40),
+    }
+
+
+def test_bulk_pdf_draws_the_header_once():
+    out = io.BytesIO()
+    assert write_bulk_pdf(map(complaint, range(30)), out) == 30
+
+    pdf = out.getvalue()
+    assert pdf.startswith(b"%PDF")
+    # One form object holds the header; every ticket references it
+    assert pdf.count(b"/Subtype /Form") == 1
+    assert len(re.findall(rb"/Type /Page\b(?!s)", pdf)) >= 30
+
+
+def test_bulk_zip_has_one_receipt_per_ticket():
+    out = io.BytesIO()
+    assert write_bulk_zip(map(complaint, range(12)), out, batch_size=5) == 12
+
+    with zipfile.ZipFile(out) as archive:
+        names = archive.namelist()
+        assert names == [f"Grievance_GRV-{number:04d}.pdf" for number in range(12)]
+        pdfs = [archive.read(name) for name in names]
+    assert all(pdf.startswith(b"%PDF") for pdf in pdfs)
+    # Standalone documents: the header is drawn inline, not as a form
+    assert not any(b"/Subtype /Form" in pdf for pdf in pdfs)
+
+
+def test_submit_does_not_wait_for_the_receipt(tmp_path, monkeypatch):
+    """The page finishes while the PDF is still rendering; the button collects it on click."""
+    testing = pytest.importorskip("streamlit.testing.v1")
+    from streamlit.elements.widgets import button
+
+    release = threading.Event()
+    render = report_generator.render_pdf_report
+
+    def slow_render(ticket_id, data):
+        assert release.wait(30)
+        return render(ticket_id, data)
+
+    downloads = []
+    marshall_file = button.marshall_file
+
+    def capture(coordinates, data, proto, mimetype, file_name=None):
+        downloads.append((data, mimetype, file_name))
+        marshall_file(coordinates, data, proto, mimetype, file_name)
+
+    monkeypatch.setattr(report_generator, "render_pdf_report", slow_render)
+    monkeypatch.setattr(button, "marshall_file", capture)
+    monkeypatch.setenv("DATABASE_PATH", str(tmp_path / "grievances.db"))
+    monkeypatch.setenv("MODEL_PATH", str(tmp_path / "missing.pkl"))
+    monkeypatch.chdir(ROOT)
+
+    app = testing.AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=20)
+    app.run()
+    fields = {widget.label: widget for widget in [*app.text_input, *app.text_area]}
+    fields["Full Name *"].input("Asha Rao")
+    fields["Email Address *"].input("asha@example.com")
+    fields["Complaint Details *"].input("Garbage has not been collected for two weeks")
+    next(b for b in app.button if "Submit Official Complaint" in b.label).click()
+    try:
+        app.run()
+        assert not app.exception
+        # The run returned although the render is still blocked
+        data, mime, file_name = downloads[-1]
+        assert callable(data)
+        assert mime == "application/pdf"
+        assert file_name.startswith("Grievance_GRV-")
+    finally:
+        release.set()
+
+    assert data().startswith(b"%PDF")
@@ -0,0 +1,224 @@
+"""
+Tests for incremental retraining: which complaints each run learns from.
+
+Author: Debasis Behera
+"""
+
+import json
+import os
+import shutil
+import sys
+
+import joblib
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+import retrain
+from database import GrievanceDatabase
+from retrain import HandledComplaints, update_model
+from streaming import build_streaming_model
+
+CATEGORIES = ["Sanitation", "Utilities"]
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = GrievanceDatabase(str(tmp_path / "grievances.db"))
+    yield database
+    database.close()
+
+
+def add(db, number, category="Sanitation"):
+    ticket_id = f"GRV-TEST-{number:04d}"
+    assert db.add_complaint({
+        "ticket_id": ticket_id,
+        "name": "Test",
+        "email": "test@example.com",
+        "phone": None,
+        "complaint_text": f"complaint number {number} about {category.lower()}",
+        "category": category,
+        "priority": "Low",
+        "department": "Test Department",
+        "sentiment_label": "Neutral",
+        "sentiment_score": 0.0,
+        "keywords": "",
+        "resolution_time": "2-3 days",
+        "submitted_at": "2026-01-01 10:00:00",
+    })
+    return ticket_id
+
+
+def run(db, state):
+    """One retrain pass; returns the ids it learnt from and updates ``state``."""
+    handled = HandledComplaints(db, state["watermark"], state["pending"], chunk_size=2)
+    seen = [i for ids, _, _ in handled for i in ids]
+    state.update(watermark=handled.watermark, pending=handled.pending_ids)
+    return seen
+
+
+def test_older_complaint_resolved_after_newer_one_is_learnt_once(db):
+    old, new = add(db, 1), add(db, 2)
+    state = {"watermark": 0, "pending": []}
+
+    db.update_complaint_status(new, "Resolved")
+    assert run(db, state) == [2]
+    assert state == {"watermark": 2, "pending": [1]}
+
+    db.update_complaint_status(old, "Resolved")
+    assert run(db, state) == [1]
+    assert state == {"watermark": 2, "pending": []}
+
+    assert run(db, state) == []
+
+
+def test_pending_complaints_carry_over_until_handled(db):
+    for number in range(1, 8):
+        add(db, number)
+    state = {"watermark": 0, "pending": []}
+
+    for ticket in ("GRV-TEST-0002", "GRV-TEST-0005"):
+        db.update_complaint_status(ticket, "In Progress")
+    assert run(db, state) == [2, 5]
+    assert state == {"watermark": 7, "pending": [1, 3, 4, 6, 7]}
+
+    add(db, 8)
+    db.update_complaint_status("GRV-TEST-0008", "Resolved")
+    db.update_complaint_status("GRV-TEST-0004", "Resolved")
+    # A status change after the complaint was learnt does not bring it back
+    db.update_complaint_status("GRV-TEST-0002", "Resolved")
+    assert run(db, state) == [4, 8]
+    assert state == {"watermark": 8, "pending": [1, 3, 6, 7]}
+
+
+def test_deleted_pending_complaints_are_dropped(db):
+    add(db, 1)
+    state = {"watermark": 0, "pending": []}
+    assert run(db, state) == []
+    assert state["pending"] == [1]
+
+    db.delete_all_complaints()
+    assert run(db, state) == []
+    assert state["pending"] == []
+
+
+def test_update_model_learns_from_handled_chunks(db):
+    model = build_streaming_model()
+    vectorizer, clf = model.steps[0][1], model.steps[-1][1]
+    clf.partial_fit(vectorizer.transform(["bin", "power"]), CATEGORIES, classes=CATEGORIES)
+
+    add(db, 1, "Utilities")
+    add(db, 2, "Healthcare")
+    add(db, 3, "Sanitation")
+    for ticket in ("GRV-TEST-0001", "GRV-TEST-0002", "GRV-TEST-0003"):
+        db.update_complaint_status(ticket, "Resolved")
+
+    handled = HandledComplaints(db)
+    update = update_model(model, handled, holdout=0.0)
+    assert update["trained_rows"] == 2
+    assert update["skipped_unknown_category"] == 1
+    assert handled.watermark == 3 and handled.pending_ids == []
+
+
+def test_saved_pending_set_shrinks_as_complaints_are_handled(db):
+    for number in range(1, 6):
+        add(db, number)
+    db.update_complaint_status("GRV-TEST-0005", "Resolved")
+
+    state = db.get_training_state()
+    assert state == {"watermark": 0, "model_version": None, "pending_ids": []}
+    handled = HandledComplaints(db, state["watermark"], state["pending_ids"])
+    assert [i for ids, _, _ in handled for i in ids] == [5]
+    db.save_training_state(handled.watermark, 1, handled.pending_ids)
+    assert db.get_training_state() == {"watermark": 5, "model_version": 1, "pending_ids": [1, 2, 3, 4]}
+
+    for ticket in ("GRV-TEST-0001", "GRV-TEST-0003"):
+        db.update_complaint_status(ticket, "Resolved")
+    state = db.get_training_state()
+    handled = HandledComplaints(db, state["watermark"], state["pending_ids"])
+    assert [i for ids, _, _ in handled for i in ids] == [1, 3]
+    db.save_training_state(handled.watermark, 2, handled.pending_ids)
+    assert db.get_training_state()["pending_ids"] == [2, 4]
+
+
+@pytest.fixture
+def deployment(tmp_path, monkeypatch):
+    """A scratch model/ and data/ layout with retrain.py pointed at it."""
+    os.makedirs(tmp_path / "model")
+    os.makedirs(tmp_path / "data")
+    shutil.copy(os.path.join(ROOT, "data", "cleaned_data.csv"), tmp_path / "data")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(retrain, "METADATA_PATH", "model/model_metadata.json")
+    monkeypatch.setattr(retrain, "VERSIONS_DIR", "model/versions")
+    return tmp_path
+
+
+def retrain_main(monkeypatch, *args):
+    monkeypatch.setattr(sys, "argv", ["retrain.py", "--model-path", "model/classifier.pkl",
+                                      "--db", "data/grievances.db", *args])
+    return retrain.main()
+
+
+def test_main_keeps_training_state_in_the_database(deployment, monkeypatch):
+    db = GrievanceDatabase("data/grievances.db")
+    for number in range(1, 5):
+        add(db, number)
+    db.update_complaint_status("GRV-TEST-0004", "Resolved")
+    db.close()
+
+    assert retrain_main(monkeypatch, "--bootstrap", "--holdout", "0") == 0
+    db = GrievanceDatabase("data/grievances.db")
+    assert db.get_training_state() == {"watermark": 4, "model_version": 1, "pending_ids": [1, 2, 3]}
+    with open("model/model_metadata.json") as f:
+        assert "pending_complaint_ids" not in json.load(f)
+
+    for ticket in ("GRV-TEST-0001", "GRV-TEST-0002", "GRV-TEST-0003"):
+        db.update_complaint_status(ticket, "Resolved")
+    db.close()
+    assert retrain_main(monkeypatch, "--holdout", "0") == 0
+
+    db = GrievanceDatabase("data/grievances.db")
+    assert db.get_training_state() == {"watermark": 4, "model_version": 2, "pending_ids": []}
+    db.close()
+    with open("model/model_metadata.json") as f:
+        assert json.load(f)["last_retrain"]["trained_rows"] == 3
+
+
+def test_bootstrap_backs_up_the_model_it_replaces(deployment, monkeypatch):
+    batch = Pipeline([("tfidf", TfidfVectorizer()), ("clf", LogisticRegression())])
+    batch.fit(["garbage bins", "power cut"], CATEGORIES)
+    joblib.dump(batch, "model/classifier.pkl")
+    with open("model/model_metadata.json", "w") as f:
+        json.dump({"model_name": "Batch", "model_version": 3, "training_watermark": 0}, f)
+    original = open("model/classifier.pkl", "rb").read()
+
+    assert retrain_main(monkeypatch) == 1
+    assert retrain_main(monkeypatch, "--bootstrap") == 0
+
+    backups = sorted(os.listdir("model/versions"))
+    model_backup = next(name for name in backups if name.startswith("classifier-replaced-"))
+    assert open(os.path.join("model/versions", model_backup), "rb").read() == original
+    assert any(name.startswith("model_metadata-replaced-") for name in backups)
+
+
+def test_stale_training_state_needs_bootstrap(deployment, monkeypatch):
+    db = GrievanceDatabase("data/grievances.db")
+    add(db, 1)
+    db.update_complaint_status("GRV-TEST-0001", "Resolved")
+    db.close()
+    assert retrain_main(monkeypatch, "--bootstrap") == 0
+
+    # train_model.py published a new model: version bumped, watermark reset
+    with open("model/model_metadata.json") as f:
+        metadata = json.load(f)
+    metadata.update(model_version=metadata["model_version"] + 1, training_watermark=0)
+    with open("model/model_metadata.json", "w") as f:
+        json.dump(metadata, f)
+
+    assert retrain_main(monkeypatch) == 1
+    assert retrain_main(monkeypatch, "--bootstrap") == 0
+    db = GrievanceDatabase("data/grievances.db")
+    assert db.get_training_state()["model_version"] == metadata["model_version"] + 1
+    db.close()
@@ -0,0 +1,148 @@
+"""
+Tests for TicketIdGenerator: uniqueness across processes and threads,
+per-process ordering, container (PID 1) deployments and UTC timestamps.
+
+Author: Debasis Behera
+"""
+
+import gc
+import multiprocessing
+import os
+import re
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pytest
+
+import utils
+from utils import TicketIdGenerator
+
+TICKET_RE = re.compile(r"^GRV-(\d{14})-(\d{3})([0-9A-HJKMNP-TV-Z]{6})([0-9A-HJKMNP-TV-Z]{2})$")
+
+
+def _generate(count, threads=2):
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        batches = list(executor.map(
+            lambda n: [utils.generate_ticket_id() for _ in range(n)],
+            [count // threads] * threads
+        ))
+    return batches
+
+
+def _generate_in_container(count):
+    """Every container sees its app as PID 1 and nobody set GRV_NODE_ID."""
+    os.environ.pop("GRV_NODE_ID", None)
+    os.getpid = lambda: 1
+    generator = TicketIdGenerator()
+    return [generator() for _ in range(count)]
+
+
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+def test_unique_across_processes_and_threads(start_method):
+    if start_method not in multiprocessing.get_all_start_methods():
+        pytest.skip(f"{start_method} not available")
+    context = multiprocessing.get_context(start_method)
+    with ProcessPoolExecutor(max_workers=4, mp_context=context) as executor:
+        results = list(executor.map(_generate, [20_000] * 4))
+
+    batches = [batch for result in results for batch in result]
+    ids = [ticket for batch in batches for ticket in batch]
+    assert len(ids) == 80_000
+    assert len(set(ids)) == len(ids)
+    # IDs issued by one thread come out strictly increasing
+    assert all(batch == sorted(set(batch)) for batch in batches)
+    assert all(TICKET_RE.match(ticket) for ticket in ids)
+
+
+def test_unique_across_pid_1_containers():
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=4, mp_context=context, max_tasks_per_child=1) as executor:
+        results = list(executor.map(_generate_in_container, [20_000] * 4))
+
+    ids = [ticket for result in results for ticket in result]
+    assert len(set(ids)) == len(ids)
+    assert len({TICKET_RE.match(ticket).group(3) for ticket in ids}) == 4
+
+
+def test_worker_is_random_without_node_id(monkeypatch):
+    monkeypatch.delenv("GRV_NODE_ID", raising=False)
+    monkeypatch.setattr(os, "getpid", lambda: 1)
+    workers = {TicketIdGenerator().worker for _ in range(50)}
+    assert len(workers) == 50
+
+
+def test_worker_combines_node_id_and_pid(monkeypatch):
+    monkeypatch.setattr(os, "getpid", lambda: 1)
+    monkeypatch.setenv("GRV_NODE_ID", "3")
+    first, again = TicketIdGenerator().worker, TicketIdGenerator().worker
+    monkeypatch.setenv("GRV_NODE_ID", "4")
+    other_node = TicketIdGenerator().worker
+    assert first == again
+    assert first != other_node
+
+
+@pytest.mark.parametrize("node_id", ["-1", "256"])
+def test_node_id_out_of_range(monkeypatch, node_id):
+    monkeypatch.setenv("GRV_NODE_ID", node_id)
+    with pytest.raises(ValueError):
+        TicketIdGenerator()
+
+
+def test_strictly_increasing_when_clock_steps_back(monkeypatch):
+    generator = TicketIdGenerator()
+    clock = iter([2_000_000_000_000_000_000, 1_999_999_999_000_000_000] + [1_999_999_999_000_000_000] * 2000)
+    monkeypatch.setattr(time, "time_ns", lambda: next(clock))
+    ids = [generator() for _ in range(2000)]
+    assert ids == sorted(set(ids))
+
+
+@pytest.mark.skipif(not hasattr(time, "tzset"), reason="needs time.tzset")
+def test_timestamp_is_utc(monkeypatch):
+    # 2026-11-01 05:30 UTC is 01:30 EST, inside the hour New York repeats
+    # when DST ends; local stamps would go back by an hour here
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        generator = TicketIdGenerator()
+        before = datetime(2026, 11, 1, 5, 30, tzinfo=timezone.utc).timestamp()
+        after = before + 3600
+        ids = []
+        for seconds in (before, after):
+            monkeypatch.setattr(time, "time_ns", lambda s=seconds: int(s * 1e9))
+            ids.append(generator())
+    finally:
+        monkeypatch.delenv("TZ")
+        time.tzset()
+
+    assert [TICKET_RE.match(ticket).group(1) for ticket in ids] == ["20261101053000", "20261101063000"]
+    assert ids == sorted(ids)
+
+
+def test_generators_are_not_kept_alive():
+    generator = TicketIdGenerator()
+    ref = weakref.ref(generator)
+    before = len(utils._TICKET_GENERATORS)
+    del generator
+    gc.collect()
+    assert ref() is None
+    assert len(utils._TICKET_GENERATORS) == before - 1
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+def test_fork_reseeds_every_live_generator(monkeypatch):
+    monkeypatch.delenv("GRV_NODE_ID", raising=False)
+    generators = [TicketIdGenerator() for _ in range(3)]
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        os.write(write_fd, ",".join(g.worker for g in generators).encode())
+        os._exit(0)
+    os.close(write_fd)
+    child_workers = os.read(read_fd, 1024).decode().split(",")
+    os.close(read_fd)
+    os.waitpid(pid, 0)
+    assert len(child_workers) == 3
+    assert all(child != parent.worker for child, parent in zip(child_workers, generators))
@@ -8,12 +8,348 @@ from sklearn.naive_bayes import MultinomialNB
 from sklearn.svm import LinearSVC
 from sklearn.pipeline import Pipeline
 from sklearn.metrics import classification_report, accuracy_score
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.feature_selection import chi2
+from sklearn.base import clone
 import joblib
 import json
+import argparse
+import os
+import pickle
+import subprocess
+import sys
+import time
 from datetime import datetime
+from joblib import Memory
 import warnings
 warnings.filterwarnings('ignore')
 
+from inference import SharedNgramEnsemble, CascadeClassifier
+from numpy_model import NumpyLinearModel, MANIFEST_FILE
+from streaming import STREAMING_MODELS, iter_csv_chunks, iter_db_chunks, train_streaming
+from search import build_pipeline, successive_halving
+
+parser = argparse.ArgumentParser(description="Train the grievance classification model")
+parser.add_argument(
+    "--fast-inference", action="store_true",
+    help="also emit model/classifier_fast.pkl, which shares n-gram analysis across ensemble members"
+)
+parser.add_argument(
+    "--export-numpy", action="store_true",
+    help="also export the linear members to model/classifier_numpy/ for the sklearn-free runtime"
+)
+parser.add_argument(
+    "--numpy-allow-partial", action="store_true",
+    help="with --export-numpy, export the linear members even if others (random forests) must be left out"
+)
+parser.add_argument(
+    "--cascade", action="store_true",
+    help="also emit model/classifier_cascade.pkl: calibrated Linear SVM first, ensemble only when unsure"
+)
+parser.add_argument(
+    "--cascade-tolerance", type=float, default=0.01, metavar="ACC",
+    help="maximum accuracy the cascade may give up versus the final model (default: 0.01)"
+)
+parser.add_argument(
+    "--validation-size", type=float, default=0.25, metavar="FRACTION",
+    help="share of the training split held out to choose the cascade threshold and the pruned "
+         "vocabulary (default: 0.25)"
+)
+parser.add_argument(
+    "--cache-dir", default=".cache/train_model", metavar="DIR",
+    help="joblib.Memory cache for fitted TF-IDF stages, shared across models and folds "
+         "(default: .cache/train_model; pass '' to disable)"
+)
+parser.add_argument(
+    "--n-jobs", type=int, default=-1, metavar="N",
+    help="parallel workers for cross-validation folds and ensemble members (default: -1, all cores)"
+)
+parser.add_argument(
+    "--streaming", action="store_true",
+    help="train out of core (hashed features + partial_fit) and save model/classifier_streaming.pkl"
+)
+parser.add_argument(
+    "--source", choices=["csv", "db"], default="csv",
+    help="streaming source: data/cleaned_data.csv or the complaints table (default: csv)"
+)
+parser.add_argument(
+    "--streaming-model", choices=STREAMING_MODELS, default="sgd",
+    help="incremental classifier: SGDClassifier or MultinomialNB (default: sgd)"
+)
+parser.add_argument("--chunk-size", type=int, default=10000, help="rows per streamed chunk (default: 10000)")
+parser.add_argument("--holdout", type=float, default=0.2, help="hash-based validation fraction (default: 0.2)")
+parser.add_argument("--epochs", type=int, default=1, help="streaming passes over the source (default: 1)")
+parser.add_argument(
+    "--search", action="store_true",
+    help="run a successive-halving hyperparameter search instead of the fixed configs"
+)
+parser.add_argument("--budget", type=float, default=600, metavar="SECONDS",
+                    help="wall-clock budget for --search (default: 600)")
+parser.add_argument("--search-candidates", type=int, default=60, metavar="N",
+                    help="configurations sampled for the first rung (default: 60)")
+parser.add_argument("--search-tolerance", type=float, default=0.02, metavar="ACC",
+                    help="CV accuracy the recommended (fastest) finalist may give up (default: 0.02)")
+parser.add_argument(
+    "--prune", action="store_true",
+    help="sweep chi2 / min_df vocabulary sizes for the best single model and save model/classifier_pruned.pkl"
+)
+parser.add_argument("--prune-tolerance", type=float, default=0.01, metavar="ACC",
+                    help="accuracy the pruned model may give up (default: 0.01)")
+args = parser.parse_args()
+
+# Pipelines with identical TF-IDF settings fitted on identical rows (the same
+# CV fold, the ensembles' refits) load the fitted vectorizer from this cache
+memory = Memory(args.cache_dir, verbose=0) if args.cache_dir else None
+
+stage_times = {}
+_stage_start = time.perf_counter()
+
+
+def end_stage(name):
+    """Record the wall-clock seconds since the previous stage ended under ``name``."""
+    global _stage_start
+    now = time.perf_counter()
+    stage_times[name] = stage_times.get(name, 0.0) + now - _stage_start
+    _stage_start = now
+
+
+def detach_memory(model):
+    """Drop the training cache from fitted pipelines so the pickle does not reference it."""
+    pipelines = [model, *getattr(model, 'estimators_', [])]
+    pipelines += [estimator for _, estimator in getattr(model, 'estimators', [])]
+    for pipeline in pipelines:
+        if isinstance(pipeline, Pipeline):
+            pipeline.memory = None
+
+
+def measure_latency(model, texts):
+    """Per-complaint predict latency (one text per call, as in the app), in milliseconds."""
+    timings = []
+    for text in texts:
+        start = time.perf_counter()
+        model.predict([text])
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'mean_ms': float(np.mean(timings)),
+        'p99_ms': float(np.percentile(timings, 99))
+    }
+
+
+def validation_split(X_train, y_train, size):
+    """
+    Stratified fit/validation split of the training data.
+
+    Thresholds and variants are chosen on the validation part, so the test
+    split is only used to report the result.
+
+    Returns:
+        tuple: (X_fit, X_val, y_fit, y_val)
+    """
+    return train_test_split(X_train, y_train, test_size=size, random_state=42, stratify=y_train)
+
+
+def choose_cascade_threshold(confidence, fast_pred, fallback_pred, y_true, min_accuracy):
+    """
+    Lowest confidence threshold (fewest escalations) whose cascade accuracy is at least ``min_accuracy``.
+
+    Every distinct fast-model confidence is a candidate; escalating everything
+    (threshold above 1) is the last resort and matches the fallback's accuracy.
+
+    Returns:
+        tuple: (threshold, cascade accuracy, escalation rate)
+    """
+    correct_fast = np.asarray(fast_pred) == np.asarray(y_true)
+    correct_fallback = np.asarray(fallback_pred) == np.asarray(y_true)
+    for threshold in [*np.unique(confidence), 1.0 + 1e-9]:
+        escalated = confidence < threshold
+        accuracy = float(np.mean(np.where(escalated, correct_fallback, correct_fast)))
+        if accuracy >= min_accuracy:
+            return float(threshold), accuracy, float(np.mean(escalated))
+    return float(threshold), accuracy, float(np.mean(escalated))
+
+
+def pruned_variants(pipeline, X_train, y_train, fractions=(0.05, 0.1, 0.25, 0.5, 0.75), min_dfs=(2, 3, 5)):
+    """
+    Smaller-vocabulary, unfitted copies of a fitted TF-IDF pipeline.
+
+    chi² variants keep the given fraction of terms most associated with the
+    categories (scored on the fitted vectorizer's training matrix) as a fixed
+    vocabulary; min_df variants drop terms seen in fewer than ``min_df``
+    training complaints.
+
+    Returns:
+        list: (label, Pipeline) pairs
+    """
+    tfidf, clf = pipeline.steps[0][1], pipeline.steps[-1][1]
+    params = tfidf.get_params()
+    scores, _ = chi2(tfidf.transform(X_train), y_train)
+    terms = tfidf.get_feature_names_out()
+    ranked = terms[np.argsort(-np.nan_to_num(scores), kind='stable')]
+
+    variants = []
+    for fraction in fractions:
+        k = max(1, int(len(terms) * fraction))
+        vocabulary = {term: i for i, term in enumerate(sorted(ranked[:k]))}
+        variants.append((f"chi2 top {k}", Pipeline([
+            ('tfidf', TfidfVectorizer(**{**params, 'vocabulary': vocabulary})),
+            ('clf', clone(clf))
+        ])))
+    for min_df in min_dfs:
+        variants.append((f"min_df={min_df}", Pipeline([
+            ('tfidf', TfidfVectorizer(**{**params, 'min_df': min_df})),
+            ('clf', clone(clf))
+        ])))
+    return variants
+
+
+def export_numpy_model(model, path, allow_partial=False):
+    """
+    Export linear TF-IDF members to the memory-mappable NumPy artifact (see numpy_model.py).
+
+    Logistic Regression, Linear SVM and Naive Bayes members are exported as
+    weight matrices. Other members (tree ensembles) cannot be, and the vote
+    without them no longer matches the ensemble, so the export is refused
+    unless ``allow_partial`` is set. Skipped members are listed in the manifest.
+
+    Returns:
+        tuple: (exported member names, skipped member names)
+    """
+    if isinstance(model, VotingClassifier) and model.voting == 'hard':
+        named = list(zip([name for name, _ in model.estimators], model.estimators_))
+        classes = model.le_.classes_
+        member_classes = np.arange(len(classes))
+    elif isinstance(model, Pipeline):
+        named = [("model", model)]
+        classes = model.classes_
+        member_classes = classes
+    else:
+        raise TypeError(f"Cannot export {type(model).__name__}")
+
+    exported, skipped = [], []
+    for name, pipeline in named:
+        tfidf, clf = pipeline.steps[0][1], pipeline.steps[-1][1]
+        if isinstance(clf, MultinomialNB):
+            coef, intercept = clf.feature_log_prob_, clf.class_log_prior_
+        elif isinstance(clf, (LogisticRegression, LinearSVC)) and clf.coef_.shape[0] > 1:
+            coef, intercept = clf.coef_, clf.intercept_
+        else:
+            skipped.append(name)
+            continue
+        if not np.array_equal(clf.classes_, member_classes):
+            raise ValueError(f"{name} was trained on a different label set")
+        exported.append((name, tfidf, coef, intercept))
+    if not exported:
+        raise ValueError("No linear members to export")
+    if skipped and not allow_partial:
+        raise ValueError(f"{', '.join(skipped)} cannot be exported and would be left out of the vote "
+                         "(pass --numpy-allow-partial to export the linear members anyway)")
+
+    reference = exported[0][1]
+    for _, tfidf, _, _ in exported:
+        if tfidf.analyzer != 'word' or tfidf.strip_accents or tfidf.preprocessor or tfidf.tokenizer:
+            raise ValueError("Only the default word analyzer can be exported")
+        if (tfidf.lowercase, tfidf.token_pattern, tfidf.get_stop_words()) != \
+                (reference.lowercase, reference.token_pattern, reference.get_stop_words()):
+            raise ValueError("Members must share tokenizer settings")
+
+    terms = sorted({term.encode('utf-8') for _, tfidf, _, _ in exported for term in tfidf.vocabulary_})
+    index = {term: i for i, term in enumerate(terms)}
+    vocab = np.array(terms, dtype=f"S{max(len(term) for term in terms)}")
+
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, "vocab.npy"), vocab)
+    members = []
+    for i, (name, tfidf, coef, intercept) in enumerate(exported):
+        columns = np.full(len(vocab), -1, dtype=np.int32)
+        for term, column in tfidf.vocabulary_.items():
+            columns[index[term.encode('utf-8')]] = column
+        np.save(os.path.join(path, f"member{i}_columns.npy"), columns)
+        if tfidf.use_idf:
+            np.save(os.path.join(path, f"member{i}_idf.npy"), tfidf.idf_)
+        np.save(os.path.join(path, f"member{i}_coef.npy"), np.ascontiguousarray(coef.T))
+        np.save(os.path.join(path, f"member{i}_intercept.npy"), np.asarray(intercept, dtype=np.float64))
+        members.append({
+            'name': name,
+            'use_idf': bool(tfidf.use_idf),
+            'sublinear_tf': bool(tfidf.sublinear_tf),
+            'norm': tfidf.norm
+        })
+
+    stop_words = reference.get_stop_words()
+    manifest = {
+        'classes': [str(label) for label in classes],
+        'lowercase': bool(reference.lowercase),
+        'token_pattern': reference.token_pattern,
+        'stop_words': sorted(stop_words) if stop_words else None,
+        'ngram_range': [
+            min(tfidf.ngram_range[0] for _, tfidf, _, _ in exported),
+            max(tfidf.ngram_range[1] for _, tfidf, _, _ in exported)
+        ],
+        'weights': [1.0] * len(members),
+        'members': members,
+        'skipped_members': skipped
+    }
+    with open(os.path.join(path, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=4)
+
+    return [name for name, _, _, _ in exported], skipped
+
+
+def measure_cold_start(load_statement, path):
+    """Load a model and predict once in a fresh interpreter; returns (seconds, peak RSS in MB)."""
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{load_statement}\n"
+        "model.predict(['Water supply has been disrupted in our area'])\n"
+        "elapsed = time.perf_counter() - start\n"
+        # VmHWM rather than ru_maxrss, which carries over the parent's peak across exec
+        "peak = next(line for line in open('/proc/self/status') if line.startswith('VmHWM'))\n"
+        "print(elapsed, peak.split()[1])\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code, path], capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    ).stdout.split()
+    return float(output[0]), int(output[1]) / 1024
+
+
+if args.streaming:
+    print("="*60)
+    print("AI Grievance Classification - Streaming Training")
+    print("="*60)
+
+    if args.source == "db":
+        from database import GrievanceDatabase
+        db_path = os.getenv('DATABASE_PATH', 'data/grievances.db')
+        db = GrievanceDatabase(db_path)
+        make_chunks = lambda: iter_db_chunks(db, args.chunk_size)
+        print(f"\nStreaming complaints table from {db_path} in chunks of {args.chunk_size}...")
+    else:
+        make_chunks = lambda: iter_csv_chunks("data/cleaned_data.csv", args.chunk_size)
+        print(f"\nStreaming data/cleaned_data.csv in chunks of {args.chunk_size}...")
+
+    start = time.perf_counter()
+    streaming_model, streaming_report = train_streaming(
+        make_chunks, kind=args.streaming_model, holdout=args.holdout, epochs=args.epochs
+    )
+    streaming_report['training_seconds'] = time.perf_counter() - start
+    streaming_report['source'] = args.source
+    streaming_report['training_date'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    print(f"   ✓ Classes: {len(streaming_report['classes'])}")
+    print(f"   ✓ Trained on {streaming_report['training_rows']} rows x {args.epochs} epoch(s), "
+          f"held out {streaming_report['holdout_rows']}")
+    if streaming_report['holdout_accuracy'] is not None:
+        print(f"   ✓ Holdout accuracy: {streaming_report['holdout_accuracy']:.4f}")
+    print(f"   ✓ Time: {streaming_report['training_seconds']:.1f}s")
+
+    joblib.dump(streaming_model, "model/classifier_streaming.pkl")
+    with open("model/streaming_metadata.json", 'w') as f:
+        json.dump(streaming_report, f, indent=4)
+    print("   ✓ Saved: model/classifier_streaming.pkl, model/streaming_metadata.json")
+    sys.exit(0)
+
 print("="*60)
 print("AI Grievance Classification - Ultra-Optimized Training")
 print("="*60)
@@ -35,6 +371,76 @@ X_train, X_test, y_train, y_test = train_test_split(
 )
 print(f"   ✓ Training samples: {len(X_train)}")
 print(f"   ✓ Testing samples: {len(X_test)}\n")
+end_stage("Load and split data")
+
+if args.search:
+    print(f"Searching {args.search_candidates} configurations by successive halving "
+          f"(budget {args.budget:.0f}s)...")
+    search = successive_halving(
+        X_train, y_train, budget=args.budget, n_candidates=args.search_candidates,
+        n_jobs=args.n_jobs, memory=memory
+    )
+    for rung in search['rungs']:
+        best = next(iter(rung['scores'].values()))
+        print(f"   ✓ Rung {rung['rung']}: {rung['evaluated']} configs on {rung['n_samples']} samples, "
+              f"best CV accuracy {best['cv_accuracy']:.4f}")
+    if search['stopped_early']:
+        print("   ⚠ Budget exhausted, ranking the configurations evaluated so far")
+    if not search['finalists']:
+        print("   ✗ Budget too small to evaluate any configuration")
+        sys.exit(1)
+
+    # Finalists are ranked by their last-rung CV accuracy on the training data;
+    # test accuracy is measured for the report only
+    print("\nMeasuring finalists (per-complaint latency; test accuracy for reporting only)...")
+    final_scores = search['rungs'][-1]['scores']
+    finalists = []
+    for index in search['finalists']:
+        config = search['candidates'][index]
+        candidate = build_pipeline(config).fit(X_train, y_train)
+        cv_accuracy = final_scores[str(index)]['cv_accuracy']
+        accuracy = float(accuracy_score(y_test, candidate.predict(X_test)))
+        latency = measure_latency(candidate, list(X_test))
+        finalists.append({
+            'candidate': index,
+            **config,
+            'cv_accuracy': cv_accuracy,
+            'test_accuracy': accuracy,
+            'latency': latency,
+            'accuracy_per_ms': cv_accuracy / latency['mean_ms'],
+            'model': candidate
+        })
+        print(f"   {config['family']:<20} CV {cv_accuracy:.4f}   test {accuracy:.4f}   "
+              f"{latency['mean_ms']:7.2f} ms/complaint   {cv_accuracy / latency['mean_ms']:.3f} CV acc/ms")
+
+    best_accuracy = max(finalist['cv_accuracy'] for finalist in finalists)
+    recommended = min(
+        (finalist for finalist in finalists if finalist['cv_accuracy'] >= best_accuracy - args.search_tolerance),
+        key=lambda finalist: finalist['latency']['mean_ms']
+    )
+    best_per_latency = max(finalists, key=lambda finalist: finalist['accuracy_per_ms'])
+    print(f"\n   ✓ Recommended (fastest within {args.search_tolerance:.2f} of best CV accuracy): "
+          f"{recommended['family']}, CV {recommended['cv_accuracy']:.4f}, test {recommended['test_accuracy']:.4f} "
+          f"at {recommended['latency']['mean_ms']:.2f} ms")
+
+    joblib.dump(recommended['model'], "model/classifier_search.pkl")
+    for finalist in finalists:
+        del finalist['model']
+    with open("model/search_results.json", 'w') as f:
+        json.dump({
+            'search_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'budget_seconds': args.budget,
+            'elapsed_seconds': search['elapsed'],
+            'stopped_early': search['stopped_early'],
+            'candidates': search['candidates'],
+            'rungs': search['rungs'],
+            'finalists': finalists,
+            'selection_metric': 'cv_accuracy',
+            'recommended': recommended['candidate'],
+            'best_accuracy_per_ms': best_per_latency['candidate']
+        }, f, indent=4)
+    print("   ✓ Saved: model/classifier_search.pkl, model/search_results.json")
+    sys.exit(0)
 
 # Ultra-optimized TF-IDF parameters (even more aggressive)
 print("[3/9] Configuring ultra-optimized feature extraction...")
@@ -108,6 +514,8 @@ models = {
         ))
     ])
 }
+for pipeline in models.values():
+    pipeline.set_params(memory=memory)
 print(f"   ✓ Initialized {len(models)} ultra-optimized models\n")
 
 best_model = None
@@ -122,9 +530,11 @@ for name, model in models.items():
     print(f"\n   Training {name}...")
     try:
         model.fit(X_train, y_train)
+        end_stage(f"{name}: fit")
         
         # Extended cross-validation
-        cv_scores = cross_val_score(model, X_train, y_train, cv=skf, scoring='accuracy')
+        cv_scores = cross_val_score(model, X_train, y_train, cv=skf, scoring='accuracy', n_jobs=args.n_jobs)
+        end_stage(f"{name}: 15-fold CV")
         
         # Test predictions
         y_pred = model.predict(X_test)
@@ -159,22 +569,25 @@ for model_name, results in top_models:
 estimators = [(name, models[name]) for name, _ in top_models]
 
 # Try voting classifier first
-voting_clf = VotingClassifier(estimators=estimators, voting='hard')
+voting_clf = VotingClassifier(estimators=estimators, voting='hard', n_jobs=args.n_jobs)
 print(f"\n   Training voting ensemble...")
 voting_clf.fit(X_train, y_train)
 voting_score = voting_clf.score(X_test, y_test)
 print(f"   ✓ Voting Ensemble Accuracy: {voting_score:.4f}")
+end_stage("Voting ensemble")
 
 # Try stacking classifier
 stacking_clf = StackingClassifier(
     estimators=estimators,
     final_estimator=LogisticRegression(max_iter=5000, C=5.0, random_state=42),
-    cv=10
+    cv=10,
+    n_jobs=args.n_jobs
 )
 print(f"\n   Training stacking ensemble...")
 stacking_clf.fit(X_train, y_train)
 stacking_score = stacking_clf.score(X_test, y_test)
 print(f"   ✓ Stacking Ensemble Accuracy: {stacking_score:.4f}")
+end_stage("Stacking ensemble (10-fold)")
 
 # Select best ensemble
 ensemble_score = max(voting_score, stacking_score)
@@ -206,10 +619,241 @@ print(f"      Accuracy: {final_score*100:.2f}%")
 y_pred = final_model.predict(X_test)
 print("\n   Classification Report:")
 print(classification_report(y_test, y_pred))
+end_stage("Final evaluation")
+
+# Inference-optimised artifact
+fast_inference_report = None
+if args.fast_inference:
+    print("\nBuilding inference-optimised artifact (shared n-gram analysis)...")
+    try:
+        fast_model = SharedNgramEnsemble(final_model)
+    except (TypeError, ValueError) as e:
+        print(f"   ✗ Skipped: {str(e)}")
+    else:
+        test_texts = list(X_test)
+        original_pred = final_model.predict(test_texts)
+        fast_pred = fast_model.predict(test_texts)
+        original_latency = measure_latency(final_model, test_texts)
+        fast_latency = measure_latency(fast_model, test_texts)
+
+        fast_inference_report = {
+            'artifact': 'model/classifier_fast.pkl',
+            'prediction_agreement': float(np.mean(original_pred == fast_pred)),
+            'original_accuracy': float(accuracy_score(y_test, original_pred)),
+            'fast_accuracy': float(accuracy_score(y_test, fast_pred)),
+            'original_latency': original_latency,
+            'fast_latency': fast_latency,
+            'speedup': original_latency['mean_ms'] / fast_latency['mean_ms']
+        }
+        print(f"   ✓ Prediction agreement: {fast_inference_report['prediction_agreement']*100:.2f}%")
+        print(f"   ✓ Accuracy: {fast_inference_report['original_accuracy']:.4f} (pickle) vs "
+              f"{fast_inference_report['fast_accuracy']:.4f} (fast)")
+        print(f"   ✓ Latency mean/p99: {original_latency['mean_ms']:.2f}/{original_latency['p99_ms']:.2f} ms (pickle) vs "
+              f"{fast_latency['mean_ms']:.2f}/{fast_latency['p99_ms']:.2f} ms (fast)")
+        print(f"   ✓ Speed-up: {fast_inference_report['speedup']:.1f}x")
+
+        joblib.dump(fast_model, "model/classifier_fast.pkl")
+        print("   ✓ Saved: model/classifier_fast.pkl")
+    end_stage("Fast-inference artifact")
+
+# Confidence-gated cascade
+cascade_report = None
+if args.cascade:
+    print("\nBuilding cascade classifier (calibrated Linear SVM -> ensemble)...")
+    cascade_fallback = fast_model if fast_inference_report else final_model
+    calibrated_svm = Pipeline([
+        ('tfidf', TfidfVectorizer(**tfidf_ultra)),
+        ('clf', CalibratedClassifierCV(
+            LinearSVC(C=5.0, max_iter=15000, class_weight='balanced', dual=False, tol=1e-4, random_state=42),
+            method='sigmoid',
+            cv=5
+        ))
+    ], memory=memory)
+
+    # Choose the threshold on a validation split of the training data, with
+    # both stages refitted on the rest of it; the test split only reports
+    X_fit, X_val, y_fit, y_val = validation_split(X_train, y_train, args.validation_size)
+    val_texts = list(X_val)
+    val_svm = clone(calibrated_svm).fit(X_fit, y_fit)
+    val_proba = val_svm.predict_proba(val_texts)
+    val_fallback_pred = clone(final_model).fit(X_fit, y_fit).predict(val_texts)
+    threshold, validation_accuracy, _ = choose_cascade_threshold(
+        val_proba.max(axis=1), val_svm.classes_.take(np.argmax(val_proba, axis=1)), val_fallback_pred, y_val,
+        min_accuracy=accuracy_score(y_val, val_fallback_pred) - args.cascade_tolerance
+    )
+
+    calibrated_svm.fit(X_train, y_train)
+    test_texts = list(X_test)
+    proba = calibrated_svm.predict_proba(test_texts)
+    escalated = proba.max(axis=1) < threshold
+    fast_only_pred = calibrated_svm.classes_.take(np.argmax(proba, axis=1))
+    fallback_pred = cascade_fallback.predict(test_texts)
+    cascade_accuracy = float(accuracy_score(y_test, np.where(escalated, fallback_pred, fast_only_pred)))
+    escalation_rate = float(np.mean(escalated))
+
+    cascade_model = CascadeClassifier(calibrated_svm, cascade_fallback, threshold)
+    fallback_latency = measure_latency(cascade_fallback, test_texts)
+    cascade_latency = measure_latency(cascade_model, test_texts)
+
+    cascade_report = {
+        'artifact': 'model/classifier_cascade.pkl',
+        'fast_model': 'Linear SVM (sigmoid-calibrated, 5-fold)',
+        'threshold': threshold,
+        'tolerance': args.cascade_tolerance,
+        'validation_size': args.validation_size,
+        'validation_accuracy': validation_accuracy,
+        'escalation_rate': escalation_rate,
+        'fast_model_accuracy': float(accuracy_score(y_test, fast_only_pred)),
+        'fallback_accuracy': float(accuracy_score(y_test, fallback_pred)),
+        'cascade_accuracy': cascade_accuracy,
+        'fallback_latency': fallback_latency,
+        'cascade_latency': cascade_latency
+    }
+    print(f"   ✓ Threshold: {threshold:.3f}, chosen on {len(X_val)} validation complaints "
+          f"(cascade accuracy {validation_accuracy:.4f} there)")
+    print(f"   ✓ Escalates {escalation_rate*100:.1f}% of test complaints")
+    print(f"   ✓ Accuracy: {cascade_report['fast_model_accuracy']:.4f} (SVM alone), "
+          f"{cascade_report['fallback_accuracy']:.4f} (ensemble), {cascade_accuracy:.4f} (cascade)")
+    print(f"   ✓ Latency mean/p99: {fallback_latency['mean_ms']:.2f}/{fallback_latency['p99_ms']:.2f} ms (ensemble) vs "
+          f"{cascade_latency['mean_ms']:.2f}/{cascade_latency['p99_ms']:.2f} ms (cascade)")
+
+    detach_memory(calibrated_svm)
+    detach_memory(cascade_fallback)
+    joblib.dump(cascade_model, "model/classifier_cascade.pkl")
+    print("   ✓ Saved: model/classifier_cascade.pkl")
+    end_stage("Cascade classifier")
+
+# Vocabulary pruning
+pruning_report = None
+if args.prune and isinstance(best_model, Pipeline):
+    print(f"\nPruning the vocabulary of {best_model_name}...")
+    test_texts = list(X_test)
+
+    def describe(label, model):
+        tfidf = model.steps[0][1]
+        start = time.perf_counter()
+        for text in test_texts:
+            tfidf.transform([text])
+        return {
+            'variant': label,
+            'vocabulary_size': len(tfidf.vocabulary_),
+            'size_mb': len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)) / 2**20,
+            'transform_ms': (time.perf_counter() - start) / len(test_texts) * 1000,
+            'predict_latency': measure_latency(model, test_texts),
+            'accuracy': float(accuracy_score(y_test, model.predict(X_test))),
+            'model': model
+        }
+
+    # Choose on a validation split of the training data: every variant is
+    # built and fitted on the rest of it, the test split only reports
+    X_fit, X_val, y_fit, y_val = validation_split(X_train, y_train, args.validation_size)
+    fit_model = clone(best_model).fit(X_fit, y_fit)
+    candidates = [fit_model] + [variant.fit(X_fit, y_fit) for _, variant in pruned_variants(fit_model, X_fit, y_fit)]
+    validation_accuracy = [float(accuracy_score(y_val, model.predict(X_val))) for model in candidates]
+
+    detach_memory(best_model)
+    variants = [describe("full vocabulary", best_model)]
+    for label, variant in pruned_variants(best_model, X_train, y_train):
+        variants.append(describe(label, variant.fit(X_train, y_train)))
+    for row, accuracy in zip(variants, validation_accuracy):
+        row['validation_accuracy'] = accuracy
+
+    print(f"   {'Variant':<18}{'Terms':>8}{'Size MB':>10}{'Transform ms':>14}{'Predict ms':>12}"
+          f"{'Val acc':>10}{'Test acc':>10}")
+    for row in variants:
+        print(f"   {row['variant']:<18}{row['vocabulary_size']:>8}{row['size_mb']:>10.2f}"
+              f"{row['transform_ms']:>14.3f}{row['predict_latency']['mean_ms']:>12.3f}"
+              f"{row['validation_accuracy']:>10.4f}{row['accuracy']:>10.4f}")
+
+    full = variants[0]
+    smallest = min(
+        (row for row in variants
+         if row['validation_accuracy'] >= full['validation_accuracy'] - args.prune_tolerance),
+        key=lambda row: row['size_mb']
+    )
+    joblib.dump(smallest['model'], "model/classifier_pruned.pkl")
+    for row in variants:
+        del row['model']
+    pruning_report = {
+        'artifact': 'model/classifier_pruned.pkl',
+        'base_model': best_model_name,
+        'tolerance': args.prune_tolerance,
+        'validation_size': args.validation_size,
+        'selected': smallest['variant'],
+        'variants': variants
+    }
+    print(f"   ✓ Smallest within {args.prune_tolerance:.2f} validation accuracy: {smallest['variant']} "
+          f"({smallest['size_mb']:.2f} MB vs {full['size_mb']:.2f} MB, "
+          f"test accuracy {smallest['accuracy']:.4f} vs {full['accuracy']:.4f})")
+    print("   ✓ Saved: model/classifier_pruned.pkl")
+    end_stage("Vocabulary pruning")
+elif args.prune:
+    print("\n   ✗ Pruning skipped: the best single model is not a TF-IDF pipeline")
 
 # Save model and metadata
 print("\nSaving final model...")
+detach_memory(final_model)
 joblib.dump(final_model, "model/classifier.pkl")
+end_stage("Save model")
+
+# sklearn-free NumPy artifact
+numpy_export_report = None
+if args.export_numpy:
+    numpy_path = "model/classifier_numpy"
+    print(f"\nExporting NumPy artifact to {numpy_path}/...")
+    try:
+        exported, skipped = export_numpy_model(final_model, numpy_path, args.numpy_allow_partial)
+    except (TypeError, ValueError) as e:
+        print(f"   ✗ Skipped: {str(e)}")
+    else:
+        print(f"   ✓ Exported members: {', '.join(exported)}")
+        if skipped:
+            print(f"   ⚠ Not linear, left out of the NumPy vote: {', '.join(skipped)}")
+
+        numpy_model = NumpyLinearModel(numpy_path)
+        numpy_pred = numpy_model.predict(list(X_test))
+        agreement = float(np.mean(numpy_pred == final_model.predict(X_test)))
+        agreement_all = float(np.mean(numpy_model.predict(list(X)) == final_model.predict(X)))
+        # Keep the measured parity with the artifact, where the app can see it
+        manifest_path = os.path.join(numpy_path, MANIFEST_FILE)
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        manifest['prediction_agreement'] = agreement
+        manifest['prediction_agreement_all'] = agreement_all
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=4)
+        pickle_time, pickle_rss = measure_cold_start(
+            "import joblib, sys; model = joblib.load(sys.argv[1])", "model/classifier.pkl"
+        )
+        numpy_time, numpy_rss = measure_cold_start(
+            "import sys; from numpy_model import NumpyLinearModel; model = NumpyLinearModel(sys.argv[1])",
+            numpy_path
+        )
+        artifact_bytes = sum(
+            os.path.getsize(os.path.join(numpy_path, name)) for name in os.listdir(numpy_path)
+        )
+
+        numpy_export_report = {
+            'artifact': numpy_path,
+            'members': exported,
+            'skipped_members': skipped,
+            'size_mb': artifact_bytes / 2**20,
+            'pickle_size_mb': os.path.getsize("model/classifier.pkl") / 2**20,
+            'accuracy': float(accuracy_score(y_test, numpy_pred)),
+            'prediction_agreement': agreement,
+            'prediction_agreement_all': agreement_all,
+            'pickle_cold_start_s': pickle_time,
+            'numpy_cold_start_s': numpy_time,
+            'pickle_peak_rss_mb': pickle_rss,
+            'numpy_peak_rss_mb': numpy_rss
+        }
+        print(f"   ✓ Size: {numpy_export_report['size_mb']:.1f} MB "
+              f"(pickle {numpy_export_report['pickle_size_mb']:.1f} MB)")
+        print(f"   ✓ Accuracy: {numpy_export_report['accuracy']:.4f}, "
+              f"agreement with pickle: {agreement*100:.2f}% (test), {agreement_all*100:.2f}% (all data)")
+        print(f"   ✓ Cold start: {pickle_time:.2f}s (joblib) vs {numpy_time:.2f}s (NumPy)")
+        print(f"   ✓ Peak RSS: {pickle_rss:.0f} MB (joblib) vs {numpy_rss:.0f} MB (NumPy, mmap)")
+    end_stage("NumPy export")
 
 metadata = {
     'model_name': final_model_name,
@@ -231,6 +875,29 @@ metadata = {
     'cv_strategy': 'StratifiedKFold-15',
     'optimization_level': 'Ultra'
 }
+if fast_inference_report:
+    metadata['fast_inference'] = fast_inference_report
+if numpy_export_report:
+    metadata['numpy_export'] = numpy_export_report
+if cascade_report:
+    metadata['cascade'] = cascade_report
+if pruning_report:
+    metadata['pruning'] = pruning_report
+metadata['stage_seconds'] = stage_times
+
+# model/classifier.pkl is now a batch model that has seen none of the
+# complaints retrain.py learnt from: keep the version counter rising and
+# reset the retrain watermark explicitly (retrain.py then asks for --bootstrap)
+try:
+    with open('model/model_metadata.json') as f:
+        previous_metadata = json.load(f)
+except (OSError, ValueError):
+    previous_metadata = {}
+metadata['model_version'] = int(previous_metadata.get('model_version', 0)) + 1
+metadata['training_watermark'] = 0
+if previous_metadata.get('training_watermark'):
+    print(f"   ⚠ Replaced a retrained model (watermark {previous_metadata['training_watermark']}); "
+          "run retrain.py --bootstrap before the next incremental update")
 
 with open('model/model_metadata.json', 'w') as f:
     json.dump(metadata, f, indent=4)
@@ -238,6 +905,11 @@ with open('model/model_metadata.json', 'w') as f:
 print(f"   ✓ Model saved: model/classifier.pkl")
 print(f"   ✓ Metadata saved: model/model_metadata.json")
 
+print("\nWall-clock time per stage:")
+for stage, seconds in stage_times.items():
+    print(f"   {stage:<45} {seconds:8.1f}s")
+print(f"   {'Total':<45} {sum(stage_times.values()):8.1f}s")
+
 print("\n" + "="*60)
 print("✅ Ultra-Optimized Training Completed!")
 print(f"   Final Model: {final_model_name}")
@@ -2,19 +2,27 @@
 Utility Functions Module
 
 Provides helper functions for the AI Grievance Redressal System including:
-- Priority detection based on keyword analysis
+- Priority detection based on keyword analysis (single-pass compiled matcher)
 - Department mapping for categories
-- Sentiment analysis using NLTK VADER
+- Sentiment analysis using NLTK VADER (shared analyzer, memoised, batched)
 - Keyword extraction from complaints
 - Resolution time estimation
-- Ticket ID generation
+- Ticket ID generation (collision-free, time-ordered)
 
 Author: Debasis Behera
 """
 
+import os
 import re
-from datetime import datetime
+import secrets
+import threading
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
 import nltk
+import pandas as pd
 from collections import Counter
 
 # Download required NLTK data (run once)
@@ -30,24 +38,19 @@ except:
     SENTIMENT_AVAILABLE = False
 
 
-def get_priority(text):
-    """Determine complaint priority based on keywords and urgency."""
-    if not text or not isinstance(text, str):
-        return "Low"
-    
-    text = text.lower().strip()
-    
+# Priority keyword tiers, from most to least urgent. A text gets the first
+# tier with any keyword occurring in it as a substring, otherwise "Low".
+PRIORITY_KEYWORDS = {
     # Critical keywords (life-threatening, immediate danger)
-    critical_keywords = [
+    "Critical": [
         "emergency", "life threatening", "critical", "danger", "death",
         "fire", "collapse", "explosion", "injury", "bleeding",
         "attack", "severe", "crisis", "urgent attention", "urgent",
         "suffering", "ambulance stuck", "fire hazard", "fire risk",
         "posing serious danger", "critical emergency", "life", "patient"
-    ]
-    
+    ],
     # High priority keywords (health/safety risks, major disruptions)
-    high_keywords = [
+    "High": [
         "hospital", "broken", "damaged", "leak", "flooding",
         "contaminated", "unsafe", "risk", "hazard", "exposed",
         "pollution", "very high", "very low", "industrial", "health", "medical",
@@ -56,34 +59,139 @@ def get_priority(text):
         "affecting", "insufficient", "lacks", "abandoned", "creating nuisance",
         "stuck", "malfunctioning", "outage", "tilted dangerously", "dilapidated",
         "posing risk", "fire safety", "open manhole", "respiratory problems"
-    ]
-    
+    ],
     # Medium priority keywords (service quality, maintenance)
-    medium_keywords = [
+    "Medium": [
         "problem", "issue", "concern", "need", "needs", "require",
         "poor", "inadequate", "delayed", "not working", "irregular", 
         "missing", "pending", "slow", "very poor", "not maintained",
         "not available", "not functioning", "not responding", "not clear",
         "difficult", "inconvenience", "overcrowded", "excessive", "unclear",
         "rude", "improper", "limited", "complicated", "frequently", "outdated"
-    ]
+    ],
+}
+
+
+class PriorityMatcher:
+    """
+    Single-pass priority keyword matcher.
+    
+    All keywords are compiled once into one trie-shaped regex, so the engine
+    walks shared prefixes only once and reports the longest keyword at each
+    start position. Any other keyword at that position is a prefix of the
+    reported one, so its tier and the prefixes it implies are precomputed per
+    keyword. Resuming the scan one character after each match start keeps
+    overlapping keywords visible, reproducing the tiered substring checks exactly.
+    
+    Args:
+        tiers (dict): Priority label -> keyword list, most urgent first
+        default (str): Label returned when no keyword occurs
+    """
+    
+    def __init__(self, tiers, default="Low"):
+        self.labels = list(tiers) + [default]
+        self.default = default
+        
+        rank = {}
+        for level, keywords in enumerate(tiers.values()):
+            for keyword in keywords:
+                rank.setdefault(keyword, level)
+        
+        self._pattern = re.compile(self._trie_pattern(rank))
+        self._implied = {
+            keyword: tuple(k for k in rank if keyword.startswith(k))
+            for keyword in rank
+        }
+        self._level = {
+            keyword: min(rank[k] for k in implied)
+            for keyword, implied in self._implied.items()
+        }
+    
+    @staticmethod
+    def _trie_pattern(keywords):
+        """Build a regex whose alternations branch on one character at a time."""
+        trie = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}
+        
+        def build(node):
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ""
+            pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+            # Greedy optional suffix: longer keywords win over their prefixes
+            return f"(?:{pattern})?" if "" in node else pattern
+        
+        return build(trie)
     
-    # Check for critical (highest priority)
-    for keyword in critical_keywords:
-        if keyword in text:
-            return "Critical"
+    def _scan(self, text):
+        text = text.lower()
+        search = self._pattern.search
+        found = search(text)
+        while found:
+            yield found.group()
+            found = search(text, found.start() + 1)
     
-    # Check for high priority
-    for keyword in high_keywords:
-        if keyword in text:
-            return "High"
+    def match(self, text):
+        """
+        Classify one text and report the keywords that fired.
+        
+        Returns:
+            tuple: (priority label, list of matched keywords in order of appearance)
+        """
+        if not text or not isinstance(text, str):
+            return self.default, []
+        
+        best = len(self.labels) - 1
+        matched = {}
+        for keyword in self._scan(text):
+            best = min(best, self._level[keyword])
+            for implied in self._implied[keyword]:
+                matched.setdefault(implied, None)
+        return self.labels[best], list(matched)
     
-    # Check for medium priority
-    for keyword in medium_keywords:
-        if keyword in text:
-            return "Medium"
+    def priority(self, text):
+        """Classify one text, stopping at the first top-tier keyword."""
+        if not text or not isinstance(text, str):
+            return self.default
+        
+        best = len(self.labels) - 1
+        for keyword in self._scan(text):
+            best = min(best, self._level[keyword])
+            if best == 0:
+                break
+        return self.labels[best]
+
+
+_PRIORITY_MATCHER = PriorityMatcher(PRIORITY_KEYWORDS)
+
+
+def get_priority(text):
+    """Determine complaint priority based on keywords and urgency."""
+    return _PRIORITY_MATCHER.priority(text)
+
+
+def match_priority(text):
+    """Determine complaint priority and return it with the keywords that triggered it."""
+    return _PRIORITY_MATCHER.match(text)
+
+
+def get_priority_batch(texts):
+    """
+    Determine priorities for many complaints.
     
-    return "Low"
+    Args:
+        texts (list or pd.Series): Complaint texts
+        
+    Returns:
+        list or pd.Series: Priority labels, a Series aligned to the input index if given one
+    """
+    if isinstance(texts, pd.Series):
+        return texts.map(_PRIORITY_MATCHER.priority)
+    return [_PRIORITY_MATCHER.priority(text) for text in texts]
 
 
 def get_department(category):
@@ -99,6 +207,42 @@ def get_department(category):
     return mapping.get(category, "General Administration")
 
 
+_ANALYZER = None
+_ANALYZER_LOCK = threading.Lock()
+
+
+def get_sentiment_analyzer():
+    """Return the shared VADER analyzer, loading its lexicon on first use."""
+    global _ANALYZER
+    if _ANALYZER is None:
+        with _ANALYZER_LOCK:
+            if _ANALYZER is None:
+                _ANALYZER = SentimentIntensityAnalyzer()
+    return _ANALYZER
+
+
+@lru_cache(maxsize=4096)
+def _sentiment_scores(text):
+    """Memoised sentiment for whitespace-normalised text."""
+    scores = get_sentiment_analyzer().polarity_scores(text)
+    compound = scores['compound']
+    
+    if compound >= 0.05:
+        label = "Positive"
+    elif compound <= -0.05:
+        label = "Negative"
+    else:
+        label = "Neutral"
+    
+    return {
+        "label": label,
+        "score": round(compound, 3),
+        "positive": round(scores['pos'], 3),
+        "negative": round(scores['neg'], 3),
+        "neutral": round(scores['neu'], 3)
+    }
+
+
 def get_sentiment(text):
     """Analyze sentiment of the complaint."""
     if not text or not isinstance(text, str):
@@ -108,28 +252,40 @@ def get_sentiment(text):
         return {"label": "Neutral", "score": 0.0}
     
     try:
-        sia = SentimentIntensityAnalyzer()
-        scores = sia.polarity_scores(text)
-        compound = scores['compound']
-        
-        if compound >= 0.05:
-            label = "Positive"
-        elif compound <= -0.05:
-            label = "Negative"
-        else:
-            label = "Neutral"
-        
-        return {
-            "label": label,
-            "score": round(compound, 3),
-            "positive": round(scores['pos'], 3),
-            "negative": round(scores['neg'], 3),
-            "neutral": round(scores['neu'], 3)
-        }
+        # VADER tokenises on whitespace, so collapsing it keeps scores identical
+        # while letting reformatted duplicates share a cache entry
+        return dict(_sentiment_scores(" ".join(text.split())))
     except Exception as e:
         return {"label": "Neutral", "score": 0.0}
 
 
+def get_sentiment_batch(texts, n_jobs=1, chunksize=256):
+    """
+    Analyze sentiment for many complaints.
+    
+    Args:
+        texts (list or pd.Series): Complaint texts
+        n_jobs (int): Worker processes for large backfills; -1 uses all cores. Defaults to 1
+        chunksize (int): Texts sent to a worker at a time
+        
+    Returns:
+        list or pd.Series: Sentiment dicts, a Series aligned to the input index if given one
+    """
+    values = list(texts)
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    
+    if n_jobs > 1 and len(values) > chunksize:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(executor.map(get_sentiment, values, chunksize=chunksize))
+    else:
+        results = [get_sentiment(text) for text in values]
+    
+    if isinstance(texts, pd.Series):
+        return pd.Series(results, index=texts.index)
+    return results
+
+
 def extract_keywords(text, top_n=5):
     """Extract important keywords from complaint."""
     if not text or not isinstance(text, str):
@@ -187,12 +343,101 @@ def estimate_resolution_time(category, priority):
         return "2-3 days"
 
 
+# Crockford base32: ASCII-ordered, no ambiguous I/L/O/U
+_TICKET_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_PID_BITS = 22        # Linux PID_MAX_LIMIT is 2^22
+_NODE_BITS = 8        # up to 256 hosts, set with GRV_NODE_ID
+_WORKER_CHARS = 6     # node + pid, or random, = 30 bits
+_SEQUENCE_CHARS = 2   # 1024 IDs per millisecond per process
+
+
+def _base32(value, width):
+    chars = []
+    for _ in range(width):
+        value, digit = divmod(value, 32)
+        chars.append(_TICKET_ALPHABET[digit])
+    return "".join(reversed(chars))
+
+
+# Live generators, reseeded in a forked child by one module-level hook
+_TICKET_GENERATORS = weakref.WeakSet()
+
+
+def _reseed_ticket_generators():
+    for generator in list(_TICKET_GENERATORS):
+        generator._reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_ticket_generators)
+
+
+class TicketIdGenerator:
+    """
+    Collision-free, time-ordered ticket ID generator (Snowflake-style).
+    
+    IDs look like ``GRV-<YYYYmmddHHMMSS>-<ms><worker><sequence>``: the legacy
+    prefix and a UTC timestamp to the second, followed by the millisecond,
+    a worker ID and a per-millisecond counter. Uniqueness needs no database
+    round trip. With ``GRV_NODE_ID`` set (0-255, one per host or container),
+    the worker ID is that node ID plus the process ID, which is unique on a
+    host. Without it, the process ID alone is not enough: every container
+    may run its app as PID 1. So the worker ID is then 30 random bits. The
+    counter separates IDs within a process. The worker ID is recomputed
+    after ``fork``. IDs from one process are strictly increasing, even if
+    the wall clock steps back.
+    """
+    
+    def __init__(self):
+        self._reset()
+        _TICKET_GENERATORS.add(self)
+    
+    def _reset(self):
+        # A fresh lock too: another thread may have held it at fork time
+        self._lock = threading.Lock()
+        node_id = os.getenv("GRV_NODE_ID")
+        if node_id is None:
+            worker = secrets.randbits(_NODE_BITS + _PID_BITS)
+        else:
+            node_id = int(node_id)
+            if not 0 <= node_id < 2 ** _NODE_BITS:
+                raise ValueError(f"GRV_NODE_ID must be in [0, {2 ** _NODE_BITS})")
+            worker = (node_id << _PID_BITS) | os.getpid() % 2 ** _PID_BITS
+        self.worker = _base32(worker, _WORKER_CHARS)
+        self._last_ms = 0
+        self._sequence = 0
+        self._second = None
+        self._second_text = ""
+    
+    def __call__(self):
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._sequence = 0
+            else:
+                # Same millisecond or clock moved back: keep counting from the last one
+                self._sequence += 1
+                if self._sequence >= 32 ** _SEQUENCE_CHARS:
+                    self._last_ms += 1
+                    self._sequence = 0
+            ms, sequence = self._last_ms, self._sequence
+            
+            second, millis = divmod(ms, 1000)
+            if second != self._second:
+                self._second = second
+                self._second_text = datetime.fromtimestamp(second, timezone.utc).strftime('%Y%m%d%H%M%S')
+            stamp = self._second_text
+        
+        return f"GRV-{stamp}-{millis:03d}{self.worker}{_base32(sequence, _SEQUENCE_CHARS)}"
+
+
+_TICKET_IDS = TicketIdGenerator()
+
+
 def generate_ticket_id():
     """Generate unique ticket ID."""
-    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-    import random
-    random_suffix = random.randint(1000, 9999)
-    return f"GRV-{timestamp}-{random_suffix}"
+    return _TICKET_IDS()
 
 
 def get_contact_info(department):